@@ -0,0 +1,189 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.constants import *
+from entities.creature import Creature
+from environment import movement
+from environment.environment import Environment
+from environment.events import DEATH, EAT, EGG_LAID
+from environment.population import ZONES
+
+# Actions an agent can choose each tick
+STAY, UP, DOWN, LEFT, RIGHT, EAT_FOOD, SLEEP, LAY_EGG = range(8)
+ACTION_COUNT = 8
+MOVES = {UP: (0, 1), DOWN: (0, -1), LEFT: (-1, 0), RIGHT: (1, 0)}
+
+# Layers of the observation windows. "inside" is 0 beyond the world edge
+CHANNELS = ("inside", "creature", "corpse", "egg", "grass", "fertility") + ZONES
+CHANNEL = {name: index for index, name in enumerate(CHANNELS)}
+
+# Per-agent scalars, scaled to roughly [0, 1]
+STATS = ("health", "energy", "hunger", "happiness", "age", "sleeping", "mature")
+
+
+# Gym-style reset/step interface where a policy picks every living creature's
+# action instead of the built-in rules. Needs, lifecycle and fields still run
+# as usual, and nothing is rendered.
+class CreatureGym:
+    def __init__(self, view_radius=AGENT_VIEW_RADIUS, max_steps=AGENT_MAX_STEPS, config=None,
+                 width=None, height=None, movement_mode=MOVEMENT):
+        self.view_radius = view_radius
+        self.max_steps = max_steps
+        self.config = config
+        self.width = width or WORLD_WIDTH
+        self.height = height or WORLD_HEIGHT
+        self.movement = movement_mode  # One of movement.MODES, applied to every world reset() makes
+        self.current_speed_state = "play"  # Creatures only act while their game manager is unpaused
+        self.selected_tile = None
+        self.environment = None
+        self.steps = 0
+        self.agent_ids = np.zeros(0, dtype=np.int64)  # Agents of the last observation, in row order
+        self.actions = {}  # Creature ID -> action for the tick being simulated
+        self.rewards = {}  # Creature ID -> reward gathered during the tick
+        self.zone_key = None  # Area scales the cached zone layers were built for
+        self.zone_layers = None
+
+    @property
+    def observation_shape(self):
+        side = 2 * self.view_radius + 1
+        return (len(CHANNELS), side, side)
+
+    def reset(self, seed=None):
+        """Start a new world and return (observation, info)"""
+        env = Environment(self.width, self.height, self, seed, config=self.config)
+        env.controller = self
+        env.movement = self.movement
+        env.events.subscribe(EAT, self._on_eat)
+        env.events.subscribe(EGG_LAID, self._on_egg_laid)
+        env.events.subscribe(DEATH, self._on_death)
+        self.environment = env
+        self.steps = 0
+        self.zone_key = None
+        return self.observe(), {"seed": env.rng.seed, "tick": env.tick}
+
+    def step(self, actions):
+        """Advance one tick with the given actions
+
+        actions is either a mapping of creature ID to action, or a sequence
+        aligned with the agents of the previous observation. Agents without an
+        action stay put. Returns (observation, rewards, terminated, truncated,
+        info); rewards and terminated are aligned with the previous agents,
+        terminated marking those that died this tick.
+        """
+        if self.environment is None:
+            raise RuntimeError("Call reset() before step()")
+        acting = self.agent_ids
+        if hasattr(actions, "items"):
+            self.actions = dict(actions)
+        else:
+            self.actions = dict(zip(acting.tolist(), np.asarray(actions).tolist()))
+        self.rewards = dict.fromkeys(acting.tolist(), 0.0)
+
+        self.environment.update(1.0 / MAX_FPS)
+        self.steps += 1
+
+        creatures = self.environment.creatures
+        rewards = np.array([self.rewards[agent_id] for agent_id in acting.tolist()])
+        terminated = np.array([creatures.get(agent_id) is None or creatures.get(agent_id).dead
+                               for agent_id in acting.tolist()], dtype=bool)
+        rewards[~terminated] += AGENT_REWARD_ALIVE
+
+        observation = self.observe()
+        population = self.environment.population
+        info = {
+            "tick": self.environment.tick,
+            "acted": acting,
+            "extinct": population.alive == 0 and population.eggs == 0,
+        }
+        return observation, rewards, terminated, self.steps >= self.max_steps, info
+
+    def act(self, creature):
+        """Carry out the chosen action for one creature (called from Creature.update)"""
+        env = self.environment
+        action = self.actions.get(creature.id, STAY)
+        if action != SLEEP:
+            creature.sleeping = False
+        creature.target = None
+
+        if action in MOVES:
+            # One step or none, settled with everyone else's moves in two-phase movement
+            dx, dy = MOVES[action]
+            env.submit_move(movement.MoveIntent(creature, [(dx, dy)], None, (creature.x + dx, creature.y + dy)))
+        elif action == EAT_FOOD:
+            # Eat the adjacent corpse with the least food left, as the built-in rules do
+            corpses = [entity for entity in env.get_nearby_entities(creature.x, creature.y, 1)
+                       if entity.food_value > 0 and
+                       abs(creature.x - entity.x) + abs(creature.y - entity.y) == 1]
+            corpses.sort(key=lambda entity: entity.food_value)
+            for corpse in corpses:
+                if creature.eat(corpse):
+                    break
+        elif action == SLEEP:
+            creature.sleeping = True
+            if env.is_in_area(creature.x, creature.y, "sleeping"):
+                # Recover energy faster when well-fed
+                creature.energy = min(100, creature.energy + (3 if creature.hunger > 50 else 1))
+        elif action == LAY_EGG:
+            if creature.ready_to_lay_egg() and env.is_in_area(creature.x, creature.y, "nursery"):
+                creature.lay_egg_nearby()
+
+        creature.happiness = creature.calculate_happiness()
+        creature.update_visual_state()
+
+    def _on_eat(self, eater, food_source, amount):
+        if eater.id in self.rewards:
+            self.rewards[eater.id] += amount * AGENT_REWARD_FOOD
+
+    def _on_egg_laid(self, egg):
+        if egg.parent_id in self.rewards:
+            self.rewards[egg.parent_id] += AGENT_REWARD_EGG
+
+    def _on_death(self, creature):
+        if creature.id in self.rewards:
+            self.rewards[creature.id] += AGENT_REWARD_DEATH
+
+    def layers(self):
+        """Return the whole world as a (len(CHANNELS), width, height) float array"""
+        env = self.environment
+        layers = np.zeros((len(CHANNELS), env.width, env.height), dtype=np.float32)
+        layers[CHANNEL["inside"]] = 1
+        for (x, y), entity in env.grid.items():
+            if isinstance(entity, Creature):
+                layers[CHANNEL["corpse" if entity.dead else "creature"], x, y] = 1
+            else:
+                layers[CHANNEL["egg"], x, y] = 1
+        layers[CHANNEL["grass"]] = np.asarray(env.grass) / MAX_GRASS
+        layers[CHANNEL["fertility"]] = np.asarray(env.fertility) / MAX_FERTILITY
+
+        # Zones only change when the areas rescale
+        key = (env.food_area_scale, env.nursery_area_scale, env.sleeping_area_scale)
+        if key != self.zone_key:
+            self.zone_layers = np.stack([env.area_mask(zone) for zone in ZONES])
+            self.zone_key = key
+        layers[CHANNEL[ZONES[0]]:] = self.zone_layers
+        return layers
+
+    def observe(self):
+        """Return the observation of every living creature, one row per agent
+
+        "windows" is (agents, len(CHANNELS), side, side) centred on each agent,
+        "stats" is (agents, len(STATS)) and "ids" names the creature of each row.
+        """
+        env = self.environment
+        agents = [creature for creature in env.creatures if not creature.dead]
+        self.agent_ids = np.array([creature.id for creature in agents], dtype=np.int64)
+        xs = np.array([creature.x for creature in agents], dtype=np.intp)
+        ys = np.array([creature.y for creature in agents], dtype=np.intp)
+
+        # Pad once, then cut every window out of one strided view with a single gather
+        radius = self.view_radius
+        padded = np.pad(self.layers(), ((0, 0), (radius, radius), (radius, radius)))
+        side = 2 * radius + 1
+        views = sliding_window_view(padded, (side, side), axis=(1, 2))
+        windows = views[:, xs, ys].transpose(1, 0, 2, 3)
+
+        stats = np.array([[creature.health, creature.energy, creature.hunger, creature.happiness,
+                           100 * creature.age / creature.max_age, 100 * creature.sleeping,
+                           100 * creature.mature] for creature in agents],
+                         dtype=np.float32).reshape(len(agents), len(STATS)) / 100
+        return {"ids": self.agent_ids, "windows": windows, "stats": stats}
@@ -0,0 +1,153 @@
+import numpy as np
+
+from utils.constants import *
+from utils.config import SimulationConfig
+from environment import fields
+from environment.environment import Environment
+from environment.events import BIRTH, DEATH
+from managers.metrics import SERIES, COLUMN, DEATH_COLUMNS
+
+# Tile codes of the occupancy observation
+EMPTY = 0
+CREATURE = 1
+CORPSE = 2
+EGG = 3
+
+# Per-creature columns of the stacked creature observation
+CREATURE_STATS = ("x", "y", "health", "energy", "hunger", "happiness", "age")
+
+
+# Steps many small, independent worlds side by side with only their fields
+# batched: the grass and fertility live in one (worlds, width, height) stack
+# that a single vectorized kernel advances, and observations and metrics are
+# gathered into stacked arrays. Creatures are not batched. Every world keeps
+# its own Environment and updates its creatures one by one in Python,
+# including hunger, energy and the old-age health loss, because their random
+# draws interleave with each creature's behaviour on the world's behaviour
+# stream; stacking them would break the exact match with standalone runs.
+# Age and old-age death already cost nothing per tick (a property and a
+# scheduled event).
+class FieldBatchedWorlds:
+    def __init__(self, count, seed=None, config=None, width=None, height=None):
+        # Worlds are seeded from one root seed, so a whole batch is reproducible
+        root = np.random.SeedSequence(seed)
+        self.seed = root.entropy
+        self.seeds = [int(s) for s in root.generate_state(count, dtype=np.uint64) % (2 ** 63)]
+        self.config = config or SimulationConfig()
+        self.current_speed_state = "play"  # Creatures only act while their game manager is unpaused
+        self.selected_tile = None
+
+        width = width or WORLD_WIDTH
+        height = height or WORLD_HEIGHT
+        self.environments = [Environment(width, height, self, world_seed, config=self.config)
+                             for world_seed in self.seeds]
+
+        # Stack the fields and hand every world a view of its own slice
+        shape = (count,) + self.environments[0].grass.shape
+        self.grass = np.zeros(shape)
+        self.fertility = np.zeros(shape)
+        self.event_counts = np.zeros((count, len(SERIES)))  # Births and deaths during the last step
+        for index, env in enumerate(self.environments):
+            self.grass[index] = env.grass
+            self.fertility[index] = env.fertility
+            env.grass = self.grass[index]
+            env.fertility = self.fertility[index]
+            env.events.subscribe(BIRTH, lambda creature, index=index: self._count(index, "births"))
+            env.events.subscribe(DEATH, lambda creature, index=index: self._on_death(index, creature))
+
+    def __len__(self):
+        return len(self.environments)
+
+    def _count(self, index, name):
+        self.event_counts[index, COLUMN[name]] += 1
+
+    def _on_death(self, index, creature):
+        self.event_counts[index, DEATH_COLUMNS.get(creature.death_cause, COLUMN["deaths_unknown"])] += 1
+
+    @property
+    def tick(self):
+        return self.environments[0].tick
+
+    def step(self, dt=1.0 / MAX_FPS):
+        """Advance every world by one tick
+
+        Creatures update world by world and one by one, exactly as in a
+        standalone run; only the field update that follows is batched.
+        """
+        self.event_counts.fill(0)
+        sources = np.zeros(self.grass.shape, dtype=bool)
+        spreads = []
+        for index, env in enumerate(self.environments):
+            env.update_entities(dt)
+            if env.decomposing_positions:
+                xs, ys = zip(*env.decomposing_positions)
+                sources[index, xs, ys] = True
+            # Drawn per world in the same order as Environment.update_fields
+            spreads.append(env.grass_spread())
+        # Rolling spread picks the same columns in every world, since they share the tick
+        spread = spreads[0] if isinstance(spreads[0], slice) else np.array(spreads)
+        fields.update_fields(self.grass, self.fertility, sources, spread, self.config)
+        for env in self.environments:
+            env.invariants.check(env)
+
+    def occupancy(self):
+        """Return a (worlds, width, height) int8 array of tile codes"""
+        occupancy = np.zeros(self.grass.shape, dtype=np.int8)
+        for index, env in enumerate(self.environments):
+            for (x, y), entity in env.grid.items():
+                if entity in env.eggs:
+                    occupancy[index, x, y] = EGG
+                else:
+                    occupancy[index, x, y] = CORPSE if entity.dead else CREATURE
+        return occupancy
+
+    def creature_stats(self):
+        """Return creature columns padded to (worlds, most creatures in any world)
+
+        The dict holds one float array per CREATURE_STATS name plus "id" (-1 in
+        padding), "present" and "dead" masks.
+        """
+        rows = max((len(env.creatures) for env in self.environments), default=0)
+        stats = {name: np.zeros((len(self), rows)) for name in CREATURE_STATS}
+        stats["id"] = np.full((len(self), rows), -1, dtype=np.int64)
+        stats["present"] = np.zeros((len(self), rows), dtype=bool)
+        stats["dead"] = np.zeros((len(self), rows), dtype=bool)
+        for index, env in enumerate(self.environments):
+            count = len(env.creatures)
+            if not count:
+                continue
+            creatures = env.creatures.items
+            values = np.array([[c.x, c.y, c.health, c.energy, c.hunger, c.happiness, c.age]
+                               for c in creatures], dtype=np.float64)
+            for column, name in enumerate(CREATURE_STATS):
+                stats[name][index, :count] = values[:, column]
+            stats["id"][index, :count] = [c.id for c in creatures]
+            stats["dead"][index, :count] = [c.dead for c in creatures]
+            stats["present"][index, :count] = True
+        return stats
+
+    def observations(self):
+        """Return every world's state stacked along the first axis"""
+        observation = self.creature_stats()
+        observation["occupancy"] = self.occupancy()
+        observation["grass"] = self.grass.copy()
+        observation["fertility"] = self.fertility.copy()
+        return observation
+
+    def metrics(self):
+        """Return a (worlds, len(SERIES)) array with the columns of managers.metrics"""
+        metrics = self.event_counts.copy()
+        metrics[:, COLUMN["tick"]] = self.tick
+        for index, env in enumerate(self.environments):
+            metrics[index, COLUMN["alive"]] = env.population.alive
+            metrics[index, COLUMN["dead"]] = env.population.dead
+            metrics[index, COLUMN["eggs"]] = env.population.eggs
+
+        stats = self.creature_stats()
+        living = stats["present"] & ~stats["dead"]
+        alive = np.maximum(living.sum(axis=1), 1)
+        for name in ("hunger", "energy", "happiness"):
+            metrics[:, COLUMN[f"avg_{name}"]] = np.where(living, stats[name], 0).sum(axis=1) / alive
+        metrics[:, COLUMN["total_grass"]] = self.grass.sum(axis=(1, 2))
+        metrics[:, COLUMN["total_fertility"]] = self.fertility.sum(axis=(1, 2))
+        return metrics
@@ -0,0 +1,118 @@
+import numpy as np
+
+from utils.constants import *
+from environment import movement, statehash
+from managers.game_manager import GameManager
+
+# Runs two copies of one world side by side from the same seed, a reference
+# and a candidate that differ only in engine settings, and finds the first
+# tick their states disagree. Equal state hashes are the fast path; when the
+# hashes differ, float components are compared again within a tolerance, so
+# summation-order noise is not reported while any integer or occupancy change
+# is. Settings are Environment mode attributes, such as
+# {"field_backend": "numba"} or {"movement": "two_phase"}.
+SETTINGS = {
+    "field_backend": None,  # Checked by Environment.set_field_backend
+    "movement": movement.MODES,
+    "spread_mode": ("burst", "rolling"),
+}
+
+
+# Where two worlds first disagree: the tick, the state component
+# (statehash.state_components name) and the first differing entry
+class Divergence:
+    __slots__ = ("tick", "component", "detail")
+
+    def __init__(self, tick, component, detail):
+        self.tick = tick
+        self.component = component
+        self.detail = detail
+
+    def __str__(self):
+        return f"Diverged at tick {self.tick} in {self.component}: {self.detail}"
+
+
+def parse_settings(items):
+    """Turn ["name=value", ...] into a settings dict"""
+    settings = {}
+    for item in items or ():
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"Expected setting=value, got {item!r}")
+        settings[name.strip()] = value.strip()
+    return settings
+
+
+def apply_settings(env, settings):
+    """Switch an environment to the given engine settings"""
+    for name, value in settings.items():
+        if name not in SETTINGS:
+            raise ValueError(f"Unknown setting {name!r}, expected one of {', '.join(SETTINGS)}")
+        if name == "field_backend":
+            env.set_field_backend(value)
+            continue
+        if value not in SETTINGS[name]:
+            raise ValueError(f"Unknown {name} {value!r}, expected one of {', '.join(SETTINGS[name])}")
+        setattr(env, name, value)
+
+
+def _mismatches(expected, actual, rtol, atol):
+    """Return a mask of the entries that differ, floats only beyond the tolerance"""
+    if expected.dtype.kind == "f":
+        return ~np.isclose(actual, expected, rtol=rtol, atol=atol)
+    return expected != actual
+
+
+def first_difference(reference, candidate, rtol=STATE_DIFF_RTOL, atol=STATE_DIFF_ATOL):
+    """Return (component, detail) of the first state component two worlds disagree on, or None
+
+    Integer and boolean components must match exactly, float components
+    within rtol and atol as in np.isclose.
+    """
+    ours = statehash.state_components(reference, None)
+    theirs = statehash.state_components(candidate, None)
+    for name, expected in ours.items():
+        actual = theirs[name]
+        if expected.shape != actual.shape:
+            return name, f"shape {expected.shape} != {actual.shape}"
+        mismatches = _mismatches(expected, actual, rtol, atol)
+        if not mismatches.any():
+            continue
+        index = tuple(int(i) for i in np.argwhere(mismatches)[0])
+        detail = f"at {index}: {expected[index].item()!r} != {actual[index].item()!r}"
+        # Name the entity rather than its row when both worlds hold the same IDs
+        table = name.split("_", 1)[0]
+        if table in ("creature", "egg") and np.array_equal(ours[f"{table}_id"], theirs[f"{table}_id"]):
+            detail = f"{table} {ours[f'{table}_id'][index[0]]} {detail}"
+        return name, detail
+    return None
+
+
+def run_differential(ticks, seed=None, reference=None, candidate=None, config=None, world=None,
+                     decimals=STATE_HASH_DECIMALS, rtol=STATE_DIFF_RTOL, atol=STATE_DIFF_ATOL):
+    """Step a reference and a candidate world together, returning (seed, first Divergence or None)
+
+    Both worlds start from the same seed and are compared before the first
+    tick and after every tick, so a divergence names the tick that caused it.
+    Ticks whose state hashes differ only diverge if first_difference finds a
+    difference beyond rtol and atol.
+    """
+    managers = []
+    for settings in (reference or {}, candidate or {}):
+        game_manager = GameManager(seed=seed, config=config, world=world)
+        seed = game_manager.environment.rng.seed  # The candidate reuses the seed drawn for the reference
+        apply_settings(game_manager.environment, settings)
+        game_manager.set_speed_state("play")
+        managers.append(game_manager)
+
+    for step in range(ticks + 1):
+        if step:
+            for game_manager in managers:
+                game_manager.update(1.0 / MAX_FPS)
+        envs = [game_manager.environment for game_manager in managers]
+        if statehash.state_hash(envs[0], decimals) == statehash.state_hash(envs[1], decimals):
+            continue
+        difference = first_difference(envs[0], envs[1], rtol, atol)
+        if difference is not None:
+            return seed, Divergence(envs[0].tick, *difference)
+    return seed, None
@@ -0,0 +1,447 @@
+import multiprocessing
+
+import numpy as np
+
+from utils.constants import *
+from utils.rng import RngService
+from entities.creature import Creature
+from entities.egg import Egg
+from environment import fields, snapshot
+from environment.environment import Environment
+from environment.events import EAT, HATCH
+from engine.shared import SharedArray
+
+# Splits one world into rectangular tiles, each simulated by its own worker
+# process. Every tick runs two lock-step phases:
+#
+#   simulate  Each worker places its neighbours' halo records (published at the
+#             end of the previous tick) as read-only ghosts, runs its own
+#             entities for one tick and removes the ghosts again. Food eaten
+#             from ghost corpses goes to the worker's bite slot, the tile's
+#             fields and decomposition sites to the shared field block, and
+#             entities that ended up outside the tile go back to the
+#             coordinator as migrants, along with the parents of eggs that
+#             hatched here while their parent lives on another tile.
+#   finish    Every tile's post-deposit fields are now in shared memory, so
+#             each worker advances its own fields from a slab that reaches
+#             FIELD_HALO tiles into its neighbours. It then applies bites taken
+#             from its corpses, frees the parents of eggs hatched elsewhere,
+#             adopts the migrants routed to it and publishes the entities
+#             within DOMAIN_HALO of its border as the next halo.
+#
+# The coordinator draws the grass spread flag, so fields spread on exactly the
+# ticks a single-process run with the same seed would.
+
+FIELD_HALO = FERTILITY_SPREAD_RADIUS + 1  # Reach of one field update
+FIELD_LAYERS = ("grass", "fertility", "sources")
+
+# Halo record kinds
+LIVING = 0
+CORPSE = 1
+EGG = 2
+
+HALO_DTYPE = np.dtype([("id", np.int64), ("x", np.int32), ("y", np.int32), ("kind", np.int8),
+                       ("food_value", np.float64)])
+BITE_DTYPE = np.dtype([("id", np.int64), ("amount", np.float64)])
+
+
+def split(length, parts):
+    """Return parts + 1 tile edges dividing range(length) as evenly as possible"""
+    if not 0 < parts <= length:
+        raise ValueError(f"Cannot split {length} tiles into {parts} parts")
+    return np.linspace(0, length, parts + 1).astype(int).tolist()
+
+
+def tile_bounds(width, height, tiles):
+    """Return (x0, y0, x1, y1) of every tile, row by row"""
+    xs, ys = split(width, tiles[0]), split(height, tiles[1])
+    return [(xs[i], ys[j], xs[i + 1], ys[j + 1]) for j in range(tiles[1]) for i in range(tiles[0])]
+
+
+# One tile of the world, simulated in a worker process
+class TileWorker:
+    def __init__(self, index, spec):
+        self.index = index
+        self.bounds = spec["tiles"][index]
+        self.tiles = spec["tiles"]
+        self.current_speed_state = "play"  # Creatures only act while their game manager is unpaused
+        self.selected_tile = None
+        self.field_block = SharedArray.attach(spec["fields"])
+        self.halo_block = SharedArray.attach(spec["halo"])
+        self.bite_block = SharedArray.attach(spec["bites"])
+        self.count_block = SharedArray.attach(spec["counts"])  # [halo records, bites] per worker
+
+        env = snapshot.restore(spec["world"], self)
+        env.rng = RngService(spec["seeds"][index])
+        env.next_id += index  # Workers hand out interleaved IDs
+        env.id_stride = len(self.tiles)
+        env.events.subscribe(EAT, self._on_eat)
+        env.events.subscribe(HATCH, self._on_hatch)
+        self.environment = env
+        self.owner = spec["owner"]  # (width, height) array of the worker owning each tile
+        self.ghosts = {}  # Entity ID -> ghost placed for the current tick
+        self.bites = []
+        self.hatched = []  # Parent IDs of eggs that hatched here while the parent lives elsewhere
+
+        # Keep only what this tile owns
+        foreign = [entity for entity in list(env.creatures) + list(env.eggs) if not self.owns(entity)]
+        self._take_events(foreign)
+        for entity in foreign:
+            self._remove(entity)
+        env.recount_population()
+        self._publish_fields()
+        self._publish_halo()
+
+    def owns(self, entity):
+        x0, y0, x1, y1 = self.bounds
+        return x0 <= entity.x < x1 and y0 <= entity.y < y1
+
+    def _on_eat(self, eater, food_source, amount):
+        if self.ghosts.get(food_source.id) is food_source:
+            self.bites.append((food_source.id, amount))
+
+    def _on_hatch(self, egg, creature):
+        if egg.parent_id is not None and self.environment.creatures.get(egg.parent_id) is None:
+            self.hatched.append(egg.parent_id)
+
+    def simulate(self, dt):
+        """Run this tile's entities for one tick and return ({worker: migrants}, hatched parents)"""
+        env = self.environment
+        self._place_ghosts()
+        env.update_entities(dt)
+        foreign = set(map(id, self.ghosts.values()))
+        self._remove_ghosts()
+
+        bites = self.bite_block.array[self.index]
+        if len(self.bites) > len(bites):
+            raise RuntimeError(f"Tile {self.index} took more bites than its bite slot holds")
+        for slot, (corpse_id, amount) in enumerate(self.bites):
+            bites[slot] = (corpse_id, amount)
+        self.count_block.array[1, self.index] = len(self.bites)
+        self.bites = []
+
+        leaving = [entity for entity in list(env.creatures) + list(env.eggs) if not self.owns(entity)]
+        migrants = self._emigrate(leaving) if leaving else {}
+        foreign.update(map(id, leaving))
+        if foreign:
+            # Nothing local may keep hold of an entity this tile no longer has
+            for creature in env.creatures:
+                if id(creature.target) in foreign:
+                    creature.target = None
+                    creature.carrying_food = False
+        self._publish_fields()
+        hatched, self.hatched = self.hatched, []
+        return migrants, hatched
+
+    def finish(self, spread, packets, hatched):
+        """Advance this tile's fields, apply bites and migrants, publish the halo"""
+        env = self.environment
+        x0, y0, x1, y1 = self.bounds
+        sx0, sy0 = max(x0 - FIELD_HALO, 0), max(y0 - FIELD_HALO, 0)
+        sx1, sy1 = min(x1 + FIELD_HALO, env.width), min(y1 + FIELD_HALO, env.height)
+        slab = self.field_block.array[:, sx0:sx1, sy0:sy1].copy()
+        grass, fertility, sources = slab
+        fields.update_fields(grass, fertility, sources > 0, fields.offset_spread(spread, sx0), env.config)
+        env.grass[x0:x1, y0:y1] = grass[x0 - sx0:x1 - sx0, y0 - sy0:y1 - sy0]
+        env.fertility[x0:x1, y0:y1] = fertility[x0 - sx0:x1 - sx0, y0 - sy0:y1 - sy0]
+
+        for worker in range(len(self.tiles)):
+            if worker == self.index:
+                continue
+            for corpse_id, amount in self.bite_block.array[worker, :self.count_block.array[1, worker]].tolist():
+                corpse = env.creatures.get(corpse_id)
+                if corpse is not None:
+                    corpse.food_value = max(0, corpse.food_value - amount)
+
+        # Egg.hatch could not reach these parents, so release them here
+        for parent_id in hatched:
+            parent = env.creatures.get(parent_id)
+            if parent is not None:
+                parent.has_laid_egg = False
+
+        for packet in packets:
+            self._immigrate(packet)
+        if packets:
+            env.recount_population()
+        self._publish_halo()
+        population = env.population
+        return {"tick": env.tick, "alive": population.alive, "dead": population.dead, "eggs": population.eggs,
+                "grass": float(env.grass[x0:x1, y0:y1].sum()),
+                "fertility": float(env.fertility[x0:x1, y0:y1].sum())}
+
+    def _publish_fields(self):
+        """Copy this tile's fields and decomposition sites into shared memory"""
+        env = self.environment
+        x0, y0, x1, y1 = self.bounds
+        block = self.field_block.array
+        block[0, x0:x1, y0:y1] = env.grass[x0:x1, y0:y1]
+        block[1, x0:x1, y0:y1] = env.fertility[x0:x1, y0:y1]
+        block[2, x0:x1, y0:y1] = 0
+        for x, y in env.decomposing_positions:
+            if x0 <= x < x1 and y0 <= y < y1:
+                block[2, x, y] = 1
+
+    def _publish_halo(self):
+        """Write every owned entity within DOMAIN_HALO of the tile border to the halo slot"""
+        env = self.environment
+        x0, y0, x1, y1 = self.bounds
+        records = self.halo_block.array[self.index]
+        count = 0
+        for entity in list(env.creatures) + list(env.eggs):
+            x, y = entity.x, entity.y
+            if x0 + DOMAIN_HALO <= x < x1 - DOMAIN_HALO and y0 + DOMAIN_HALO <= y < y1 - DOMAIN_HALO:
+                continue
+            if isinstance(entity, Egg):
+                records[count] = (entity.id, x, y, EGG, 0)
+            else:
+                records[count] = (entity.id, x, y, CORPSE if entity.dead else LIVING, entity.food_value)
+            count += 1
+        self.count_block.array[0, self.index] = count
+
+    def _place_ghosts(self):
+        """Put the neighbours' border entities into the grid as read-only ghosts"""
+        env = self.environment
+        x0, y0, x1, y1 = self.bounds
+        for worker in range(len(self.tiles)):
+            if worker == self.index:
+                continue
+            records = self.halo_block.array[worker, :self.count_block.array[0, worker]]
+            xs, ys = records["x"], records["y"]
+            near = ((xs >= x0 - DOMAIN_HALO) & (xs < x1 + DOMAIN_HALO) &
+                    (ys >= y0 - DOMAIN_HALO) & (ys < y1 + DOMAIN_HALO))
+            for entity_id, x, y, kind, food_value in records[near].tolist():
+                if (x, y) in env.grid:
+                    continue  # A migrant already took the tile, the owner catches up next tick
+                if kind == EGG:
+                    ghost = Egg.__new__(Egg)
+                    ghost.x, ghost.y, ghost.id = x, y, entity_id
+                else:
+                    ghost = Creature.__new__(Creature)
+                    ghost.init_state(x, y, env)
+                    ghost.id = entity_id
+                    ghost.dead = kind == CORPSE
+                    ghost.food_value = food_value
+                    if ghost.dead:
+                        env.halo.append(ghost)
+                env.grid[(x, y)] = ghost
+                self.ghosts[entity_id] = ghost
+
+    def _remove_ghosts(self):
+        env = self.environment
+        for ghost in self.ghosts.values():
+            if env.grid.get((ghost.x, ghost.y)) is ghost:
+                del env.grid[(ghost.x, ghost.y)]
+        env.halo.clear()
+        self.ghosts.clear()
+
+    def _take_events(self, entities):
+        """Cancel and return (tick, method name, entity ID) of the entities' scheduled events"""
+        leaving = set(map(id, entities))
+        taken = []
+        for tick, events in self.environment.scheduler.buckets.items():
+            for event in events:
+                entity = getattr(event.callback, "__self__", None)
+                if not event.cancelled and id(entity) in leaving:
+                    taken.append((tick, event.callback.__name__, entity.id))
+                    event.cancel()
+        return taken
+
+    def _remove(self, entity):
+        """Drop an entity and its decomposition tracking from this tile"""
+        env = self.environment
+        if isinstance(entity, Egg):
+            env.eggs.remove(entity)
+        else:
+            env.creatures.remove(entity)
+            last_position = env.last_positions.pop(entity.id, None)
+            if last_position is not None:
+                env.decomposing_positions.pop(last_position, None)
+            env.initial_death_positions.pop(entity.id, None)
+        if env.grid.get((entity.x, entity.y)) is entity:
+            del env.grid[(entity.x, entity.y)]
+
+    def _emigrate(self, leaving):
+        """Remove entities that left the tile and pack them per destination worker"""
+        env = self.environment
+        events = self._take_events(leaving)
+        packets = {}
+        for destination in {int(self.owner[entity.x, entity.y]) for entity in leaving}:
+            entities = [entity for entity in leaving if self.owner[entity.x, entity.y] == destination]
+            creatures = [entity for entity in entities if isinstance(entity, Creature)]
+            eggs = [entity for entity in entities if isinstance(entity, Egg)]
+            ids = {entity.id for entity in entities}
+            packet = snapshot.creature_columns(creatures)
+            packet.update(snapshot.egg_columns(eggs))
+            packet["events"] = [event for event in events if event[2] in ids]
+            packet["initial_death_positions"] = {creature.id: env.initial_death_positions[creature.id]
+                                                 for creature in creatures
+                                                 if creature.id in env.initial_death_positions}
+            packets[destination] = packet
+        for entity in leaving:
+            self._remove(entity)
+        env.recount_population()
+        return packets
+
+    def _immigrate(self, packet):
+        """Adopt the entities of a migrant packet"""
+        env = self.environment
+        rows = snapshot.creature_rows(packet)
+        arrived = []
+        for i in range(len(rows["id"])):
+            creature = snapshot.restore_creature(env, rows, i)
+            self._place(creature)
+            env.creatures.add(creature)
+            arrived.append(creature)
+            if creature.id not in env.lineage:
+                env.lineage.register(creature.id, creature.parent_id, creature.birth_tick)
+            if creature.dead:
+                env.lineage.record_death(creature.id, creature.death_tick)
+                position = (creature.x, creature.y)
+                env.initial_death_positions[creature.id] = packet["initial_death_positions"].get(
+                    creature.id, position)
+                env.last_positions[creature.id] = position
+                env.decomposing_positions[position] = None
+        for egg in snapshot.restore_eggs(env, packet):
+            self._place(egg)
+            env.eggs.add(egg)
+
+        for creature, kind, target_id in zip(arrived, rows["target_kind"], rows["target_id"]):
+            if kind == snapshot.TARGET_CREATURE:
+                creature.target = env.creatures.get(target_id)
+            elif kind == snapshot.TARGET_EGG:
+                creature.target = env.eggs.get(target_id)
+            else:
+                creature.target = snapshot.AREA_TARGETS[kind]
+            if creature.target is None and creature.carrying_food:
+                creature._carrying_food = False  # Counters are recounted after all packets
+
+        for tick, name, entity_id in packet["events"]:
+            entity = env.creatures.get(entity_id) or env.eggs.get(entity_id)
+            env.scheduler.schedule_at(tick, getattr(entity, name))
+
+    def _place(self, entity):
+        """Put an arriving entity on its tile, or the nearest free one if two arrived at once"""
+        env = self.environment
+        x0, y0, x1, y1 = self.bounds
+        position = (entity.x, entity.y)
+        radius = 0
+        while position in env.grid:
+            radius += 1
+            free = [(x, y)
+                    for x in range(max(entity.x - radius, x0), min(entity.x + radius + 1, x1))
+                    for y in range(max(entity.y - radius, y0), min(entity.y + radius + 1, y1))
+                    if (x, y) not in env.grid]
+            if free:
+                position = min(free, key=lambda p: abs(p[0] - entity.x) + abs(p[1] - entity.y))
+            elif radius > max(x1 - x0, y1 - y0):
+                raise RuntimeError(f"Tile {self.index} has no free tile for an arriving entity")
+        entity.x, entity.y = position
+        env.grid[position] = entity
+
+    def close(self):
+        for block in (self.field_block, self.halo_block, self.bite_block, self.count_block):
+            block.close()
+
+
+def _serve(index, spec, connection):
+    """Worker process loop: answer coordinator commands until told to close"""
+    worker = TileWorker(index, spec)
+    connection.send("ready")  # Every halo must be published before any tile simulates
+    try:
+        while True:
+            command, *args = connection.recv()
+            if command == "simulate":
+                connection.send(worker.simulate(*args))
+            elif command == "finish":
+                connection.send(worker.finish(*args))
+            else:
+                break
+    finally:
+        worker.close()
+
+
+# Coordinator of a world split across worker processes, stepped in lock-step
+class TiledWorld:
+    def __init__(self, tiles=DOMAIN_TILES, seed=None, config=None, width=None, height=None):
+        width = width or WORLD_WIDTH
+        height = height or WORLD_HEIGHT
+        world = Environment(width, height, None, seed, config=config)
+        self.seed = world.rng.seed
+        self.rng = world.rng  # Only its fields stream is used, for the grass spread flag
+        self.width, self.height = width, height
+        self.tiles = tile_bounds(width, height, tiles)
+        self.tick = world.tick
+
+        owner = np.zeros((width, height), dtype=np.int32)
+        for index, (x0, y0, x1, y1) in enumerate(self.tiles):
+            owner[x0:x1, y0:y1] = index
+        # An entity fills one grid tile, so a tile never holds more records than it has tiles
+        capacity = max((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in self.tiles)
+        workers = len(self.tiles)
+        self.blocks = {
+            "fields": SharedArray((len(FIELD_LAYERS), width, height), np.float64),
+            "halo": SharedArray((workers, capacity), HALO_DTYPE),
+            "bites": SharedArray((workers, 2 * capacity), BITE_DTYPE),
+            "counts": SharedArray((2, workers), np.int64),
+        }
+        seeds = [int(s) for s in np.random.SeedSequence(self.seed).generate_state(workers, dtype=np.uint64)
+                 % (2 ** 63)]
+        spec = {name: block.spec() for name, block in self.blocks.items()}
+        spec.update({"tiles": self.tiles, "owner": owner, "seeds": seeds, "world": snapshot.capture(world)})
+
+        context = multiprocessing.get_context()
+        self.connections = []
+        self.processes = []
+        for index in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve, args=(index, spec, child), daemon=True)
+            process.start()
+            self.connections.append(parent)
+            self.processes.append(process)
+        for connection in self.connections:
+            connection.recv()
+        self.counts = [None] * workers  # Latest finish() report of every tile
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def _broadcast(self, messages):
+        for connection, message in zip(self.connections, messages):
+            connection.send(message)
+        return [connection.recv() for connection in self.connections]
+
+    def step(self, dt=1.0 / MAX_FPS):
+        """Advance every tile by one tick"""
+        replies = self._broadcast([("simulate", dt)] * len(self))
+        incoming = [[] for _ in self.tiles]
+        hatched = []
+        for migrants, parents in replies:
+            hatched.extend(parents)
+            for destination, packet in migrants.items():
+                incoming[destination].append(packet)
+        if GRASS_SPREAD == "rolling":
+            spread = fields.rolling_columns(self.tick + 1)  # The tick the workers just finished
+        else:
+            spread = self.rng.fields.random() < 0.1  # Same draw as Environment.update_fields
+        self.counts = self._broadcast([("finish", spread, packets, hatched) for packets in incoming])
+        self.tick += 1
+
+    def totals(self):
+        """Return alive, dead, eggs, grass and fertility summed over all tiles"""
+        if self.counts[0] is None:
+            return None
+        return {name: sum(count[name] for count in self.counts)
+                for name in ("alive", "dead", "eggs", "grass", "fertility")}
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        for connection in self.connections:
+            try:
+                connection.send(("close",))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join()
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
@@ -0,0 +1,194 @@
+import numpy as np
+
+from utils.constants import *
+from environment import snapshot
+from environment.entity_table import EntityTable
+from environment.environment import Environment
+from managers.metrics import SERIES, COLUMN
+from engine.shared import SharedArray
+
+# Per-tick world state published by the simulation process for the renderer.
+# There are three slots: the writer fills its back slot, then swaps it with the
+# middle slot under a lock; the reader swaps the middle slot into its front
+# slot when it is newer. Neither side ever waits for the other to finish a
+# frame, and the front slot stays untouched until the reader asks for the next
+# frame, so it can be read in place.
+SLOTS = 3
+BACK, MIDDLE, FRONT, FRESH = range(4)  # Entries of the control block
+
+# Frame header entries
+HEADER = ("sequence", "tick", "creatures", "eggs", "selected_creature", "selected_egg",
+          "selected_tile_x", "selected_tile_y", "speed", "metrics_rows")
+HEADER_INDEX = {name: index for index, name in enumerate(HEADER)}
+SPEEDS = ("pause", "play", "fast")
+NOTHING = -1  # Empty selection
+
+# Creature rows carry every snapshot column, so the renderer draws with the same code
+CREATURE_DTYPE = np.dtype(
+    [(name, np.int64) for name in snapshot.CREATURE_INT_COLUMNS] +
+    [(name, np.float64) for name in snapshot.CREATURE_FLOAT_COLUMNS] +
+    [(name, np.bool_) for name in snapshot.CREATURE_BOOL_COLUMNS] +
+    [("death_tick", np.int64), ("parent_id", np.int64), ("color", np.uint8, (3,)),
+     ("pattern", np.int8), ("pattern_color", np.int8), ("death_cause", np.int8),
+     ("target_kind", np.int8), ("target_id", np.int64)])
+EGG_DTYPE = np.dtype([("id", np.int64), ("x", np.int64), ("y", np.int64), ("parent_id", np.int64),
+                      ("laid_tick", np.int64), ("hatch_time", np.int64)])
+
+
+# Triple-buffered shared frames, created by the renderer and attached to by the simulation
+class FrameBuffer:
+    def __init__(self, width, height, lock, spec=None):
+        self.width = width
+        self.height = height
+        self.lock = lock  # Guards the control block only, never a whole frame
+        capacity = width * height  # Every entity fills its own grid tile
+        shapes = {
+            "control": ((4,), np.int64),
+            "header": ((SLOTS, len(HEADER)), np.int64),
+            "scales": ((SLOTS, 3), np.float64),
+            "fields": ((SLOTS, 2, width, height), np.float64),
+            "creatures": ((SLOTS, capacity), CREATURE_DTYPE),
+            "eggs": ((SLOTS, capacity), EGG_DTYPE),
+            "metrics": ((SLOTS, SPARKLINE_HISTORY, len(SERIES)), np.float64),
+        }
+        if spec is None:
+            self.blocks = {name: SharedArray(shape, dtype) for name, (shape, dtype) in shapes.items()}
+            self.blocks["control"].array[:] = (0, 1, 2, 0)
+        else:
+            self.blocks = {name: SharedArray.attach(spec[name]) for name in shapes}
+        self.owner = spec is None
+        self.sequence = 0
+
+    def spec(self):
+        return {name: block.spec() for name, block in self.blocks.items()}
+
+    def _slot(self, name, slot):
+        return self.blocks[name].array[slot]
+
+    def publish(self, game_manager):
+        """Write the current world into the back slot and make it the newest frame"""
+        env = game_manager.environment
+        control = self.blocks["control"].array
+        slot = control[BACK]
+        creatures = list(env.creatures)
+        eggs = list(env.eggs)
+        self.sequence += 1
+
+        rows = self._slot("creatures", slot)
+        for name, column in snapshot.creature_columns(creatures).items():
+            rows[name[len("creature_"):]][:len(creatures)] = column
+        egg_rows = self._slot("eggs", slot)
+        for name, column in snapshot.egg_columns(eggs).items():
+            egg_rows[name[len("egg_"):]][:len(eggs)] = column
+
+        fields = self._slot("fields", slot)
+        fields[0] = env.grass
+        fields[1] = env.fertility
+        self._slot("scales", slot)[:] = (env.sleeping_area_scale, env.food_area_scale, env.nursery_area_scale)
+
+        metrics_rows = 0
+        if game_manager.metrics is not None:
+            recent = game_manager.metrics.recent(SPARKLINE_HISTORY)
+            metrics_rows = len(recent)
+            self._slot("metrics", slot)[:metrics_rows] = recent
+
+        tile = game_manager.selected_tile or (NOTHING, NOTHING)
+        header = self._slot("header", slot)
+        header[:] = (self.sequence, env.tick, len(creatures), len(eggs),
+                     _or_nothing(game_manager.selected_creature_id), _or_nothing(game_manager.selected_egg_id),
+                     tile[0], tile[1], SPEEDS.index(game_manager.current_speed_state), metrics_rows)
+
+        with self.lock:
+            control[BACK], control[MIDDLE] = control[MIDDLE], slot
+            control[FRESH] = 1
+
+    def acquire(self):
+        """Swap the newest frame into the front slot, returning False if there is none"""
+        control = self.blocks["control"].array
+        with self.lock:
+            if not control[FRESH]:
+                return False
+            control[FRONT], control[MIDDLE] = control[MIDDLE], control[FRONT]
+            control[FRESH] = 0
+        return True
+
+    def front(self, name):
+        """Return a view of one part of the front frame"""
+        return self._slot(name, self.blocks["control"].array[FRONT])
+
+    def close(self):
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+
+
+def _or_nothing(value):
+    return NOTHING if value is None else value
+
+
+# Read-only metrics history of the front frame, shaped like MetricsCollector for the sparklines
+class MetricsView:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def __len__(self):
+        return int(self.frames.front("header")[HEADER_INDEX["metrics_rows"]])
+
+    def series(self, name, n=None):
+        rows = len(self)
+        n = rows if n is None else min(n, rows)
+        return self.frames.front("metrics")[rows - n:rows, COLUMN[name]]
+
+
+# Renderer-side copy of the world, rebuilt from the front frame so the
+# existing draw and stats code can run on it unchanged. world is the
+# simulated world's WorldConfig, so zones are drawn where they really are.
+class MirrorWorld:
+    def __init__(self, frames, game_manager, world=None):
+        self.frames = frames
+        self.environment = Environment(frames.width, frames.height, game_manager, populate=False, world=world)
+
+    def load_front(self):
+        """Rebuild the mirror from the front frame"""
+        env = self.environment
+        header = self.frames.front("header")
+        count = int(header[HEADER_INDEX["creatures"]])
+        rows = self.frames.front("creatures")[:count]
+        rows = {name: rows[name].tolist() for name in CREATURE_DTYPE.names}
+        rows["in_world"] = [True] * count
+
+        env.scheduler.tick = int(header[HEADER_INDEX["tick"]])
+        env.sleeping_area_scale, env.food_area_scale, env.nursery_area_scale = self.frames.front("scales").tolist()
+        env.zone_cache.clear()
+        env.creatures = EntityTable()
+        env.eggs = EntityTable()
+        env.grid = {}
+        for i in range(count):
+            creature = snapshot.restore_creature(env, rows, i)
+            env.creatures.add(creature)
+            env.grid[(creature.x, creature.y)] = creature
+        eggs = self.frames.front("eggs")[:int(header[HEADER_INDEX["eggs"]])]
+        for egg in snapshot.restore_eggs(env, {f"egg_{name}": eggs[name] for name in EGG_DTYPE.names}):
+            env.eggs.add(egg)
+            env.grid[(egg.x, egg.y)] = egg
+        for creature, kind, target_id in zip(env.creatures, rows["target_kind"], rows["target_id"]):
+            if kind == snapshot.TARGET_CREATURE:
+                creature.target = env.creatures.get(target_id)
+            elif kind == snapshot.TARGET_EGG:
+                creature.target = env.eggs.get(target_id)
+            else:
+                creature.target = snapshot.AREA_TARGETS[kind]
+
+        selected = env.creatures.get(int(header[HEADER_INDEX["selected_creature"]]))
+        if selected is not None:
+            selected.selected = True
+        selected = env.eggs.get(int(header[HEADER_INDEX["selected_egg"]]))
+        if selected is not None:
+            selected.selected = True
+
+        # The fields are drawn straight from shared memory
+        fields = self.frames.front("fields")
+        env.grass = fields[0]
+        env.fertility = fields[1]
+        env.recount_population()
@@ -0,0 +1,263 @@
+import multiprocessing
+import queue
+import time
+
+from utils.constants import *
+from environment.snapshot import SnapshotError
+from utils.config import WorldConfig
+from managers.game_manager import GameManager
+from managers.autosave import Autosave
+from managers.replay import Journal
+from managers.metrics import MetricsCollector
+from engine.frames import FrameBuffer, MetricsView, MirrorWorld, HEADER_INDEX, NOTHING
+
+# The simulation runs in its own process and publishes every tick into shared
+# frames; the window process only draws the newest frame and sends user input
+# over a command queue:
+#   ("speed", state)  switch between pause, play and fast
+#   ("fps", fps)      ticks per second, 0 to stop ticking
+#   ("click", x, y)   window click, resolved against the simulated world
+#   ("save", path)    write a snapshot
+#   ("load", path)    replace the world with a snapshot
+#   ("frames", width, height, spec)
+#                     publish into these frames from now on
+#   ("close",)        stop the simulation
+# and reports back over an event queue:
+#   ("status", text)  a message for the player, such as why a load failed
+#   ("world", world)  a load changed the world's size or zones (WorldConfig.as_dict)
+# Frames are sized for one world. When a load changes the world's size or
+# zones, the window makes new frames and a new mirror for it. Until the new
+# frames arrive, the simulation only publishes into frames of the right size.
+FIRST_FRAME_TIMEOUT = 30.0  # Seconds to wait for the simulation to publish its first frame
+
+
+def _simulate(spec, lock, commands, events, snapshot_path):
+    """Simulation process loop: tick at the requested rate until told to close"""
+    autosave = Autosave(spec["autosave_dir"]) if spec["autosave_dir"] else None
+    journal = Journal(spec["journal_dir"]) if spec["journal_dir"] else None
+    game_manager = GameManager(autosave=autosave, journal=journal, metrics=MetricsCollector())
+    frames = FrameBuffer(spec["width"], spec["height"], lock, spec["blocks"])
+    shown = spec["world"]  # Layout the window's frames and mirror were made for
+    if snapshot_path:
+        _apply(game_manager, ("load", snapshot_path), events)
+    shown = _publish(game_manager, frames, shown, events)
+
+    last_tick = time.perf_counter()
+    running = True
+    while running:
+        # Sleep on the queue until the next tick is due, or indefinitely while stopped
+        timeout = None
+        if game_manager.FPS > 0:
+            timeout = max(0.0, last_tick + 1.0 / game_manager.FPS - time.perf_counter())
+        try:
+            command = commands.get(timeout=timeout)
+        except queue.Empty:
+            command = None
+
+        if command is not None and command[0] == "frames":
+            try:
+                replacement = FrameBuffer(command[1], command[2], lock, command[3])
+            except FileNotFoundError:
+                replacement = None  # Superseded and freed by the window, newer frames follow
+            if replacement is not None:
+                frames.close()
+                frames = replacement
+        elif command is not None:
+            running = _apply(game_manager, command, events)
+            if command[0] == "fps":
+                last_tick = time.perf_counter()  # Elapsed time restarts when the rate changes
+        elif game_manager.FPS > 0:
+            now = time.perf_counter()
+            game_manager.update(now - last_tick)
+            last_tick = now
+        shown = _publish(game_manager, frames, shown, events)
+
+    if game_manager.autosave:
+        game_manager.autosave.close()
+    if game_manager.journal:
+        game_manager.journal.close()
+    game_manager.metrics.close()
+    frames.close()
+
+
+def _publish(game_manager, frames, shown, events):
+    """Publish the world if the frames fit it, returning the layout the window now knows about"""
+    world = game_manager.environment.world.as_dict()
+    if world != shown:
+        events.put(("world", world))
+    if (frames.width, frames.height) == (world["width"], world["height"]):
+        frames.publish(game_manager)
+    return world
+
+
+def _apply(game_manager, command, events):
+    """Carry out one command, returning False once the simulation should stop
+
+    A snapshot that cannot be written or read leaves the world as it was and
+    is reported to the window instead of stopping the simulation.
+    """
+    name, *args = command
+    if name == "speed":
+        game_manager.set_speed_state(*args)
+    elif name == "fps":
+        game_manager.FPS = args[0]
+    elif name == "click":
+        game_manager.handle_click(*args)
+    elif name == "save":
+        try:
+            game_manager.save_world(*args)
+        except OSError as error:
+            events.put(("status", f"Save failed: {error}"))
+    elif name == "load":
+        try:
+            game_manager.load_world(*args)
+        except (SnapshotError, OSError) as error:
+            events.put(("status", f"Load failed: {error}"))
+    elif name == "close":
+        return False
+    else:
+        raise ValueError(f"Unknown simulation command {name!r}")
+    return True
+
+
+# Stands in for GameManager on the window side. The UI reads the world from a
+# mirror rebuilt out of the newest published frame, and every change is sent
+# to the simulation process instead of applied locally.
+class RemoteGame:
+    def __init__(self, snapshot_path=None, autosave_dir=None, journal_dir=None):
+        world = WorldConfig()  # Until the simulation reports a loaded world of another layout
+        context = multiprocessing.get_context("spawn")  # The window process must not be forked
+        self.frames = FrameBuffer(world.width, world.height, context.Lock())
+        self.pending = None  # (frames, world) made for a new layout, until their first frame arrives
+        self.commands = context.Queue()
+        self.events = context.Queue()
+        spec = {"width": world.width, "height": world.height, "blocks": self.frames.spec(),
+                "world": world.as_dict(), "autosave_dir": autosave_dir, "journal_dir": journal_dir}
+        self.process = context.Process(target=_simulate, args=(spec, self.frames.lock, self.commands, self.events,
+                                                                     snapshot_path),
+                                       daemon=True)
+        self.process.start()
+
+        self.current_speed_state = "pause"
+        self.FPS = 0
+        self.ui_manager = None
+        self.message = None  # Last status message from the simulation and when it arrived
+        self.message_time = 0.0
+        self.metrics = MetricsView(self.frames)
+        self.mirror = MirrorWorld(self.frames, self, world)
+
+        deadline = time.perf_counter() + FIRST_FRAME_TIMEOUT
+        while not self.sync():
+            if time.perf_counter() > deadline:
+                self.close()
+                raise RuntimeError("The simulation process did not publish a frame")
+            time.sleep(0.01)
+
+    @property
+    def environment(self):
+        return self.mirror.environment
+
+    def _header(self, name):
+        return int(self.frames.front("header")[HEADER_INDEX[name]])
+
+    @property
+    def status(self):
+        """The latest status message while it is still shown, or None"""
+        if self.message is None or time.perf_counter() - self.message_time > STATUS_MESSAGE_SECONDS:
+            return None
+        return self.message
+
+    @property
+    def selected_creature(self):
+        """The selected creature of the newest frame, or None"""
+        return self.environment.creatures.get(self._header("selected_creature"))
+
+    @property
+    def selected_egg(self):
+        """The selected egg of the newest frame, or None"""
+        return self.environment.eggs.get(self._header("selected_egg"))
+
+    @property
+    def selected_tile(self):
+        tile = (self._header("selected_tile_x"), self._header("selected_tile_y"))
+        return None if tile[0] == NOTHING else tile
+
+    def sync(self):
+        """Load the newest frame into the mirror, returning False if there is none"""
+        if not self.process.is_alive():
+            raise RuntimeError(f"The simulation process exited with code {self.process.exitcode}")
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "status":
+                self.message = event[1]
+                self.message_time = time.perf_counter()
+            elif event[0] == "world":
+                self._make_frames(event[1])
+        if self.pending and self.pending[0].acquire():
+            self._switch_frames()
+        elif not self.frames.acquire():
+            return False
+        self.mirror.load_front()
+        return True
+
+    def _make_frames(self, layout):
+        """Make frames and a mirror for a world of another size or zone layout"""
+        world = WorldConfig(layout["width"], layout["height"], layout["zones"])
+        frames = FrameBuffer(world.width, world.height, self.frames.lock)
+        if self.pending:
+            self.pending[0].close()  # Superseded before the simulation published into it
+        self.pending = (frames, world)
+        self.commands.put(("frames", world.width, world.height, frames.spec()))
+
+    def _switch_frames(self):
+        """Draw from the pending frames, whose first frame has just arrived"""
+        frames, world = self.pending
+        self.pending = None
+        self.frames.close()
+        self.frames = frames
+        self.metrics.frames = frames
+        self.mirror = MirrorWorld(frames, self, world)
+
+    def set_ui_manager(self, ui_manager):
+        """Set the UI manager reference"""
+        self.ui_manager = ui_manager
+
+    def set_speed_state(self, state):
+        """Switch between pause, play and fast"""
+        self.current_speed_state = state
+        self.commands.put(("speed", state))
+
+    def update_fps(self, new_fps):
+        """Set how many ticks per second the simulation runs"""
+        self.FPS = new_fps
+        self.commands.put(("fps", new_fps))
+
+    def handle_click(self, x, y):
+        if x < WIDTH - SIDEBAR_WIDTH:  # Grid area click, the selection shows up in a following frame
+            self.commands.put(("click", x, y))
+            return True
+        return False
+
+    def save_world(self, path):
+        """Write a snapshot of the simulated world"""
+        self.commands.put(("save", path))
+
+    def load_world(self, path):
+        """Replace the simulated world with one read from a snapshot"""
+        self.commands.put(("load", path))
+
+    def close(self):
+        """Stop the simulation process and free the shared frames"""
+        if self.process.is_alive():
+            self.commands.put(("close",))
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.commands.close()
+        self.events.close()
+        if self.pending:
+            self.pending[0].close()
+        self.frames.close()
@@ -0,0 +1,30 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# A NumPy array in a named shared memory block
+class SharedArray:
+    def __init__(self, shape, dtype, name=None):
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        self.memory = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf)
+        if name is None:
+            self.array.fill(0)
+
+    def spec(self):
+        """Return what another process needs to attach to the block"""
+        return self.array.shape, self.array.dtype, self.memory.name
+
+    @classmethod
+    def attach(cls, spec):
+        shape, dtype, name = spec
+        return cls(shape, dtype, name)
+
+    def close(self):
+        del self.array
+        self.memory.close()
+
+    def unlink(self):
+        self.memory.unlink()
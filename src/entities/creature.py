@@ -1,19 +1,51 @@
 import pyglet
-import random
 import math
 import time
 
 from utils.constants import *
 from entities.egg import Egg
+from environment.events import DEATH, EAT
 
 class Creature:
-    def __init__(self, x, y, environment, health=100, energy=100):
+    def __init__(self, x, y, environment, health=100, energy=100, parent_id=None):
+        self.init_state(x, y, environment, health, energy)
+
+        # Identity and family links
+        self.birth_tick = environment.tick
+        self.parent_id = parent_id
+        self.id = environment.new_entity_id()
+        environment.lineage.register(self.id, parent_id, self.birth_tick)
+
+        # Lifespan
+        self.max_age = environment.rng.behaviour.randint(environment.config.CREATURE_MIN_LIFESPAN,
+                                                          environment.config.CREATURE_MAX_LIFESPAN)
+
+        # Random starting phases for animations
+        self.heart_animation_offset = environment.rng.appearance.random() * math.pi * 2  # Random start phase
+        self.blink_timer = environment.rng.appearance.uniform(0, BLINK_INTERVAL)
+        self.breath_offset = environment.rng.appearance.uniform(0, 2 * math.pi)  # Random starting phase
+        self.heart_animation_offset = environment.rng.appearance.uniform(0, 2 * math.pi)  # Add random starting phase
+        
+        # Add texture-related attributes
+        self.pattern = environment.rng.appearance.choices(
+            list(TEXTURE_PATTERNS.keys()),
+            weights=[p["chance"] for p in TEXTURE_PATTERNS.values()]
+        )[0]
+        self.pattern_color = environment.rng.appearance.choice(PATTERN_COLORS)
+        self.pattern_offset = environment.rng.appearance.uniform(0, 2 * math.pi)  # Random starting offset
+        self.pattern_scale = environment.rng.appearance.uniform(0.8, 1.2)  # Random scale variation
+
+        # Lifecycle milestones fire from the scheduler instead of per-tick checks
+        environment.scheduler.schedule(environment.config.CREATURE_MATURITY_AGE, self.mature_up)
+        environment.scheduler.schedule(self.max_age, self.die_of_old_age)
+
+    def init_state(self, x, y, environment, health=100, energy=100):
+        """Set every attribute that does not need randomness or registration"""
         # Initialize all attributes first
         self.egg_laying_cooldown = 0
-        self.egg_laying_cooldown_max = 300
-        self.rest_threshold = 30
-        self.wake_threshold = 80
-        self.max_age = random.randint(500, 750)
+        self.egg_laying_cooldown_max = environment.config.EGG_LAYING_COOLDOWN
+        self.rest_threshold = environment.config.REST_THRESHOLD
+        self.wake_threshold = environment.config.WAKE_THRESHOLD
         self.selected = False
         
         # Then set the basic attributes
@@ -23,17 +55,17 @@ class Creature:
         self.health = health
         self.energy = energy
         self.hunger = 100
-        self.age = 0
+        self.death_tick = None
         self.mature = False
         self.dead = False
-        self.sleeping = False
+        self._sleeping = False
         self.eating = False
         self.base_color = (0, 255, 0)  # Store base color for normal state
         self.color = self.base_color
         self.happiness = 100
         self.food_value = 100
         self.age_related_health_loss = False
-        self.carrying_food = False
+        self._carrying_food = False
         self.target = None
         self.egg = False
         self.has_laid_egg = False
@@ -46,34 +78,57 @@ class Creature:
         self.animation_frame = 0
         self.animation_speed = 0.016
         self.last_update_time = time.time()
-        self.heart_animation_offset = random.random() * math.pi * 2  # Random start phase
         self.frame_update_interval = 0.2  # Time between frame updates in seconds
         self.accumulated_time = 0  # Track time between frames
-        
-        # Add eye animation properties
-        self.blink_timer = random.uniform(0, BLINK_INTERVAL)
         self.is_blinking = False
         
-        # Add breathing animation property
-        self.breath_offset = random.uniform(0, 2 * math.pi)  # Random starting phase
-        
-        # Add heart animation property
-        self.heart_animation_offset = random.uniform(0, 2 * math.pi)  # Add random starting phase
-        
         # Add mouth animation properties
         self.mouth_open_amount = 0
         self.target_mouth_open = 0
         self.is_chewing = False
         self.chew_timer = 0
-        
-        # Add texture-related attributes
-        self.pattern = random.choices(
-            list(TEXTURE_PATTERNS.keys()),
-            weights=[p["chance"] for p in TEXTURE_PATTERNS.values()]
-        )[0]
-        self.pattern_color = random.choice(PATTERN_COLORS)
-        self.pattern_offset = random.uniform(0, 2 * math.pi)  # Random starting offset
-        self.pattern_scale = random.uniform(0.8, 1.2)  # Random scale variation
+
+    @property
+    def age(self):
+        """Ticks lived, frozen at the moment of death"""
+        end_tick = self.death_tick if self.death_tick is not None else self.env.tick
+        return end_tick - self.birth_tick
+
+    @property
+    def sleeping(self):
+        return self._sleeping
+
+    @sleeping.setter
+    def sleeping(self, value):
+        # Keep the environment's sleeper counter in step with the flag
+        if value != self._sleeping and not self.dead:
+            self.env.population.sleepers += 1 if value else -1
+        self._sleeping = value
+
+    @property
+    def carrying_food(self):
+        return self._carrying_food
+
+    @carrying_food.setter
+    def carrying_food(self, value):
+        # Keep the environment's carrier counter in step with the flag
+        if value != self._carrying_food and not self.dead:
+            self.env.population.carriers += 1 if value else -1
+        self._carrying_food = value
+
+    def mature_up(self):
+        """Scheduled maturity milestone"""
+        if not self.dead:
+            self.mature = True
+
+    def die_of_old_age(self):
+        """Scheduled end of lifespan"""
+        if not self.dead:
+            self.die()
+
+    def end_egg_laying_cooldown(self):
+        """Scheduled end of the egg laying cooldown"""
+        self.egg_laying_cooldown = 0
 
     def calculate_happiness(self):
         """Calculate creature happiness based on various factors with weighted importance"""
@@ -133,8 +188,8 @@ class Creature:
             if self.carrying_food:
                 # If carrying food, move towards food storage area
                 food_center = self.env.get_area_center("food")
-                target_x = int(food_center[0] / GRID_SIZE)
-                target_y = int(food_center[1] / GRID_SIZE)
+                target_x = int(food_center[0])
+                target_y = int(food_center[1])
             else:
                 # If not carrying yet, move towards the dead creature
                 target_x, target_y = self.target.x, self.target.y
@@ -142,12 +197,12 @@ class Creature:
             target_x, target_y = self.target.x, self.target.y
         elif self.target == "sleeping":
             center = self.env.get_area_center("sleeping")
-            target_x = int(center[0] / GRID_SIZE)
-            target_y = int(center[1] / GRID_SIZE)
+            target_x = int(center[0])
+            target_y = int(center[1])
         elif self.target == "nursery":
             center = self.env.get_area_center("nursery")
-            target_x = int(center[0] / GRID_SIZE)
-            target_y = int(center[1] / GRID_SIZE)
+            target_x = int(center[0])
+            target_y = int(center[1])
             self.color = (255, 200, 0)  # Match egg color when moving to nursery
         elif self.target == "food":
             # First check if there's food adjacent to eat
@@ -169,15 +224,15 @@ class Creature:
                 target_x, target_y = food_position
             else:
                 # If no food found, move randomly
-                target_x = self.x + random.randint(-1, 1)
-                target_y = self.y + random.randint(-1, 1)
+                target_x = self.x + self.env.rng.behaviour.randint(-1, 1)
+                target_y = self.y + self.env.rng.behaviour.randint(-1, 1)
         else:
             # Random movement with bias towards current direction
-            if random.random() < 0.8:
-                target_x = self.x + random.randint(-1, 1)
-                target_y = self.y + random.randint(-1, 1)
+            if self.env.rng.behaviour.random() < 0.8:
+                target_x = self.x + self.env.rng.behaviour.randint(-1, 1)
+                target_y = self.y + self.env.rng.behaviour.randint(-1, 1)
             else:
-                angle = random.uniform(0, 2 * 3.14159)
+                angle = self.env.rng.behaviour.uniform(0, 2 * 3.14159)
                 target_x = self.x + round(math.cos(angle))
                 target_y = self.y + round(math.sin(angle))
         
@@ -187,15 +242,19 @@ class Creature:
         
         # Try to move towards target
         if self.env.try_move_towards(self, target_x, target_y):
-            # If we successfully moved and we're carrying food to the food area
-            if (self.carrying_food and 
-                isinstance(self.target, Creature) and 
-                self.target.dead and 
-                self.env.is_in_area(self.target.x, self.target.y, "food")):
-                # Release the food once it's in the storage area
-                self.carrying_food = False
-                self.target = None
-                self.color = (0, 255, 0)  # Reset color
+            self.after_move()
+
+    def after_move(self):
+        """React to a successful move"""
+        # If we successfully moved and we're carrying food to the food area
+        if (self.carrying_food and 
+            isinstance(self.target, Creature) and 
+            self.target.dead and 
+            self.env.is_in_area(self.target.x, self.target.y, "food")):
+            # Release the food once it's in the storage area
+            self.carrying_food = False
+            self.target = None
+            self.color = (0, 255, 0)  # Reset color
 
     def update(self, dt):
         """Update the creature's state"""
@@ -220,23 +279,14 @@ class Creature:
 
         # Only process game logic updates when not paused
         if self.env.game_manager.current_speed_state != "pause":
-            # Always update basic stats first
-            self.age += 1
-            if self.age >= 20:
-                self.mature = True
-            
-            # Age effects and death
+            # Age effects (maturity and old-age death are scheduled events)
             if self.age > self.max_age * 0.7:
-                if random.random() < 0.1:
+                if self.env.rng.behaviour.random() < 0.1:
                     self.health = max(0, self.health - 1)
                     self.age_related_health_loss = True
-            
-            if self.age >= self.max_age:
-                self.die()
-                return
 
             # Always update hunger and energy
-            if random.random() < 0.2:
+            if self.env.rng.behaviour.random() < 0.2:
                 self.hunger = max(0, self.hunger - 1)
             energy_cost = 1 if self.eating or self.carrying_food else 0.5
             self.energy = max(0, self.energy - energy_cost)
@@ -255,138 +305,152 @@ class Creature:
                     self.die()
                     return
 
-            # Modified hunger behavior - look for food more proactively
-            if self.hunger <= 30:  # Changed from 20 to 30
-                self.sleeping = False
-                self.target = "food"
-                self.move(self.env.width, self.env.height)
-                return
+            # An attached controller (such as a training policy) replaces the built-in behaviour
+            if self.env.controller is not None:
+                self.env.controller.act(self)
+            else:
+                self.behave()
 
-            # Sleep behavior
-            if self.sleeping:
-                if not self.env.is_in_area(self.x, self.y, "sleeping"):
-                    self.target = "sleeping"
-                    self.color = (0, 255, 0)
-                    self.move(self.env.width, self.env.height)
-                else:
-                    # Recover energy faster when well-fed
-                    recovery_rate = 3 if self.hunger > 50 else 1
-                    self.energy = min(100, self.energy + recovery_rate)
-                    self.color = (100, 100, 255)
-                    
-                    if (self.energy >= self.wake_threshold or
-                        self.hunger <= 30 or
-                        self.health < 50):
-                        self.sleeping = False
-                        self.target = None
-            
-            # Check if creature needs sleep
-            elif self.energy <= self.rest_threshold and self.hunger > 30:
-                self.sleeping = True
+    def behave(self):
+        """Pick and carry out this tick's action with the built-in rules"""
+        config = self.env.config
+
+        # Modified hunger behavior - look for food more proactively
+        if self.hunger <= config.HUNGER_SEEK_FOOD_THRESHOLD:
+            self.sleeping = False
+            self.target = "food"
+            self.move(self.env.width, self.env.height)
+            return
+
+        # Sleep behavior
+        if self.sleeping:
+            if not self.env.is_in_area(self.x, self.y, "sleeping"):
                 self.target = "sleeping"
+                self.color = (0, 255, 0)
                 self.move(self.env.width, self.env.height)
-            
-            # Normal behavior
             else:
-                # Always try to move unless sleeping in sleep area
-                if not (self.sleeping and self.env.is_in_area(self.x, self.y, "sleeping")):
-                    self.move(self.env.width, self.env.height)
-
-                if self.egg_laying_cooldown > 0:
-                    self.egg_laying_cooldown -= 1
-
-                # Check egg laying conditions first
-                if (not self.sleeping and not self.eating and 
-                    not self.egg and self.mature and 
-                    self.egg_laying_cooldown == 0 and  # Only if cooldown is complete
-                    self.happiness >= 70 and 
-                    self.energy >= 60 and    
-                    self.hunger >= 60):  
+                # Recover energy faster when well-fed
+                recovery_rate = 3 if self.hunger > 50 else 1
+                self.energy = min(100, self.energy + recovery_rate)
+                self.color = (100, 100, 255)
+                
+                if (self.energy >= self.wake_threshold or
+                    self.hunger <= config.HUNGER_SEEK_FOOD_THRESHOLD or
+                    self.health < 50):
+                    self.sleeping = False
+                    self.target = None
+        
+        # Check if creature needs sleep
+        elif self.energy <= self.rest_threshold and self.hunger > config.HUNGER_SEEK_FOOD_THRESHOLD:
+            self.sleeping = True
+            self.target = "sleeping"
+            self.move(self.env.width, self.env.height)
+        
+        # Normal behavior
+        else:
+            # Always try to move unless sleeping in sleep area
+            if not (self.sleeping and self.env.is_in_area(self.x, self.y, "sleeping")):
+                self.move(self.env.width, self.env.height)
+
+            # Check egg laying conditions first
+            if not self.sleeping and not self.eating and self.ready_to_lay_egg():
+                if self.env.is_in_area(self.x, self.y, "nursery"):
+                    self.lay_egg_nearby()
+                else:
+                    # Move towards nursery if ready to lay egg
+                    self.target = "nursery"
+                    self.color = (255, 200, 0)  # Match egg color
+                    return  # Return here to prioritize egg laying
+
+            # Prioritize eating over moving bodies
+            if not self.sleeping and not self.eating:
+                nearby_entities = self.env.get_nearby_entities(self.x, self.y)
+                found_food = False
+                
+                # First check if we can eat something adjacent
+                if self.hunger < config.HUNGER_EAT_THRESHOLD:
+                    for entity in nearby_entities:
+                        if isinstance(entity, Creature) and entity.dead and entity.food_value > 0:
+                            dx = abs(self.x - entity.x)
+                            dy = abs(self.y - entity.y)
+                            if dx + dy == 1:  # Adjacent but not diagonal
+                                if self.eat(entity):
+                                    self.color = (255, 200, 0)
+                                    found_food = True
+                                    self.target = None
+                                    self.carrying_food = False
+                                    break
+                
+                # If we didn't find adjacent food to eat, look for dead creatures to move
+                if not found_food:
+                    found_dead_creature = False
                     
-                    if self.env.is_in_area(self.x, self.y, "nursery"):
-                        # Try to lay egg in adjacent spot
-                        adjacent_spots = [
-                            (self.x + dx, self.y + dy)
-                            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]
-                            if (self.env.is_valid_position(self.x + dx, self.y + dy) and
-                                not self.env.is_position_occupied(self.x + dx, self.y + dy) and
-                                self.env.is_in_area(self.x + dx, self.y + dy, "nursery"))
-                        ]
-                        
-                        if adjacent_spots:
-                            egg_x, egg_y = random.choice(adjacent_spots)
-                            self.energy -= 50
-                            new_egg = Egg(egg_x, egg_y, self.env)
-                            self.env.eggs.append(new_egg)
-                            self.env.grid[(egg_x, egg_y)] = new_egg
-                            self.has_laid_egg = True  # Track current egg
-                            self.egg_laying_cooldown = self.egg_laying_cooldown_max  # Start cooldown
+                    # First check if we're currently carrying a dead creature
+                    if self.carrying_food and isinstance(self.target, Creature):
+                        # Check if we're still adjacent to our target
+                        if abs(self.x - self.target.x) + abs(self.y - self.target.y) == 1:
+                            found_dead_creature = True
+                        else:
+                            # Lost contact with the dead creature we were carrying
+                            self.carrying_food = False
                             self.target = None
-                    else:
-                        # Move towards nursery if ready to lay egg
-                        self.target = "nursery"
-                        self.color = (255, 200, 0)  # Match egg color
-                        return  # Return here to prioritize egg laying
-
-                # Prioritize eating over moving bodies
-                if not self.sleeping and not self.eating:
-                    nearby_entities = self.env.get_nearby_entities(self.x, self.y)
-                    found_food = False
+                            self.color = (0, 255, 0)  # Reset color
                     
-                    # First check if we can eat something adjacent
-                    if self.hunger < 70:
+                    # Only look for new dead creatures if we're not already carrying one
+                    if not self.carrying_food:
                         for entity in nearby_entities:
-                            if isinstance(entity, Creature) and entity.dead and entity.food_value > 0:
-                                dx = abs(self.x - entity.x)
-                                dy = abs(self.y - entity.y)
-                                if dx + dy == 1:  # Adjacent but not diagonal
-                                    if self.eat(entity):
-                                        self.color = (255, 200, 0)
-                                        found_food = True
-                                        self.target = None
-                                        self.carrying_food = False
-                                        break
+                            if (isinstance(entity, Creature) and 
+                                entity.dead and 
+                                entity.food_value > 0 and 
+                                not self.env.is_in_area(entity.x, entity.y, "food") and
+                                not any(c.target == entity for c in self.env.creatures if c != self and not c.dead)):
+                                # Check if adjacent to the dead creature
+                                if abs(self.x - entity.x) + abs(self.y - entity.y) == 1:
+                                    self.target = entity
+                                    self.carrying_food = True
+                                    self.color = (200, 150, 50)  # Brown while carrying
+                                    found_dead_creature = True
+                                    break
                     
-                    # If we didn't find adjacent food to eat, look for dead creatures to move
-                    if not found_food:
-                        found_dead_creature = False
-                        
-                        # First check if we're currently carrying a dead creature
-                        if self.carrying_food and isinstance(self.target, Creature):
-                            # Check if we're still adjacent to our target
-                            if abs(self.x - self.target.x) + abs(self.y - self.target.y) == 1:
-                                found_dead_creature = True
-                            else:
-                                # Lost contact with the dead creature we were carrying
-                                self.carrying_food = False
-                                self.target = None
-                                self.color = (0, 255, 0)  # Reset color
-                        
-                        # Only look for new dead creatures if we're not already carrying one
-                        if not self.carrying_food:
-                            for entity in nearby_entities:
-                                if (isinstance(entity, Creature) and 
-                                    entity.dead and 
-                                    entity.food_value > 0 and 
-                                    not self.env.is_in_area(entity.x, entity.y, "food") and
-                                    not any(c.target == entity for c in self.env.creatures if c != self and not c.dead)):
-                                    # Check if adjacent to the dead creature
-                                    if abs(self.x - entity.x) + abs(self.y - entity.y) == 1:
-                                        self.target = entity
-                                        self.carrying_food = True
-                                        self.color = (200, 150, 50)  # Brown while carrying
-                                        found_dead_creature = True
-                                        break
-                        
-                        # Reset carrying_food if no dead creature is found nearby
-                        if not found_dead_creature and self.carrying_food:
-                            self.carrying_food = False
-                            self.target = None
-                            self.color = (0, 255, 0)  # Reset color
-
-                # Update happiness and visual state at the end
-                self.happiness = self.calculate_happiness()
-                self.update_visual_state()
+                    # Reset carrying_food if no dead creature is found nearby
+                    if not found_dead_creature and self.carrying_food:
+                        self.carrying_food = False
+                        self.target = None
+                        self.color = (0, 255, 0)  # Reset color
+
+            # Update happiness and visual state at the end
+            self.happiness = self.calculate_happiness()
+            self.update_visual_state()
+
+    def ready_to_lay_egg(self):
+        """Check whether the creature may lay an egg this tick"""
+        config = self.env.config
+        return (not self.egg and self.mature and
+                self.egg_laying_cooldown == 0 and  # Only if cooldown is complete
+                self.happiness >= config.EGG_LAYING_MIN_HAPPINESS and
+                self.energy >= config.EGG_LAYING_MIN_ENERGY and
+                self.hunger >= config.EGG_LAYING_MIN_HUNGER)
+
+    def lay_egg_nearby(self):
+        """Lay an egg on a free adjacent nursery tile, returning whether one was laid"""
+        adjacent_spots = [
+            (self.x + dx, self.y + dy)
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]
+            if (self.env.is_valid_position(self.x + dx, self.y + dy) and
+                not self.env.is_position_occupied(self.x + dx, self.y + dy) and
+                self.env.is_in_area(self.x + dx, self.y + dy, "nursery"))
+        ]
+        if not adjacent_spots:
+            return False
+
+        egg_x, egg_y = self.env.rng.behaviour.choice(adjacent_spots)
+        self.energy -= 50
+        self.env.add_egg(Egg(egg_x, egg_y, self.env, parent=self))
+        self.has_laid_egg = True  # Track current egg
+        self.egg_laying_cooldown = self.egg_laying_cooldown_max  # Start cooldown
+        self.env.scheduler.schedule(self.egg_laying_cooldown_max, self.end_egg_laying_cooldown)
+        self.target = None
+        return True
 
     def update_visual_state(self):
         """Update the creature's visual appearance based on its state"""
@@ -427,21 +491,21 @@ class Creature:
             # Try to lay egg in current position
             if not self.env.is_position_occupied(self.x, self.y + 1):
                 self.energy -= 90
-                new_egg = Egg(self.x, self.y + 1, self.env)
-                self.env.eggs.append(new_egg)
-                self.env.grid[(self.x, self.y + 1)] = new_egg
+                self.env.add_egg(Egg(self.x, self.y + 1, self.env, parent=self))
                 self.has_laid_egg = True
             elif not self.env.is_position_occupied(self.x + 1, self.y):
                 self.energy -= 90
-                new_egg = Egg(self.x + 1, self.y, self.env)
-                self.env.eggs.append(new_egg)
-                self.env.grid[(self.x + 1, self.y)] = new_egg
+                self.env.add_egg(Egg(self.x + 1, self.y, self.env, parent=self))
                 self.has_laid_egg = True
 
     def die(self):
         """Mark the creature as dead and determine cause of death"""
-        if not self.dead:
+        newly_dead = not self.dead
+        if newly_dead:
+            self.env.population.creature_died(self, self.env.zones_at(self.x, self.y))
             self.dead = True
+            self.death_tick = self.env.tick
+            self.env.lineage.record_death(self.id, self.death_tick)
             self.color = (255, 0, 0)  # Red color for dead creatures
             self.health = 0
         
@@ -452,6 +516,9 @@ class Creature:
         else:
             self.death_cause = "Unknown"
 
+        if newly_dead:
+            self.env.events.emit(DEATH, self)
+
     def __str__(self):
         if self.dead:
             return f"""DEAD CREATURE
@@ -498,6 +565,7 @@ Position: ({self.x}, {self.y})"""
                 food_source.food_value -= food_amount
                 self.hunger = min(100, self.hunger + food_amount * 1.5)
                 self.color = (255, 200, 0)  # Yellow while eating
+                self.env.events.emit(EAT, self, food_source, food_amount)
                 
                 # Don't reset eating state here - let update() handle it
                 return True
@@ -852,8 +920,8 @@ Position: ({self.x}, {self.y})"""
                             elif self.target in ["sleeping", "nursery", "food"]:
                                 # Look towards area center
                                 center = self.env.get_area_center(self.target)
-                                dx = (center[0] / GRID_SIZE) - self.x
-                                dy = (center[1] / GRID_SIZE) - self.y
+                                dx = center[0] - self.x
+                                dy = center[1] - self.y
                             else:
                                 dx = dy = 0
                             
@@ -1068,7 +1136,7 @@ Position: ({self.x}, {self.y})"""
                     self.blink_timer = BLINK_DURATION
                 else:
                     self.is_blinking = False
-                    self.blink_timer = BLINK_INTERVAL + random.randint(-2, 2)  # Add some randomness
+                    self.blink_timer = BLINK_INTERVAL + self.env.rng.appearance.randint(-2, 2)  # Add some randomness
 
     def update_mouth(self):
         """Update mouth animation state"""
@@ -1087,8 +1155,8 @@ Position: ({self.x}, {self.y})"""
             self.target_mouth_open = 2 + math.sin(self.animation_timer) * 1
         else:
             # Normal state - occasional mouth movements
-            if random.random() < 0.01:  # Random chance to open/close mouth
-                self.target_mouth_open = random.uniform(0, 3)
+            if self.env.rng.appearance.random() < 0.01:  # Random chance to open/close mouth
+                self.target_mouth_open = self.env.rng.appearance.uniform(0, 3)
         
         # Smoothly animate towards target
         if self.mouth_open_amount < self.target_mouth_open:
@@ -1133,14 +1201,14 @@ Position: ({self.x}, {self.y})"""
             spot_size = radius * 0.25 * self.pattern_scale
             for i in range(pattern_info["density"]):
                 angle = (i / pattern_info["density"] * 2 * math.pi + self.pattern_offset) % (2 * math.pi)
-                dist = radius * random.uniform(0.2, 0.7)  # Random distance from center
+                dist = radius * self.env.rng.rendering.uniform(0.2, 0.7)  # Random distance from center
                 spot_x = center_x + math.cos(angle) * dist
                 spot_y = center_y + math.sin(angle) * dist
                 
                 # Create a simpler circular spot instead of polygon
                 shapes.append(pyglet.shapes.Circle(
                     spot_x, spot_y,
-                    spot_size * random.uniform(0.8, 1.2),  # Random size variation
+                    spot_size * self.env.rng.rendering.uniform(0.8, 1.2),  # Random size variation
                     color=self.pattern_color,
                     batch=batch
                 ))
@@ -1154,4 +1222,4 @@ Position: ({self.x}, {self.y})"""
         
         # Increase decomposition
         self.decomposition = min(MAX_DECOMPOSITION, 
-                               self.decomposition + DECOMPOSITION_RATE)
\ No newline at end of file
+                               self.decomposition + self.env.config.DECOMPOSITION_RATE)
\ No newline at end of file
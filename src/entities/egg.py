@@ -5,30 +5,33 @@ from utils.constants import *
 
 # The egg class to handle egg incubation
 class Egg:
-    def __init__(self, x, y, environment):
+    def __init__(self, x, y, environment, parent=None):
         self.x = x
         self.y = y
         self.env = environment
-        self.timer = 0
-        self.hatch_time = EGG_HATCH_TIME
+        self.id = environment.new_entity_id()
+        self.parent_id = parent.id if parent else None  # Creature that laid the egg
+        self.laid_tick = environment.tick
+        self.hatch_time = environment.config.EGG_HATCH_TIME
         self.selected = False
         self.ready_to_hatch = False
 
-    def update(self):
-        """Increment the egg's timer and check if ready to hatch"""
-        if self.timer < self.hatch_time:
-            self.timer += 1
-        
-        if self.timer >= self.hatch_time and not self.ready_to_hatch:
-            # Reset egg laying status for nearby parent creatures
-            nearby_creatures = [
-                creature for creature in self.env.creatures
-                if abs(creature.x - self.x) + abs(creature.y - self.y) <= EGG_NEARBY_PARENT_RANGE
-                and creature.has_laid_egg
-            ]
-            for creature in nearby_creatures:
-                creature.has_laid_egg = False
-            self.ready_to_hatch = True
+    @property
+    def timer(self):
+        """Ticks spent incubating, derived from the laying tick"""
+        return min(self.hatch_time, self.env.tick - self.laid_tick)
+
+    def hatch(self):
+        """Scheduled hatching: release the parent and hatch into a creature"""
+        if self.ready_to_hatch:
+            return
+
+        # Reset egg laying status for the parent that laid this egg
+        parent = self.env.creatures.get(self.parent_id)
+        if parent:
+            parent.has_laid_egg = False
+        self.ready_to_hatch = True
+        self.env.hatch_egg(self)
 
     def get_progress(self):
         """Return the egg's incubation progress as a percentage"""
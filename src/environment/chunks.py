@@ -0,0 +1,248 @@
+import operator
+
+import numpy as np
+
+from utils.constants import *
+from environment import fields
+
+# Sparse grass and fertility for huge, mostly empty worlds. The world is cut
+# into square chunks and only chunks holding grass, fertility or a
+# decomposition site are stored and updated; the rest cost nothing. Each
+# layer reads and writes like the dense (width, height) array it replaces.
+#
+# Stored chunks far from any creature, egg or corpse can also be put to
+# sleep (see settle). A sleeping chunk is skipped entirely; the only thing
+# that happens to it meanwhile, slow growth of the grass already there, is
+# caught up in closed form when it wakes or is read. Grass spreading into,
+# out of and within a sleeping chunk is suspended.
+
+
+# Chunk table shared by the grass and fertility layers
+class ChunkedFields:
+    def __init__(self, width, height, size=FIELD_CHUNK_SIZE):
+        self.width = width
+        self.height = height
+        self.size = size
+        self.chunks = {}  # (chunk x, chunk y) -> (2, size, size) array of grass and fertility
+        self.sleeping = {}  # Chunk key -> tick it was last advanced, for stored chunks left idle
+        self.tick = 0  # Last tick the fields were advanced through
+        self.growth = 0.0  # Slow grass growth per tick, taken from the config of the last update
+        self.grass = ChunkedLayer(self, 0)
+        self.fertility = ChunkedLayer(self, 1)
+
+    def _overlapping(self, x0, x1, y0, y1):
+        """Yield (key, chunk slices, region slices) of every chunk overlapping a region"""
+        size = self.size
+        for cx in range(x0 // size, (x1 - 1) // size + 1):
+            for cy in range(y0 // size, (y1 - 1) // size + 1):
+                ax0, ax1 = max(x0, cx * size), min(x1, (cx + 1) * size)
+                ay0, ay1 = max(y0, cy * size), min(y1, (cy + 1) * size)
+                yield ((cx, cy),
+                       (slice(ax0 - cx * size, ax1 - cx * size), slice(ay0 - cy * size, ay1 - cy * size)),
+                       (slice(ax0 - x0, ax1 - x0), slice(ay0 - y0, ay1 - y0)))
+
+    def _view(self, key):
+        """Return a stored chunk as of now, caught up without waking it if it sleeps"""
+        chunk = self.chunks.get(key)
+        if chunk is None or key not in self.sleeping:
+            return chunk
+        return self._caught_up(chunk, self.tick - self.sleeping[key])
+
+    def _caught_up(self, chunk, ticks):
+        chunk = chunk.copy()
+        growing = chunk[0] > 0
+        chunk[0][growing] = np.minimum(chunk[0][growing] + ticks * self.growth, MAX_GRASS)
+        return chunk
+
+    def _wake(self, key):
+        if key in self.sleeping:
+            self.chunks[key] = self._caught_up(self.chunks[key], self.tick - self.sleeping.pop(key))
+
+    def settle(self, positions):
+        """Put chunks to sleep unless one of positions is in or next to them, waking the others
+
+        positions are where the world is active this tick: living creatures,
+        corpses and eggs. Nothing there moves more than one tile per tick, so
+        a chunk is always awake before anything can reach it.
+        """
+        size = self.size
+        awake = {(x // size + dx, y // size + dy) for x, y in positions
+                 for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+        for key in list(self.sleeping):
+            if key in awake:
+                self._wake(key)
+        for key in self.chunks:
+            if key not in awake and key not in self.sleeping:
+                self.sleeping[key] = self.tick
+
+    def read(self, layer, x0, x1, y0, y1):
+        """Return a dense copy of one layer over [x0, x1) x [y0, y1)"""
+        region = np.zeros((x1 - x0, y1 - y0))
+        if x1 > x0 and y1 > y0:
+            for key, inside, target in self._overlapping(x0, x1, y0, y1):
+                chunk = self._view(key)
+                if chunk is not None:
+                    region[target] = chunk[(layer,) + inside]
+        return region
+
+    def write(self, layer, x0, x1, y0, y1, values):
+        """Overwrite one layer over [x0, x1) x [y0, y1), allocating chunks only for non-zero values"""
+        values = np.broadcast_to(values, (x1 - x0, y1 - y0))
+        if x1 <= x0 or y1 <= y0:
+            return
+        for key, inside, target in self._overlapping(x0, x1, y0, y1):
+            self._wake(key)
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                if not values[target].any():
+                    continue
+                chunk = self.chunks[key] = np.zeros((2, self.size, self.size))
+            chunk[(layer,) + inside] = values[target]
+
+    def update(self, positions, spread, config):
+        """Advance grass and fertility by one tick, like fields.update_fields
+
+        Every stored chunk or chunk with a decomposition site is updated
+        together with its neighbours, which is as far as anything reaches in
+        one tick. They are advanced as one batch of chunks padded with
+        fields.STRIPE_HALO tiles of their surroundings, so while nothing
+        sleeps the result matches the dense kernel exactly. Sleeping chunks
+        are only read as surroundings. Chunks left empty are dropped again.
+        """
+        self.growth = config.GRASS_GROWTH_RATE * 0.05
+        for x, y in positions:
+            self._wake((x // self.size, y // self.size))  # A deposit always lands on an awake chunk
+        self._advance(positions, spread, config)
+        self.tick += 1
+
+    def _advance(self, positions, spread, config):
+        size, halo = self.size, fields.STRIPE_HALO
+        columns = (self.width + size - 1) // size
+        rows = (self.height + size - 1) // size
+        sourced = {(x // size, y // size) for x, y in positions}
+        work = sorted({(cx + dx, cy + dy)
+                       for cx, cy in (set(self.chunks) - set(self.sleeping)) | sourced
+                       for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                       if 0 <= cx + dx < columns and 0 <= cy + dy < rows and
+                       (cx + dx, cy + dy) not in self.sleeping})
+        if not work:
+            return
+
+        # Pad every chunk with the edges of its neighbours; beyond the world stays zero
+        side = size + 2 * halo
+        slabs = np.zeros((len(work), 2, side, side))
+        sources = np.zeros((len(work), side, side), dtype=bool)
+        index = {key: i for i, key in enumerate(work)}
+        for i, (cx, cy) in enumerate(work):
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    chunk = self._view((cx + dx, cy + dy))
+                    if chunk is None:
+                        continue
+                    x0, y0 = halo + dx * size, halo + dy * size
+                    sx0, sx1 = max(x0, 0), min(x0 + size, side)
+                    sy0, sy1 = max(y0, 0), min(y0 + size, side)
+                    slabs[i, :, sx0:sx1, sy0:sy1] = chunk[:, sx0 - x0:sx1 - x0, sy0 - y0:sy1 - y0]
+        for x, y in positions:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    i = index.get((x // size + dx, y // size + dy))
+                    if i is None:
+                        continue
+                    cx, cy = work[i]
+                    lx, ly = x - cx * size + halo, y - cy * size + halo
+                    if 0 <= lx < side and 0 <= ly < side:
+                        sources[i, lx, ly] = True
+
+        # Rolling spread columns depend on where a slab starts, so slabs sharing a phase go together
+        if isinstance(spread, slice):
+            groups = {}
+            for i, (cx, cy) in enumerate(work):
+                groups.setdefault((cx * size - halo - spread.start) % spread.step, []).append(i)
+            batches = [(np.array(group), fields.offset_spread(spread, work[group[0]][0] * size - halo))
+                       for group in groups.values()]
+        else:
+            batches = [(np.arange(len(work)), spread)]
+        for members, batch_spread in batches:
+            grass, fertility = slabs[members, 0], slabs[members, 1]
+            fields.update_fields(grass, fertility, sources[members], batch_spread, config)
+            slabs[members, 0], slabs[members, 1] = grass, fertility
+
+        for i, (cx, cy) in enumerate(work):
+            block = slabs[i, :, halo:halo + size, halo:halo + size]
+            # Tiles of edge chunks beyond the world never hold anything
+            block[:, max(self.width - cx * size, 0):, :] = 0
+            block[:, :, max(self.height - cy * size, 0):] = 0
+            if block.any():
+                self.chunks[(cx, cy)] = block.copy()
+            else:
+                self.chunks.pop((cx, cy), None)
+
+
+# One layer of a ChunkedFields, indexed [x, y] like a dense array. Single
+# tiles and step-1 slices are read and written in place; anything else
+# works on a dense copy.
+class ChunkedLayer:
+    def __init__(self, store, layer):
+        self.store = store
+        self.layer = layer
+
+    @property
+    def shape(self):
+        return (self.store.width, self.store.height)
+
+    def _bounds(self, key):
+        """Turn an index into (x0, x1, y0, y1, squeezed axes)"""
+        if key is Ellipsis:
+            key = (slice(None), slice(None))
+        bounds, squeeze = [], []
+        for axis, (item, length) in enumerate(zip(key, self.shape)):
+            if isinstance(item, slice):
+                start, stop, step = item.indices(length)
+                if step != 1:
+                    raise IndexError("Chunked fields only support step-1 slices")
+                bounds.extend((start, max(start, stop)))
+            else:
+                item = operator.index(item)
+                if not -length <= item < length:
+                    raise IndexError(f"Index {item} is out of bounds for size {length}")
+                item %= length
+                bounds.extend((item, item + 1))
+                squeeze.append(axis)
+        return bounds, tuple(squeeze)
+
+    def __getitem__(self, key):
+        (x0, x1, y0, y1), squeeze = self._bounds(key)
+        if len(squeeze) == 2:
+            size = self.store.size
+            chunk = self.store._view((x0 // size, y0 // size))
+            return 0.0 if chunk is None else chunk[self.layer, x0 % size, y0 % size]
+        return self.store.read(self.layer, x0, x1, y0, y1).squeeze(squeeze)
+
+    def __setitem__(self, key, value):
+        (x0, x1, y0, y1), squeeze = self._bounds(key)
+        value = np.asarray(value, dtype=np.float64)
+        self.store.write(self.layer, x0, x1, y0, y1, np.expand_dims(value, squeeze) if value.ndim else value)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.toarray().astype(dtype or np.float64, copy=False)
+
+    def toarray(self):
+        """Return the whole layer as a dense array"""
+        return self.store.read(self.layer, 0, self.store.width, 0, self.store.height)
+
+    def copy(self):
+        return self.toarray()
+
+    def sum(self):
+        return sum(float(self.store._view(key)[self.layer].sum()) for key in self.store.chunks)
+
+    def nonzero(self):
+        """Return the x and y indices of non-zero tiles, like np.nonzero"""
+        size = self.store.size
+        xs, ys = [np.zeros(0, dtype=np.intp)], [np.zeros(0, dtype=np.intp)]
+        for (cx, cy), chunk in self.store.chunks.items():
+            x, y = np.nonzero(chunk[self.layer])  # Sleeping only grows tiles that already have grass
+            xs.append(x + cx * size)
+            ys.append(y + cy * size)
+        return np.concatenate(xs), np.concatenate(ys)
@@ -0,0 +1,33 @@
+# Dense entity storage with O(1) lookup and swap-remove by stable entity ID
+class EntityTable:
+    def __init__(self):
+        self.items = []  # Entities packed densely for fast iteration
+        self.slots = {}  # Entity ID -> index into items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, entity):
+        slot = self.slots.get(getattr(entity, "id", None))
+        return slot is not None and self.items[slot] is entity
+
+    def get(self, entity_id):
+        """Return the entity with this ID, or None once it has left the world"""
+        slot = self.slots.get(entity_id)
+        return None if slot is None else self.items[slot]
+
+    def add(self, entity):
+        """Store an entity under its ID"""
+        self.slots[entity.id] = len(self.items)
+        self.items.append(entity)
+
+    def remove(self, entity):
+        """Remove an entity by moving the last entity into its slot"""
+        slot = self.slots.pop(entity.id)
+        last = self.items.pop()
+        if last is not entity:
+            self.items[slot] = last
+            self.slots[last.id] = slot
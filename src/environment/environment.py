@@ -1,42 +1,73 @@
-import random
 import math
 import pyglet
 import time
 
+import numpy as np
+
 from entities.creature import Creature
+from environment.entity_table import EntityTable
+from environment import fields, movement
+from environment.chunks import ChunkedFields
+from environment.events import EventBus, BIRTH, EGG_LAID, HATCH, REMOVAL
+from environment.invariants import InvariantChecker
+from environment.lineage import Lineage
+from environment.population import PopulationCounters, ZONES
+from environment.scheduler import Scheduler
+from utils.config import SimulationConfig, WorldConfig
 from utils.constants import *
+from utils.rng import RngService
 
 # The environment where creatures live
 class Environment:
-    def __init__(self, width, height, game_manager=None):
-        # Adjust width to account for sidebar
-        self.width = (WIDTH - SIDEBAR_WIDTH) // GRID_SIZE  # Use adjusted width
-        self.height = height
+    def __init__(self, width=None, height=None, game_manager=None, seed=None, populate=True, config=None,
+                 world=None):
+        # Size and zone layout in tiles; width and height alone give the standard layout
+        self.world = world or WorldConfig(width, height)
+        self.width = self.world.width
+        self.height = self.world.height
         self.game_manager = game_manager
-        # Pass self (environment) to creature constructor
-        self.creatures = [
-            Creature(random.randint(0, self.width-1), 
-                    random.randint(0, self.height-1),
-                    self)  # Pass self here
-        ]
-        
-        self.eggs = []  # List to track eggs
+        self.controller = None  # Object whose act(creature) replaces the built-in creature behaviour
+        self.config = config or SimulationConfig()  # This world's values of the tunable constants
+        self.rng = RngService(seed)  # Seeded per-subsystem random streams
+        self.scheduler = Scheduler()  # Lifecycle events (hatching, old age, cooldowns)
+        self.lineage = Lineage()  # Parent links, birth and death ticks
+        self.events = EventBus()  # Birth, death, hatch, eat and removal notifications
+        self.population = PopulationCounters()  # Live counts kept in sync on transitions
+        self.sleeping_area_scale = 1.0
+        self.food_area_scale = 1.0
+        self.nursery_area_scale = 1.0
+        self.zone_cache = {}  # Position -> zones containing it, reset when areas rescale
+
+        self.next_id = 0  # Entity IDs are never reused
+        self.id_stride = 1  # Gap between IDs, so several processes can share one ID space
+        self.creatures = EntityTable()
+        self.eggs = EntityTable()  # Table to track eggs
         self.grid = {}  # Add a grid to track occupied positions
-        # Add initial creatures to the grid
-        for creature in self.creatures:
-            self.grid[(creature.x, creature.y)] = creature
+        # Pass self (environment) to creature constructor
+        if populate:
+            self.add_creature(Creature(self.rng.behaviour.randint(0, self.width-1), 
+                                       self.rng.behaviour.randint(0, self.height-1),
+                                       self))  # Pass self here
             
         self.creatures_to_remove = []  # Track creatures to remove after being eaten
         self.cell_size = GRID_SIZE * 2  # Size of each partition cell
         self.spatial_grid = {}  # Spatial partitioning grid
-        self.sleeping_area_scale = 1.0
-        self.food_area_scale = 1.0
-        self.nursery_area_scale = 1.0
-        self.fertility = {} 
-        self.grass = {}      
-        self.decomposing_positions = set()  # Add this line
-        self.initial_death_positions = {}  # Add this to track where creatures first died
-        self.last_positions = {}  # Add this to track last position
+        self.halo = []  # Read-only corpses owned by another process, visible to nearby searches
+        self.field_backend = FIELD_BACKEND  # Name of the fields.BACKENDS entry used each tick
+        if self.field_backend == "chunked":
+            # Sparse layers that only store the parts of the world with grass or fertility
+            chunked = ChunkedFields(self.width, self.height)
+            self.fertility, self.grass = chunked.fertility, chunked.grass
+        else:
+            self.fertility = np.zeros((self.width, self.height))  # Indexed [x, y]
+            self.grass = np.zeros((self.width, self.height))
+        self.spread_mode = GRASS_SPREAD  # "burst" spreads the whole grid now and then, "rolling" a part every tick
+        self.movement = MOVEMENT  # One of movement.MODES
+        self.intents = None  # Moves proposed this tick, collected only in two-phase movement
+        self.decomposing_positions = {}  # Insertion-ordered set of positions (values unused)
+        self.initial_death_positions = {}  # Creature ID -> where it first died
+        self.last_positions = {}  # Creature ID -> last decomposition position
+        self.invariants = InvariantChecker(INVARIANT_CHECKS, seed=self.rng.seed)  # Run after every tick
         
     def is_position_occupied(self, x, y):
         """Check if a position is occupied by any entity"""
@@ -94,21 +125,51 @@ class Environment:
             if dx <= radius and dy <= radius:
                 if creature.dead:
                     nearby.append(creature)
+
+        for corpse in self.halo:
+            if abs(corpse.x - x) <= radius and abs(corpse.y - y) <= radius:
+                nearby.append(corpse)
         
         return nearby
 
+    def new_entity_id(self):
+        """Hand out the next stable entity ID"""
+        entity_id = self.next_id
+        self.next_id += self.id_stride
+        return entity_id
+
+    @property
+    def tick(self):
+        """Current simulation tick"""
+        return self.scheduler.tick
+
     def update(self, dt):
         """Update the environment state"""
+        self.update_entities(dt)
+        self.update_fields()
+        self.invariants.check(self)
+
+    def update_entities(self, dt):
+        """Advance the clock, creatures, corpses and eggs by one tick"""
+        # Advance the clock and fire due lifecycle events (hatching, old age, cooldowns)
+        self.scheduler.advance()
+
+        # In two-phase movement creatures only propose moves against this occupancy
+        two_phase = self.movement == movement.TWO_PHASE
+        if two_phase:
+            frozen = set(self.grid)
+            self.intents = []
+
         # Update creatures and handle decomposition
         for creature in self.creatures:
             if creature.dead:
                 current_pos = (creature.x, creature.y)
                 
                 # Track newly dead creatures
-                if creature not in self.initial_death_positions:
-                    self.initial_death_positions[creature] = current_pos
-                    self.last_positions[creature] = current_pos
-                    self.decomposing_positions.add(current_pos)
+                if creature.id not in self.initial_death_positions:
+                    self.initial_death_positions[creature.id] = current_pos
+                    self.last_positions[creature.id] = current_pos
+                    self.decomposing_positions[current_pos] = None
                 
                 # Check if being moved by another creature
                 being_moved = any(
@@ -121,24 +182,26 @@ class Environment:
                 
                 # Handle position changes and fertilizer spread
                 if not being_moved:
-                    last_pos = self.last_positions[creature]
+                    last_pos = self.last_positions[creature.id]
                     if current_pos != last_pos:
-                        self.decomposing_positions.discard(last_pos)
-                        self.decomposing_positions.add(current_pos)
-                        self.last_positions[creature] = current_pos
+                        self.decomposing_positions.pop(last_pos, None)
+                        self.decomposing_positions[current_pos] = None
+                        self.last_positions[creature.id] = current_pos
                     
                     # Add fertilizer at decomposition site
                     if current_pos in self.decomposing_positions:
-                        if current_pos not in self.fertility:
-                            self.fertility[current_pos] = 0
                         self.fertility[current_pos] = min(MAX_FERTILITY, 
-                            self.fertility[current_pos] + DECOMPOSITION_RATE)
+                            self.fertility[current_pos] + self.config.DECOMPOSITION_RATE)
                 
                 # Remove fully decomposed creatures
                 if creature.decomposition >= MAX_DECOMPOSITION:
                     self.creatures_to_remove.append(creature)
             else:
                 creature.update(dt)
+
+        if two_phase:
+            intents, self.intents = self.intents, None
+            movement.resolve(self, intents, frozen)
         
         # Remove fully decomposed creatures
         for creature in self.creatures_to_remove:
@@ -147,113 +210,48 @@ class Environment:
                 if (creature.x, creature.y) in self.grid:
                     del self.grid[(creature.x, creature.y)]
                 # Clean up all tracking for this creature
-                self.decomposing_positions.discard((creature.x, creature.y))
-                if creature in self.initial_death_positions:
-                    del self.initial_death_positions[creature]
-                if creature in self.last_positions:
-                    del self.last_positions[creature]
+                self.decomposing_positions.pop((creature.x, creature.y), None)
+                self.initial_death_positions.pop(creature.id, None)
+                self.last_positions.pop(creature.id, None)
+                self.population.corpse_removed()
+                self.events.emit(REMOVAL, creature)
         self.creatures_to_remove.clear()
-        
-        # Update eggs
-        for egg in self.eggs[:]:  # Create a copy of the list to iterate over
-            egg.update()
-            if egg.ready_to_hatch:
-                # Unselect the egg if it is selected
-                if egg.selected:
-                    egg.selected = False
-                    # Update game manager's selected egg through environment
-                    if self.game_manager:
-                        self.game_manager.selected_egg = None
-
-                # Create new creature at egg's position
-                new_creature = Creature(egg.x, egg.y, self)
-                self.creatures.append(new_creature)
-                self.grid[(egg.x, egg.y)] = new_creature
-                # Remove the hatched egg
-                self.eggs.remove(egg)
-                self.grid.pop((egg.x, egg.y), None)
-        
-        # Update fertility spread and grass growth
-        new_fertility = self.fertility.copy()
-        new_grass = self.grass.copy()
-
-        # Define spread radius (how far grass can spread)
-        SPREAD_RADIUS = 2
-
-        # Process grass growth and spread near decomposing creatures
-        for pos in self.decomposing_positions:
-            # Check cells within spread radius
-            for dx in range(-SPREAD_RADIUS, SPREAD_RADIUS + 1):
-                for dy in range(-SPREAD_RADIUS, SPREAD_RADIUS + 1):
-                    x, y = pos[0] + dx, pos[1] + dy
-                    
-                    # Skip if position is invalid or too far (using Manhattan distance)
-                    if not self.is_valid_position(x, y) or abs(dx) + abs(dy) > SPREAD_RADIUS:
-                        continue
-                    
-                    # Handle fertility spread
-                    if pos in self.fertility:
-                        amount = self.fertility[pos]
-                        spread_amount = amount * FERTILITY_SPREAD_RATE
-                        if (x, y) not in new_fertility:
-                            new_fertility[(x, y)] = 0
-                        new_fertility[(x, y)] = min(MAX_FERTILITY, 
-                            new_fertility[(x, y)] + spread_amount)
-                    
-                    # Handle grass growth and spread
-                    if (x, y) not in new_grass:
-                        new_grass[(x, y)] = 0
-                    
-                    # Faster growth on fertility
-                    if (x, y) in new_fertility and new_fertility[(x, y)] > 0:
-                        new_grass[(x, y)] = min(100, new_grass[(x, y)] + GRASS_GROWTH_RATE * 0.5)
-                    else:
-                        # Slower growth without fertilizer
-                        new_grass[(x, y)] = min(100, new_grass[(x, y)] + GRASS_GROWTH_RATE * 0.1)
-
-        # Spread grass to neighboring cells (much slower)
-        if random.random() < 0.1:  # Only attempt spread 10% of the time
-            grass_positions = list(self.grass.keys())
-            for pos in grass_positions:
-                x, y = pos
-                grass_amount = self.grass[pos]
-                
-                # Only spread if grass amount is high enough
-                if grass_amount > 50:  # Increased threshold for spreading
-                    # Check adjacent cells
-                    for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                        new_x, new_y = x + dx, y + dy
-                        
-                        if self.is_valid_position(new_x, new_y):
-                            if (new_x, new_y) not in new_grass:
-                                new_grass[(new_x, new_y)] = 0
-                            
-                            # Spread much less grass to neighbor
-                            spread_amount = grass_amount * 0.01  # Only 1% of current grass
-                            if (new_x, new_y) in new_fertility:
-                                spread_amount *= 1.5  # 50% bonus on fertility
-                            
-                            new_grass[(new_x, new_y)] = min(100, new_grass[(new_x, new_y)] + spread_amount)
-
-        # Update grass in other areas (extremely slow growth)
-        for x in range(self.width):
-            for y in range(self.height):
-                if (x, y) not in new_grass:
-                    new_grass[(x, y)] = 0
-                # Only grow if some grass is already present
-                if new_grass[(x, y)] > 0:
-                    # Very slow growth away from fertilizer
-                    new_grass[(x, y)] = min(100, new_grass[(x, y)] + GRASS_GROWTH_RATE * 0.05)
-
-        self.fertility = new_fertility
-        self.grass = new_grass
+
+    def update_fields(self):
+        """Advance grass and fertility by one tick with the selected field backend"""
+        if self.field_backend == "chunked" and FIELD_CHUNK_SLEEP:
+            # Only the land around creatures, corpses and eggs stays awake
+            self.grass.store.settle([(entity.x, entity.y) for entity in self.creatures] +
+                                    [(egg.x, egg.y) for egg in self.eggs])
+        fields.BACKENDS[self.field_backend](self.grass, self.fertility, list(self.decomposing_positions),
+                                            self.grass_spread(), self.config)
+
+    def set_field_backend(self, name):
+        """Switch to another fields.BACKENDS entry, moving grass and fertility into the layers it works on"""
+        if name not in fields.BACKENDS:
+            raise ValueError(f"Unknown field backend {name!r}")
+        grass, fertility = np.array(self.grass), np.array(self.fertility)
+        if name == "chunked":
+            chunked = ChunkedFields(self.width, self.height)
+            chunked.grass[...], chunked.fertility[...] = grass, fertility
+            self.fertility, self.grass = chunked.fertility, chunked.grass
+        else:
+            self.fertility, self.grass = fertility, grass
+        self.field_backend = name
+
+    def grass_spread(self):
+        """Return which grass spreads this tick, in the form the field backends take"""
+        if self.spread_mode == "rolling":
+            return fields.rolling_columns(self.tick)  # A tenth of the columns every tick
+        return self.rng.fields.random() < 0.1  # Grass only spreads 10% of the time
 
     def draw(self, screen):
         batch = pyglet.graphics.Batch()
         shapes = []
 
         # Layer 1: Draw fertility and grass with low opacity
-        for (x, y), fertility_amount in self.fertility.items():
+        for x, y in zip(*np.nonzero(self.fertility)):
+            fertility_amount = self.fertility[x, y]
             if fertility_amount > 0:
                 alpha = int((fertility_amount / MAX_FERTILITY) * 80)  # Very transparent
                 shapes.append(pyglet.shapes.Rectangle(
@@ -263,9 +261,10 @@ class Environment:
                     batch=batch
                 ))
         
-        for (x, y), grass_amount in self.grass.items():
+        for x, y in zip(*np.nonzero(self.grass)):
+            grass_amount = self.grass[x, y]
             if grass_amount > 0:
-                alpha = int((grass_amount / 100) * 80)  # Very transparent
+                alpha = int((grass_amount / MAX_GRASS) * 80)  # Very transparent
                 shapes.append(pyglet.shapes.Rectangle(
                     x * GRID_SIZE, y * GRID_SIZE,
                     GRID_SIZE, GRID_SIZE,
@@ -275,16 +274,15 @@ class Environment:
 
         # Layer 2: Draw colony areas
         areas = [
-            ("food", FOOD_STORAGE_RADIUS * self.food_area_scale, (150, 80, 50), "Cemetery", 
-             [(200, 120, 70), (130, 60, 30)]),
-            ("nursery", NURSERY_RADIUS * self.nursery_area_scale, (70, 150, 70), "Nest",
-             [(90, 170, 90), (50, 130, 50)]),
-            ("sleeping", SLEEPING_RADIUS * self.sleeping_area_scale, (70, 70, 150), "Burrow",
-             [(90, 90, 170), (50, 50, 130)])
+            ("food", (150, 80, 50), "Cemetery", [(200, 120, 70), (130, 60, 30)]),
+            ("nursery", (70, 150, 70), "Nest", [(90, 170, 90), (50, 130, 50)]),
+            ("sleeping", (70, 70, 150), "Burrow", [(90, 90, 170), (50, 50, 130)])
         ]
 
-        for area_type, radius, base_color, label, gradient_colors in areas:
-            center = self.get_area_center(area_type)
+        for area_type, base_color, label, gradient_colors in areas:
+            # Zones are laid out in tiles, drawn in pixels
+            radius = self.get_area_radius(area_type) * GRID_SIZE
+            center = tuple(coordinate * GRID_SIZE for coordinate in self.get_area_center(area_type))
             
             # Draw multiple concentric circles with gradient effect
             num_rings = 5
@@ -311,8 +309,8 @@ class Environment:
             if area_type == "food":
                 # Food area: scattered dots pattern
                 for _ in range(20):
-                    angle = random.random() * 2 * math.pi
-                    dist = random.random() * radius * 0.9
+                    angle = self.rng.rendering.random() * 2 * math.pi
+                    dist = self.rng.rendering.random() * radius * 0.9
                     dot_x = center[0] + math.cos(angle) * dist
                     dot_y = center[1] + math.sin(angle) * dist
                     shapes.append(pyglet.shapes.Circle(
@@ -501,7 +499,7 @@ class Environment:
         
         if food_sources:
             # Sort by adjusted distance and add small random factor to prevent perfect alignment
-            food_sources.sort(key=lambda x: x[2] + random.uniform(0, 0.5))
+            food_sources.sort(key=lambda x: x[2] + self.rng.behaviour.uniform(0, 0.5))
             return (food_sources[0][0], food_sources[0][1])
         
         return None
@@ -517,44 +515,44 @@ class Environment:
               if isinstance(entity, Creature) and not entity.dead)
 
     def get_area_center(self, area_type):
-        """Get the center coordinates for different colony areas with fixed positions"""
-        if area_type == "food":
-            # Food storage in bottom-left quadrant
-            return (NEST_CENTER_X - QUADRANT_OFFSET, NEST_CENTER_Y - QUADRANT_OFFSET)
-        elif area_type == "nursery":
-            # Nursery in top-right quadrant
-            return (NEST_CENTER_X + QUADRANT_OFFSET, NEST_CENTER_Y + QUADRANT_OFFSET)
-        elif area_type == "sleeping":
-            # Sleeping area in bottom-right quadrant
-            return (NEST_CENTER_X + QUADRANT_OFFSET, NEST_CENTER_Y - QUADRANT_OFFSET)
-        return (NEST_CENTER_X, NEST_CENTER_Y)
+        """Get the center of a colony area in grid units (the nest for unknown areas)"""
+        zone = self.world.zones.get(area_type)
+        if zone is None:
+            return self.world.nest
+        return zone[:2]
 
     def is_in_area(self, x, y, area_type):
         """Check if position is within a specific colony area"""
-        # Convert grid coordinates to pixel coordinates for center calculation
-        px = x * GRID_SIZE + GRID_SIZE // 2
-        py = y * GRID_SIZE + GRID_SIZE // 2
-        
+        # Measure from the middle of the tile
         center = self.get_area_center(area_type)
-        # Correct the distance calculation
-        distance = ((px - center[0])**2 + (py - center[1])**2) ** 0.5
+        distance = ((x + 0.5 - center[0])**2 + (y + 0.5 - center[1])**2) ** 0.5
         
+        return distance <= self.get_area_radius(area_type)
+
+    def get_area_radius(self, area_type):
+        """Get the current radius of a colony area in grid units (-1 for unknown areas)"""
         # Scale only affects the radius, not the center position
-        if area_type == "food":
-            return distance <= FOOD_STORAGE_RADIUS * self.food_area_scale
-        elif area_type == "nursery":
-            return distance <= NURSERY_RADIUS * self.nursery_area_scale
-        elif area_type == "sleeping":
-            return distance <= SLEEPING_RADIUS * self.sleeping_area_scale
-        return False
+        scales = {"food": self.food_area_scale, "nursery": self.nursery_area_scale,
+                  "sleeping": self.sleeping_area_scale}
+        if area_type not in scales:
+            return -1
+        return self.world.zones[area_type][2] * scales[area_type]
+
+    def area_mask(self, area_type):
+        """Return a (width, height) boolean array of the tiles inside a colony area"""
+        center = self.get_area_center(area_type)
+        dx = np.arange(self.width)[:, np.newaxis] + 0.5 - center[0]
+        dy = np.arange(self.height)[np.newaxis, :] + 0.5 - center[1]
+        distance = np.sqrt(dx ** 2 + dy ** 2)
+        return distance <= self.get_area_radius(area_type)
 
     def find_nursery_spot(self):
         """Find an open spot in the nursery area"""
         center = self.get_area_center("nursery")
-        center_x = int(center[0] / GRID_SIZE)
-        center_y = int(center[1] / GRID_SIZE)
+        center_x = int(center[0])
+        center_y = int(center[1])
         
-        for radius in range(1, int(NURSERY_RADIUS / GRID_SIZE)):
+        for radius in range(1, int(self.world.zones["nursery"][2])):
             for dx in range(-radius, radius + 1):
                 for dy in range(-radius, radius + 1):
                     x = center_x + dx
@@ -572,19 +570,43 @@ class Environment:
         if (new_x, new_y) in self.grid:
             return False
         
+        self.relocate(entity, new_x, new_y)
+        return True
+
+    def relocate(self, entity, new_x, new_y):
+        """Move an entity on the grid and keep zone counters in sync"""
         # Remove from old position
         self.grid.pop((entity.x, entity.y), None)
-        
+
+        # Living creatures change the per-zone counts when crossing zone borders
+        if isinstance(entity, Creature) and not entity.dead:
+            old_zones = self.zones_at(entity.x, entity.y)
+            new_zones = self.zones_at(new_x, new_y)
+            if old_zones != new_zones:
+                self.population.leave_zones(old_zones)
+                self.population.enter_zones(new_zones)
+
         # Update position
         entity.x = new_x
         entity.y = new_y
-        
+
         # Add to new position
         self.grid[(new_x, new_y)] = entity
-        return True
+
+    def zones_at(self, x, y):
+        """Return the colony zones covering a position"""
+        zones = self.zone_cache.get((x, y))
+        if zones is None:
+            zones = tuple(zone for zone in ZONES if self.is_in_area(x, y, zone))
+            self.zone_cache[(x, y)] = zones
+        return zones
 
     def try_move_towards(self, entity, target_x, target_y):
-        """Try to move an entity towards a target position"""
+        """Try to move an entity towards a target position
+
+        In two-phase movement the move is only queued while creatures update,
+        and False is returned until movement.resolve settles it.
+        """
         if entity.dead:
             return False
 
@@ -633,74 +655,75 @@ class Environment:
             (-1, -1), (-1, 1), (1, -1), (1, 1)  # Diagonal directions
         ])
 
-        # If carrying a dead creature, handle special movement
+        # A carrier drags the dead creature along and has to stay next to it
+        carried = None
         if entity.carrying_food and isinstance(entity.target, Creature):
-            dead_creature = entity.target
-            
-            # Check if we're adjacent to the dead creature
-            if abs(entity.x - dead_creature.x) + abs(entity.y - dead_creature.y) > 1:
+            carried = entity.target
+            if abs(entity.x - carried.x) + abs(entity.y - carried.y) > 1:
                 # Lost contact with dead creature, drop it
                 entity.carrying_food = False
                 entity.target = None
                 return False
 
-            # Try each possible move
-            for move_x, move_y in possible_moves:
-                new_carrier_x = entity.x + move_x
-                new_carrier_y = entity.y + move_y
-                
-                if not (self.is_valid_position(new_carrier_x, new_carrier_y) and
-                       not self.is_position_occupied(new_carrier_x, new_carrier_y)):
-                    continue
-                
-                # Find best position for dead creature
-                best_dead_pos = None
-                min_distance = float('inf')
-                
-                # Check all adjacent positions for the dead creature
-                for dead_dx, dead_dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    new_dead_x = new_carrier_x + dead_dx
-                    new_dead_y = new_carrier_y + dead_dy
-                    
-                    if (self.is_valid_position(new_dead_x, new_dead_y) and
-                        not self.is_position_occupied(new_dead_x, new_dead_y)):
-                        # Calculate distance to target considering both positions
-                        dist = (abs(new_dead_x - target_x) + abs(new_dead_y - target_y) +
-                               abs(new_carrier_x - target_x) + abs(new_carrier_y - target_y))
-                        if dist < min_distance:
-                            min_distance = dist
-                            best_dead_pos = (new_dead_x, new_dead_y)
-                
-                # If we found valid positions for both, move them
-                if best_dead_pos is not None:
-                    # Remove both entities from their current positions
-                    self.grid.pop((entity.x, entity.y), None)
-                    self.grid.pop((dead_creature.x, dead_creature.y), None)
-                    
-                    # Update positions
-                    entity.x = new_carrier_x
-                    entity.y = new_carrier_y
-                    dead_creature.x = best_dead_pos[0]
-                    dead_creature.y = best_dead_pos[1]
-                    
-                    # Add both entities back to grid at their new positions
-                    self.grid[(entity.x, entity.y)] = entity
-                    self.grid[(dead_creature.x, dead_creature.y)] = dead_creature
-                    
-                    return True
-            
+        return self.submit_move(movement.MoveIntent(entity, possible_moves, carried, (target_x, target_y)))
+
+    def submit_move(self, intent):
+        """Make a move now, or queue it while two-phase movement collects this tick's moves
+
+        Returns whether the entity moved; a queued move returns False and
+        movement.resolve reports its outcome through after_move.
+        """
+        if self.intents is not None:
+            self.intents.append(intent)
             return False
+        return self.apply_move(intent, self.is_position_occupied)
+
+    def apply_move(self, intent, blocked):
+        """Make the first open move of an intent, returning whether the entity moved
+
+        blocked(x, y) tells whether a tile may not be entered.
+        """
+        entity = intent.entity
+        target_x, target_y = intent.target
+        dead_creature = intent.carried
 
-        # Normal movement for non-carrying entities
         # Try each possible move in order of priority
-        for move_x, move_y in possible_moves:
+        for move_x, move_y in intent.moves:
             new_x = entity.x + move_x
             new_y = entity.y + move_y
-            
-            if (self.is_valid_position(new_x, new_y) and
-                not self.is_position_occupied(new_x, new_y)):
-                return self.move_entity(entity, new_x, new_y)
-        
+
+            if not self.is_valid_position(new_x, new_y) or blocked(new_x, new_y):
+                continue
+
+            if dead_creature is None:
+                self.relocate(entity, new_x, new_y)
+                return True
+
+            # Find best position for dead creature
+            best_dead_pos = None
+            min_distance = float('inf')
+
+            # Check all adjacent positions for the dead creature
+            for dead_dx, dead_dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                new_dead_x = new_x + dead_dx
+                new_dead_y = new_y + dead_dy
+
+                if (self.is_valid_position(new_dead_x, new_dead_y) and
+                    not blocked(new_dead_x, new_dead_y)):
+                    # Calculate distance to target considering both positions
+                    dist = (abs(new_dead_x - target_x) + abs(new_dead_y - target_y) +
+                           abs(new_x - target_x) + abs(new_y - target_y))
+                    if dist < min_distance:
+                        min_distance = dist
+                        best_dead_pos = (new_dead_x, new_dead_y)
+
+            # If we found valid positions for both, move them
+            if best_dead_pos is not None:
+                # Both target tiles are free, so moving one after the other is safe
+                self.relocate(entity, new_x, new_y)
+                self.relocate(dead_creature, best_dead_pos[0], best_dead_pos[1])
+                return True
+
         return False
 
     def is_valid_position(self, x, y):
@@ -734,23 +757,65 @@ class Environment:
 
     def update_area_scales(self):
         """Update the scales of the areas based on specific needs"""
-        num_creatures = len(self.creatures)
+        num_creatures = self.population.total
         if num_creatures == 0:
             return
         
-        self.sleeping_area_scale = min(MAX_AREA_SCALE, 1.0 + AREA_SCALE_FACTOR)
-        self.food_area_scale = min(MAX_AREA_SCALE, 1.0 + (sum(c.dead for c in self.creatures) / num_creatures) * AREA_SCALE_FACTOR)
-        self.nursery_area_scale = min(MAX_AREA_SCALE, 1.0 + (len(self.eggs) / num_creatures) * AREA_SCALE_FACTOR)
+        scales = (self.sleeping_area_scale, self.food_area_scale, self.nursery_area_scale)
+        max_scale = self.config.MAX_AREA_SCALE
+        factor = self.config.AREA_SCALE_FACTOR
+        self.sleeping_area_scale = min(max_scale, 1.0 + factor)
+        self.food_area_scale = min(max_scale, 1.0 + (self.population.dead / num_creatures) * factor)
+        self.nursery_area_scale = min(max_scale, 1.0 + (self.population.eggs / num_creatures) * factor)
+
+        # Zone borders moved, so the per-zone counts need a one-off recount
+        if scales != (self.sleeping_area_scale, self.food_area_scale, self.nursery_area_scale):
+            self.zone_cache.clear()
+            self.population.zones = {zone: 0 for zone in ZONES}
+            for creature in self.creatures:
+                if not creature.dead:
+                    self.population.enter_zones(self.zones_at(creature.x, creature.y))
+
+    def recount_population(self):
+        """Rebuild the population counters from the entity tables"""
+        population = PopulationCounters()
+        for creature in self.creatures:
+            if creature.dead:
+                population.dead += 1
+            else:
+                population.creature_born(self.zones_at(creature.x, creature.y))
+                population.sleepers += creature.sleeping
+                population.carriers += creature.carrying_food
+        population.eggs = len(self.eggs)
+        self.population = population
 
     def add_fertility(self, x, y, amount):
         """Add fertility to a position"""
-        if (x, y) not in self.fertility:
-            self.fertility[(x, y)] = 0
-        self.fertility[(x, y)] = min(MAX_FERTILITY, self.fertility[(x, y)] + amount)
+        self.fertility[x, y] = min(MAX_FERTILITY, self.fertility[x, y] + amount)
+
+    def add_creature(self, creature):
+        """Place a newborn creature in the world"""
+        self.creatures.add(creature)
+        self.grid[(creature.x, creature.y)] = creature
+        self.population.creature_born(self.zones_at(creature.x, creature.y))
+        self.events.emit(BIRTH, creature)
+
+    def add_egg(self, egg):
+        """Place a newly laid egg and schedule its hatching"""
+        self.eggs.add(egg)
+        self.grid[(egg.x, egg.y)] = egg
+        self.population.eggs += 1
+        self.scheduler.schedule(egg.hatch_time, egg.hatch)
+        self.events.emit(EGG_LAID, egg)
 
     def hatch_egg(self, egg):
         """Handle egg hatching and create a new creature"""
+        # Remove the hatched egg before the creature takes its tile
+        self.eggs.remove(egg)
+        self.grid.pop((egg.x, egg.y), None)
+        self.population.eggs -= 1
+
         # Create a new creature at the egg's position
-        new_creature = Creature(egg.x, egg.y, self)
-        self.creatures.append(new_creature)
-        self.grid[(egg.x, egg.y)] = new_creature
\ No newline at end of file
+        new_creature = Creature(egg.x, egg.y, self, parent_id=egg.parent_id)
+        self.add_creature(new_creature)
+        self.events.emit(HATCH, egg, new_creature)
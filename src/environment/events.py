@@ -0,0 +1,28 @@
+from collections import defaultdict
+
+# Event types published by the environment
+BIRTH = "birth"        # (creature)
+DEATH = "death"        # (creature)
+EGG_LAID = "egg_laid"  # (egg)
+HATCH = "hatch"        # (egg, creature)
+EAT = "eat"            # (eater, food_source, amount)
+REMOVAL = "removal"    # (creature) fully consumed or decomposed corpse left the world
+
+# Lightweight publish/subscribe hub so consumers react instead of polling
+class EventBus:
+    def __init__(self):
+        self.handlers = defaultdict(list)
+
+    def subscribe(self, event_type, handler):
+        """Call handler whenever event_type is emitted"""
+        self.handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type, handler):
+        """Stop calling a previously subscribed handler"""
+        if handler in self.handlers[event_type]:
+            self.handlers[event_type].remove(handler)
+
+    def emit(self, event_type, *args):
+        """Notify every subscriber of an event"""
+        for handler in self.handlers.get(event_type, ()):
+            handler(*args)
@@ -0,0 +1,321 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from utils.constants import *
+from environment import kernels
+
+try:
+    from scipy import signal
+except ImportError:  # The convolution backend falls back to NumPy's FFT
+    signal = None
+
+# Grass and fertility are dense float arrays indexed [x, y]. The kernels below
+# accept any number of leading batch dimensions, so one call can advance a
+# single world (width, height) or a stack of worlds (worlds, width, height).
+
+CARDINAL_OFFSETS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+def diamond_offsets(radius):
+    """Return every (dx, dy) within Manhattan distance radius, centre included"""
+    return [(dx, dy)
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+            if abs(dx) + abs(dy) <= radius]
+
+
+def shifted_add(out, source, dx, dy):
+    """Add source moved by (dx, dy) into out, dropping whatever leaves the grid"""
+    width, height = source.shape[-2:]
+    if abs(dx) >= width or abs(dy) >= height:
+        return  # Moved off the grid entirely
+    out[..., max(dx, 0):width + min(dx, 0), max(dy, 0):height + min(dy, 0)] += \
+        source[..., max(-dx, 0):width - max(dx, 0), max(-dy, 0):height - max(dy, 0)]
+
+
+def source_mask(shape, positions):
+    """Return a boolean mask with the given (x, y) positions set"""
+    mask = np.zeros(shape, dtype=bool)
+    if positions:
+        xs, ys = zip(*positions)
+        mask[xs, ys] = True
+    return mask
+
+
+def diamond_kernel(radius):
+    """Return the (2 * radius + 1) square 0/1 kernel of a Manhattan diamond"""
+    offsets = np.abs(np.arange(-radius, radius + 1))
+    return (offsets[:, np.newaxis] + offsets[np.newaxis, :] <= radius).astype(np.float64)
+
+
+@lru_cache(maxsize=8)
+def _kernel_spectrum(radius, shape):
+    return np.fft.rfft2(diamond_kernel(radius), shape)
+
+
+def convolve_diamond(stack, radius):
+    """Sum every tile's diamond of the given radius, over the last two axes of stack
+
+    Works through the FFT, so the cost does not grow with the radius.
+    Tiles beyond the grid count as zero. The result carries rounding noise of
+    about 1e-16 times the largest value.
+    """
+    width, height = stack.shape[-2:]
+    if signal is not None:
+        kernel = diamond_kernel(radius).reshape((1,) * (stack.ndim - 2) + (2 * radius + 1,) * 2)
+        return signal.fftconvolve(stack, kernel, mode="same", axes=(-2, -1))
+    # Pad to the full convolution so nothing wraps around, then cut out the centre
+    shape = (width + 2 * radius, height + 2 * radius)
+    full = np.fft.irfft2(np.fft.rfft2(stack, shape) * _kernel_spectrum(radius, shape), shape)
+    return full[..., radius:radius + width, radius:radius + height]
+
+
+def update_fields(grass, fertility, sources, spread, config):
+    """Advance grass and fertility by one tick, in place
+
+    sources marks the tiles with decomposing creatures, spread says (per world)
+    whether grass spreads to its neighbours this tick, or is a slice of the x
+    columns that spread in every world (see rolling_columns). Increments are
+    all positive, so clamping once after summing them matches clamping each one.
+    """
+    # Fertility flows out of every fertile decomposition site over a diamond,
+    # and every tile the diamond covers grows grass once per site covering it
+    emitted = np.where(sources, fertility * config.FERTILITY_SPREAD_RATE, 0.0)
+    covering = sources.astype(np.float64)
+    received = np.zeros_like(fertility)
+    visits = np.zeros_like(grass)
+    for dx, dy in diamond_offsets(FERTILITY_SPREAD_RADIUS):
+        shifted_add(received, emitted, dx, dy)
+        shifted_add(visits, covering, dx, dy)
+    _grow(grass, fertility, received, visits, spread, config)
+
+
+def update_fields_convolved(grass, fertility, sources, spread, config):
+    """update_fields with the decomposition diamond applied as one convolution
+
+    Fertility received, sites covering each tile and fertile sites covering it
+    are stacked and convolved with the diamond kernel together. Counts are
+    rounded, and tiles no fertile site reaches receive exactly nothing, so the
+    FFT noise never turns an empty tile fertile.
+    """
+    emitted = np.where(sources, fertility * config.FERTILITY_SPREAD_RATE, 0.0)
+    stack = np.stack((emitted, sources, emitted > 0)).astype(np.float64)
+    received, visits, feeding = convolve_diamond(stack, FERTILITY_SPREAD_RADIUS)
+    received = np.where(np.rint(feeding) > 0, np.maximum(received, 0.0), 0.0)
+    _grow(grass, fertility, received, np.rint(visits), spread, config)
+
+
+def _grow(grass, fertility, received, visits, spread, config):
+    """Apply one tick's fertility and grass growth given the decomposition sums"""
+    old_grass = grass.copy()  # Spreading reads the grass from before this tick
+    np.minimum(fertility + received, MAX_FERTILITY, out=fertility)
+    fertile = fertility > 0
+
+    # Faster growth on fertility, slower without fertilizer
+    growth_rate = np.where(fertile, 0.5, 0.1) * config.GRASS_GROWTH_RATE
+    np.minimum(grass + visits * growth_rate, MAX_GRASS, out=grass)
+
+    # Lush tiles push 1% of their grass into each neighbour, 50% more on fertility
+    if isinstance(spread, slice):
+        _spread_columns(grass, old_grass, fertile, spread)
+    else:
+        spread = np.asarray(spread)[..., np.newaxis, np.newaxis]
+        donors = np.where(spread & (old_grass > 50), old_grass * 0.01, 0.0)
+        if donors.any():
+            inflow = np.zeros_like(grass)
+            for dx, dy in CARDINAL_OFFSETS:
+                shifted_add(inflow, donors, dx, dy)
+            inflow[fertile] *= 1.5
+            np.minimum(grass + inflow, MAX_GRASS, out=grass)
+
+    # Very slow growth everywhere grass is already present
+    growing = grass > 0
+    grass[growing] = np.minimum(grass[growing] + config.GRASS_GROWTH_RATE * 0.05, MAX_GRASS)
+
+
+def _spread_columns(grass, old_grass, fertile, columns):
+    """Spread grass from the x columns selected by a slice stepping at least 3
+
+    Only the donor columns and their two neighbours are touched, so the cost
+    is a fraction of a whole-grid spread.
+    """
+    width = grass.shape[-2]
+    xs = np.arange(width)[columns]
+    lush = old_grass[..., xs, :]
+    donors = np.where(lush > 50, lush * 0.01, 0.0)
+    if not donors.any():
+        return
+
+    # Up and down stay inside the donor columns, left and right land in the next ones
+    inflow = np.zeros_like(donors)
+    inflow[..., 1:] += donors[..., :-1]
+    inflow[..., :-1] += donors[..., 1:]
+    targets = [(xs, inflow)]
+    for dx in (-1, 1):
+        inside = (xs + dx >= 0) & (xs + dx < width)
+        targets.append((xs[inside] + dx, donors[..., inside, :]))
+    for x, amount in targets:
+        amount = np.where(fertile[..., x, :], amount * 1.5, amount)
+        grass[..., x, :] = np.minimum(grass[..., x, :] + amount, MAX_GRASS)
+
+
+def rolling_columns(tick, period=GRASS_SPREAD_PERIOD):
+    """Return the spread argument that lets every period-th column spread, moving on each tick"""
+    return slice(tick % period, None, period)
+
+
+def offset_spread(spread, offset):
+    """Return spread for a part of the grid whose first column is column offset"""
+    if isinstance(spread, slice):
+        return slice((spread.start - offset) % spread.step, None, spread.step)
+    return spread
+
+
+# Rows of neighbours a stripe needs to update its own rows exactly: the
+# fertility diamond reaches FERTILITY_SPREAD_RADIUS, grass spreading one tile
+STRIPE_HALO = max(FERTILITY_SPREAD_RADIUS, 1)
+
+FIELD_WORKERS = FIELD_THREADS or os.cpu_count() or 1
+_pool = None  # Shared by every world, created on first use
+
+
+def _thread_pool():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=FIELD_WORKERS, thread_name_prefix="fields")
+    return _pool
+
+
+def update_fields_striped(grass, fertility, sources, spread, config, stripes=None):
+    """update_fields split into stripes of x that a thread pool advances in parallel
+
+    Every stripe runs update_fields on a copy of its rows plus STRIPE_HALO rows
+    on either side, and only its own rows are written back once all stripes
+    are done, so the result matches the serial kernel exactly. The NumPy
+    kernels release the GIL, which is what lets the stripes overlap.
+    """
+    pool = _thread_pool()
+    width = grass.shape[-2]
+    stripes = stripes or FIELD_WORKERS
+    stripes = max(1, min(stripes, width // FIELD_STRIPE_MIN_ROWS))
+    if stripes == 1:
+        update_fields(grass, fertility, sources, spread, config)
+        return
+
+    bounds = np.linspace(0, width, stripes + 1).astype(int)
+
+    def advance(start, stop):
+        low, high = max(start - STRIPE_HALO, 0), min(stop + STRIPE_HALO, width)
+        stripe_grass = grass[..., low:high, :].copy()
+        stripe_fertility = fertility[..., low:high, :].copy()
+        update_fields(stripe_grass, stripe_fertility, sources[..., low:high, :],
+                      offset_spread(spread, low), config)
+        return (stripe_grass[..., start - low:stop - low, :],
+                stripe_fertility[..., start - low:stop - low, :])
+
+    # Every stripe reads its halo from the old fields, so nothing is written back until all are done
+    futures = [pool.submit(advance, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+    results = [future.result() for future in futures]
+    for start, stop, (stripe_grass, stripe_fertility) in zip(bounds[:-1], bounds[1:], results):
+        grass[..., start:stop, :] = stripe_grass
+        fertility[..., start:stop, :] = stripe_fertility
+
+
+def update_fields_reference(grass, fertility, positions, spread, config):
+    """Advance one world's fields by one tick with the original per-tile loops
+
+    Slow, but a literal transcription of the dict-based update: sites are
+    visited in decomposition order and every increment is clamped on its own.
+    Kept to check the vectorized backends against.
+    """
+    width, height = grass.shape
+    old_fertility = fertility.tolist()
+    old_grass = grass.tolist()
+    new_fertility = fertility.tolist()
+    new_grass = grass.tolist()
+    rate = config.GRASS_GROWTH_RATE
+
+    for px, py in positions:
+        for dx, dy in diamond_offsets(FERTILITY_SPREAD_RADIUS):
+            x, y = px + dx, py + dy
+            if not (0 <= x < width and 0 <= y < height):
+                continue
+            amount = old_fertility[px][py]
+            if amount > 0:
+                new_fertility[x][y] = min(MAX_FERTILITY,
+                                          new_fertility[x][y] + amount * config.FERTILITY_SPREAD_RATE)
+            if new_fertility[x][y] > 0:
+                new_grass[x][y] = min(MAX_GRASS, new_grass[x][y] + rate * 0.5)
+            else:
+                new_grass[x][y] = min(MAX_GRASS, new_grass[x][y] + rate * 0.1)
+
+    if isinstance(spread, slice):
+        donor_columns = range(width)[spread]
+    else:
+        donor_columns = range(width) if spread else ()
+    for x in donor_columns:
+        for y in range(height):
+            grass_amount = old_grass[x][y]
+            if grass_amount > 50:
+                for dx, dy in CARDINAL_OFFSETS:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height:
+                        spread_amount = grass_amount * 0.01
+                        if new_fertility[nx][ny] > 0:
+                            spread_amount *= 1.5
+                        new_grass[nx][ny] = min(MAX_GRASS, new_grass[nx][ny] + spread_amount)
+
+    for x in range(width):
+        for y in range(height):
+            if new_grass[x][y] > 0:
+                new_grass[x][y] = min(MAX_GRASS, new_grass[x][y] + rate * 0.05)
+
+    fertility[...] = new_fertility
+    grass[...] = new_grass
+
+
+def _numpy_backend(grass, fertility, positions, spread, config):
+    update_fields(grass, fertility, source_mask(grass.shape, positions), spread, config)
+
+
+def _convolution_backend(grass, fertility, positions, spread, config):
+    update_fields_convolved(grass, fertility, source_mask(grass.shape, positions), spread, config)
+
+
+DIAMOND = np.array(diamond_offsets(FERTILITY_SPREAD_RADIUS), dtype=np.intp).reshape(-1, 2)
+
+
+def _numba_backend(grass, fertility, positions, spread, config):
+    if not kernels.AVAILABLE:  # Interpreted loops would be hopelessly slow, NumPy is the fallback
+        _numpy_backend(grass, fertility, positions, spread, config)
+        return
+    columns = np.zeros(grass.shape[0], dtype=bool)
+    if isinstance(spread, slice):
+        columns[spread] = True
+    elif spread:
+        columns[:] = True
+    xs, ys = np.array(positions, dtype=np.intp).reshape(-1, 2).T
+    kernels.grow_fields(grass, fertility, xs, ys, DIAMOND, columns, not isinstance(spread, slice),
+                        config.GRASS_GROWTH_RATE, config.FERTILITY_SPREAD_RATE)
+
+
+def _chunked_backend(grass, fertility, positions, spread, config):
+    grass.store.update(positions, spread, config)  # Both layers share one environment.chunks store
+
+
+def _threaded_backend(grass, fertility, positions, spread, config):
+    update_fields_striped(grass, fertility, source_mask(grass.shape, positions), spread, config)
+
+
+# Field backends selectable per environment, all with the same signature
+BACKENDS = {
+    "numpy": _numpy_backend,
+    "convolution": _convolution_backend,
+    "threaded": _threaded_backend,
+    "numba": _numba_backend,
+    "chunked": _chunked_backend,
+    "reference": update_fields_reference,
+}
@@ -0,0 +1,147 @@
+import numpy as np
+
+from utils.constants import *
+from entities.creature import Creature
+from utils.rng import RandomStream
+
+# Consistency checks over the bookkeeping the environment keeps in step by
+# hand: the occupancy grid, the creature and egg tables, carriers and the
+# corpses they drag, and the decomposition tracking dicts. "full" checks
+# everything; "sampled" checks the counts plus a few random entities and
+# tracking entries per tick, cheap enough to leave on in long runs.
+OFF = "off"
+SAMPLED = "sampled"
+FULL = "full"
+MODES = (OFF, SAMPLED, FULL)
+
+
+class InvariantError(RuntimeError):
+    """Raised when the environment's bookkeeping disagrees with itself"""
+
+
+def _check_entity(env, entity, table, problems):
+    """An entity is in its table and holds the grid tile it stands on"""
+    if entity not in table:
+        problems.append(f"{type(entity).__name__} {entity.id} is not in its table")
+    if not env.is_valid_position(entity.x, entity.y):
+        problems.append(f"{type(entity).__name__} {entity.id} is outside the world at {(entity.x, entity.y)}")
+    occupant = env.grid.get((entity.x, entity.y))
+    if occupant is not entity:
+        held = "nothing" if occupant is None else f"{type(occupant).__name__} {occupant.id}"
+        problems.append(f"{type(entity).__name__} {entity.id} stands on {(entity.x, entity.y)}, "
+                        f"which holds {held}")
+
+
+def _check_carrier(env, creature, problems):
+    """A living carrier stays next to the corpse it drags"""
+    corpse = creature.target
+    if creature.dead or not creature.carrying_food or not isinstance(corpse, Creature):
+        return
+    if corpse not in env.creatures:
+        return  # Eaten up this tick, the carrier lets go when it next acts
+    if not corpse.dead:
+        problems.append(f"Creature {creature.id} carries living creature {corpse.id}")
+    elif abs(creature.x - corpse.x) + abs(creature.y - corpse.y) > 1:
+        problems.append(f"Creature {creature.id} at {(creature.x, creature.y)} carries "
+                        f"corpse {corpse.id} at {(corpse.x, corpse.y)}")
+
+
+def _check_tracked(env, creature_id, problems):
+    """A tracked corpse is still in the world and tracked in both dicts"""
+    creature = env.creatures.get(creature_id)
+    if creature is None:
+        problems.append(f"Stale decomposition tracking for removed creature {creature_id}")
+    elif not creature.dead:
+        problems.append(f"Decomposition tracking for living creature {creature_id}")
+    if (creature_id in env.initial_death_positions) != (creature_id in env.last_positions):
+        problems.append(f"Creature {creature_id} is tracked in only one of initial and last positions")
+
+
+def _check_counts(env, problems):
+    """Constant-time checks: one tile per entity, tracking dicts the same size"""
+    entities = len(env.creatures) + len(env.eggs)
+    if len(env.grid) != entities:
+        problems.append(f"The grid holds {len(env.grid)} entities, the tables {entities}")
+    if len(env.initial_death_positions) != len(env.last_positions):
+        problems.append(f"{len(env.initial_death_positions)} initial death positions for "
+                        f"{len(env.last_positions)} last positions")
+
+
+def _sample(rng, length, count):
+    """Return up to count distinct random indices below length, all of them if there are only that many"""
+    if length <= count:
+        return range(length)
+    return sorted({rng.randint(0, length - 1) for _ in range(count)})
+
+
+def check_full(env):
+    """Return a description of every inconsistency in the environment's bookkeeping"""
+    problems = []
+    _check_counts(env, problems)
+    for (x, y), entity in env.grid.items():
+        if (entity.x, entity.y) != (x, y):
+            problems.append(f"Tile {(x, y)} holds {type(entity).__name__} {entity.id}, "
+                            f"which stands on {(entity.x, entity.y)}")
+    for creature in env.creatures:
+        _check_entity(env, creature, env.creatures, problems)
+        _check_carrier(env, creature, problems)
+    for egg in env.eggs:
+        _check_entity(env, egg, env.eggs, problems)
+    for creature_id in env.initial_death_positions.keys() | env.last_positions.keys():
+        _check_tracked(env, creature_id, problems)
+
+    # Every decomposition site belongs to a tracked corpse. A corpse can end
+    # up without a site of its own, so only stale sites are checked for.
+    sites = set(env.last_positions.values())
+    for position in env.decomposing_positions:
+        if position not in sites:
+            problems.append(f"Stale decomposition site {position}")
+    return problems
+
+
+def check_sampled(env, count, rng):
+    """check_full over up to count random creatures, eggs and tracked corpses, plus the counts"""
+    problems = []
+    _check_counts(env, problems)
+    for table in (env.creatures, env.eggs):
+        items = table.items
+        for index in _sample(rng, len(items), count):
+            entity = items[index]
+            _check_entity(env, entity, table, problems)
+            if table is env.creatures:
+                _check_carrier(env, entity, problems)
+    if env.last_positions:
+        tracked = list(env.last_positions)
+        sites = set(env.last_positions.values())
+        for index in _sample(rng, len(tracked), count):
+            _check_tracked(env, tracked[index], problems)
+        positions = list(env.decomposing_positions)
+        for index in _sample(rng, len(positions), count):
+            if positions[index] not in sites:
+                problems.append(f"Stale decomposition site {positions[index]}")
+    elif env.decomposing_positions:
+        problems.append(f"{len(env.decomposing_positions)} decomposition sites without tracked corpses")
+    return problems
+
+
+# Runs the checks of one mode and raises on the first inconsistent tick. The
+# sampled mode draws from its own generator, so turning checks on never
+# changes how a seeded world plays out.
+class InvariantChecker:
+    def __init__(self, mode=INVARIANT_CHECKS, sample=INVARIANT_SAMPLE, seed=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown invariant mode {mode!r}, expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.sample = sample
+        self.rng = RandomStream(np.random.SeedSequence(seed))
+
+    def check(self, env):
+        """Check env in this checker's mode, raising InvariantError if anything is off"""
+        if self.mode == OFF:
+            return
+        if self.mode == FULL:
+            problems = check_full(env)
+        else:
+            problems = check_sampled(env, self.sample, self.rng)
+        if problems:
+            raise InvariantError(f"Tick {env.tick}: " + "; ".join(problems))
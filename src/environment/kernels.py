@@ -0,0 +1,95 @@
+import numpy as np
+
+from utils.constants import *
+
+try:
+    import numba
+except ImportError:  # The "numba" field backend falls back to the NumPy kernels
+    numba = None
+
+# Per-tile loop kernels compiled with Numba when it is installed. Without it
+# they still run as plain Python: far too slow for a real world, but enough
+# to check them against the NumPy kernels on small grids.
+AVAILABLE = numba is not None
+
+
+def jit(function):
+    """Compile function with Numba if it is installed, else return it unchanged"""
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True)(function)
+
+
+@jit
+def grow_fields(grass, fertility, xs, ys, offsets, columns, burst, rate, spread_rate):
+    """Advance one world's (width, height) fields by one tick, in place
+
+    xs and ys are the decomposition sites and offsets the (n, 2) diamond they
+    reach, in fields.diamond_offsets order. columns marks the x columns whose
+    grass spreads this tick, all at once when burst is set or as the slice of
+    a rolling spread otherwise. Every sum is taken in the same order as
+    fields.update_fields, so the result matches it bit for bit.
+    """
+    width, height = grass.shape
+    old_grass = grass.copy()  # Spreading reads the grass from before this tick
+    emitted = np.empty(len(xs))
+    for i in range(len(xs)):
+        emitted[i] = fertility[xs[i], ys[i]] * spread_rate
+
+    # One pass per diamond offset, so every tile adds up its sites in offset order
+    received = np.zeros((width, height))
+    visits = np.zeros((width, height))
+    for k in range(len(offsets)):
+        for i in range(len(xs)):
+            x, y = xs[i] + offsets[k, 0], ys[i] + offsets[k, 1]
+            if 0 <= x < width and 0 <= y < height:
+                received[x, y] += emitted[i]
+                visits[x, y] += 1.0
+
+    for x in range(width):
+        for y in range(height):
+            fertility[x, y] = min(fertility[x, y] + received[x, y], MAX_FERTILITY)
+            growth_rate = (0.5 if fertility[x, y] > 0 else 0.1) * rate
+            grass[x, y] = min(grass[x, y] + visits[x, y] * growth_rate, MAX_GRASS)
+
+    # Lush tiles push 1% of their grass into each neighbour, 50% more on fertility
+    donors = np.zeros((width, height))
+    for x in range(width):
+        if columns[x]:
+            for y in range(height):
+                if old_grass[x, y] > 50:
+                    donors[x, y] = old_grass[x, y] * 0.01
+    for x in range(width):
+        for y in range(height):
+            inflow = 0.0
+            if burst:
+                # Neighbours in fields.CARDINAL_OFFSETS order, as they are shifted in
+                if y > 0:
+                    inflow += donors[x, y - 1]
+                if x > 0:
+                    inflow += donors[x - 1, y]
+                if y < height - 1:
+                    inflow += donors[x, y + 1]
+                if x < width - 1:
+                    inflow += donors[x + 1, y]
+            elif columns[x]:
+                # Rolling columns are at least 3 apart, so a tile hears from one column only
+                if y > 0:
+                    inflow += donors[x, y - 1]
+                if y < height - 1:
+                    inflow += donors[x, y + 1]
+            elif x < width - 1 and columns[x + 1]:
+                inflow = donors[x + 1, y]
+            elif x > 0 and columns[x - 1]:
+                inflow = donors[x - 1, y]
+            if inflow > 0:
+                if fertility[x, y] > 0:
+                    inflow *= 1.5
+                grass[x, y] = min(grass[x, y] + inflow, MAX_GRASS)
+
+    # Very slow growth everywhere grass is already present
+    slow = rate * 0.05
+    for x in range(width):
+        for y in range(height):
+            if grass[x, y] > 0:
+                grass[x, y] = min(grass[x, y] + slow, MAX_GRASS)
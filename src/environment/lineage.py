@@ -0,0 +1,82 @@
+from array import array
+
+NO_PARENT = -1
+STILL_ALIVE = -1
+NOT_A_CREATURE = -1  # Birth tick of rows whose entity ID belongs to an egg
+
+# Compact family tree indexed by entity ID, one row per ID handed out so far
+class Lineage:
+    def __init__(self):
+        self.parents = array('q')       # Parent creature ID, NO_PARENT for founders
+        self.birth_ticks = array('q')
+        self.death_ticks = array('q')   # STILL_ALIVE until the creature dies
+
+    def __len__(self):
+        return len(self.parents)
+
+    def __contains__(self, creature_id):
+        return 0 <= creature_id < len(self.birth_ticks) and self.birth_ticks[creature_id] != NOT_A_CREATURE
+
+    def register(self, creature_id, parent_id, birth_tick):
+        """Record the birth of a creature"""
+        # Pad over IDs that went to eggs so rows stay indexable by ID
+        padding = creature_id + 1 - len(self.parents)
+        if padding > 0:
+            self.parents.extend([NO_PARENT] * padding)
+            self.birth_ticks.extend([NOT_A_CREATURE] * padding)
+            self.death_ticks.extend([STILL_ALIVE] * padding)
+        self.parents[creature_id] = NO_PARENT if parent_id is None else parent_id
+        self.birth_ticks[creature_id] = birth_tick
+
+    def creature_ids(self):
+        """Return the IDs of every creature ever born"""
+        return [creature_id for creature_id, birth_tick in enumerate(self.birth_ticks)
+                if birth_tick != NOT_A_CREATURE]
+
+    def record_death(self, creature_id, tick):
+        """Record the tick a creature died"""
+        if self.death_ticks[creature_id] == STILL_ALIVE:
+            self.death_ticks[creature_id] = tick
+
+    def parent_of(self, creature_id):
+        """Return the parent ID, or None for founders"""
+        parent_id = self.parents[creature_id]
+        return None if parent_id == NO_PARENT else parent_id
+
+    def ancestors_of(self, creature_id):
+        """Return parent, grandparent, ... up to the founder"""
+        ancestors = []
+        parent_id = self.parents[creature_id]
+        while parent_id != NO_PARENT:
+            ancestors.append(parent_id)
+            parent_id = self.parents[parent_id]
+        return ancestors
+
+    def children_of(self, creature_id):
+        """Return the IDs of a creature's direct offspring"""
+        # Children are always registered after their parent
+        return [child_id for child_id in range(creature_id + 1, len(self.parents))
+                if self.parents[child_id] == creature_id]
+
+    def descendants_of(self, creature_id):
+        """Return the IDs of every descendant in birth order"""
+        family = {creature_id}
+        descendants = []
+        for child_id in range(creature_id + 1, len(self.parents)):
+            if self.parents[child_id] in family:
+                family.add(child_id)
+                descendants.append(child_id)
+        return descendants
+
+    def generation_of(self, creature_id):
+        """Return how many ancestors a creature has (founders are generation 0)"""
+        return len(self.ancestors_of(creature_id))
+
+    def is_alive(self, creature_id):
+        return self.death_ticks[creature_id] == STILL_ALIVE
+
+    def lifespan_of(self, creature_id, current_tick):
+        """Return ticks lived so far, or in total for dead creatures"""
+        death_tick = self.death_ticks[creature_id]
+        end_tick = current_tick if death_tick == STILL_ALIVE else death_tick
+        return end_tick - self.birth_ticks[creature_id]
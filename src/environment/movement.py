@@ -0,0 +1,58 @@
+from entities.creature import Creature
+
+# How creature moves are applied. "sequential" moves each creature the moment
+# it decides to, so later creatures in the table see the earlier moves.
+# "two_phase" has every creature propose a move against the occupancy at the
+# start of the tick, then resolves all proposals together, so the outcome no
+# longer depends on the order creatures are updated in.
+SEQUENTIAL = "sequential"
+TWO_PHASE = "two_phase"
+MODES = (SEQUENTIAL, TWO_PHASE)
+
+
+# A proposed move: the offsets to try in order of preference, and the corpse
+# dragged along when the mover is carrying one
+class MoveIntent:
+    __slots__ = ("entity", "moves", "carried", "target")
+
+    def __init__(self, entity, moves, carried, target):
+        self.entity = entity
+        self.moves = moves
+        self.carried = carried
+        self.target = target
+
+
+def carried_by(entity):
+    """Return the corpse an entity drags along when it moves, or None"""
+    corpse = entity.target
+    if entity.carrying_food and isinstance(corpse, Creature):
+        if abs(entity.x - corpse.x) + abs(entity.y - corpse.y) <= 1:
+            return corpse
+    return None
+
+
+def resolve(env, intents, frozen):
+    """Apply the moves proposed during one tick, returning how many were made
+
+    A destination has to be free both at the start of the tick (frozen) and
+    now, so nobody steps into a tile vacated this tick and two creatures never
+    swap places. Carriers go first because they need two free tiles, everyone
+    else in a random order drawn from the behaviour stream in ID order.
+    """
+    intents = sorted(intents, key=lambda intent: intent.entity.id)
+    for intent in intents:
+        # Later in its update a creature may have picked up or let go of a corpse
+        intent.carried = carried_by(intent.entity)
+    keys = [env.rng.behaviour.random() for _ in intents]
+    order = sorted(range(len(intents)), key=lambda i: (intents[i].carried is None, keys[i]))
+
+    def blocked(x, y):
+        return (x, y) in frozen or env.is_position_occupied(x, y)
+
+    moved = 0
+    for i in order:
+        intent = intents[i]
+        if env.apply_move(intent, blocked):
+            intent.entity.after_move()
+            moved += 1
+    return moved
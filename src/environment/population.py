@@ -0,0 +1,52 @@
+ZONES = ("food", "nursery", "sleeping")
+
+# Live population counters, updated on state transitions instead of list scans
+class PopulationCounters:
+    def __init__(self):
+        self.alive = 0
+        self.dead = 0
+        self.eggs = 0
+        self.carriers = 0  # Living creatures carrying a corpse
+        self.sleepers = 0  # Living creatures in the sleeping state
+        self.zones = {zone: 0 for zone in ZONES}  # Living creatures per colony zone
+
+    @property
+    def total(self):
+        """Creatures in the world, alive or awaiting removal"""
+        return self.alive + self.dead
+
+    def creature_born(self, zones):
+        self.alive += 1
+        self.enter_zones(zones)
+
+    def creature_died(self, creature, zones):
+        self.alive -= 1
+        self.dead += 1
+        if creature.sleeping:
+            self.sleepers -= 1
+        if creature.carrying_food:
+            self.carriers -= 1
+        self.leave_zones(zones)
+
+    def corpse_removed(self):
+        self.dead -= 1
+
+    def enter_zones(self, zones):
+        for zone in zones:
+            self.zones[zone] += 1
+
+    def leave_zones(self, zones):
+        for zone in zones:
+            self.zones[zone] -= 1
+
+    def as_dict(self):
+        """Return a flat copy of every counter"""
+        counts = {
+            "alive": self.alive,
+            "dead": self.dead,
+            "eggs": self.eggs,
+            "carriers": self.carriers,
+            "sleepers": self.sleepers,
+        }
+        counts.update({f"zone_{zone}": count for zone, count in self.zones.items()})
+        return counts
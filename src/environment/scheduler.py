@@ -0,0 +1,47 @@
+from collections import defaultdict
+
+# A single scheduled callback
+class ScheduledEvent:
+    __slots__ = ("tick", "callback", "args", "cancelled")
+
+    def __init__(self, tick, callback, args):
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the event from firing"""
+        self.cancelled = True
+
+
+# Timing wheel keyed by tick so waiting entities cost nothing per tick
+class Scheduler:
+    def __init__(self, tick=0):
+        self.tick = tick
+        self.buckets = defaultdict(list)  # Due tick -> events in scheduling order
+
+    def schedule_at(self, tick, callback, *args):
+        """Schedule a callback to fire at an absolute tick"""
+        # Never schedule into the past, fire on the next tick instead
+        tick = max(tick, self.tick + 1)
+        event = ScheduledEvent(tick, callback, args)
+        self.buckets[tick].append(event)
+        return event
+
+    def schedule(self, delay, callback, *args):
+        """Schedule a callback to fire after a number of ticks"""
+        return self.schedule_at(self.tick + delay, callback, *args)
+
+    def advance(self):
+        """Move to the next tick and fire every event due on it"""
+        self.tick += 1
+        # Anything scheduled while firing lands on a later tick
+        for event in self.buckets.pop(self.tick, ()):
+            if not event.cancelled:
+                event.callback(*event.args)
+
+    def pending_count(self):
+        """Return the number of events still waiting to fire"""
+        return sum(1 for events in self.buckets.values()
+                   for event in events if not event.cancelled)
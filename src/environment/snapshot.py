@@ -0,0 +1,422 @@
+import json
+import zipfile
+from array import array
+
+import numpy as np
+
+from entities.creature import Creature
+from entities.egg import Egg
+from environment.environment import Environment
+from utils.config import SimulationConfig, WorldConfig
+from utils.constants import PATTERN_COLORS, TEXTURE_PATTERNS
+from utils.rng import STREAMS
+
+# Versioned, columnar world snapshots: every table is stored as NumPy
+# columns in one compressed .npz container, plus a small JSON header
+FORMAT_VERSION = 2  # 2: grass and fertility stored as dense arrays
+
+# Header entries every snapshot carries; "config" and "zones" are optional
+HEADER_KEYS = ("version", "width", "height", "tick", "next_id", "seed", "area_scales", "rng")
+HEADER_INTS = ("width", "height", "tick", "next_id", "seed")
+
+# Creature columns copied straight from attributes, grouped by dtype
+CREATURE_INT_COLUMNS = ("id", "x", "y", "birth_tick", "max_age", "egg_laying_cooldown",
+                        "animation_frame")
+CREATURE_FLOAT_COLUMNS = ("health", "energy", "hunger", "happiness", "food_value",
+                          "decomposition", "animation_timer", "heart_animation_offset",
+                          "blink_timer", "breath_offset", "mouth_open_amount",
+                          "target_mouth_open", "chew_timer", "pattern_offset", "pattern_scale")
+CREATURE_BOOL_COLUMNS = ("mature", "dead", "sleeping", "eating", "carrying_food",
+                         "has_laid_egg", "age_related_health_loss", "is_blinking", "is_chewing")
+
+# Small enumerations stored as codes
+PATTERNS = tuple(TEXTURE_PATTERNS.keys())
+DEATH_CAUSES = (None, "Old Age", "Starvation", "Unknown")
+AREA_TARGETS = (None, "food", "sleeping", "nursery")
+TARGET_CREATURE = len(AREA_TARGETS)
+TARGET_EGG = TARGET_CREATURE + 1
+NO_ID = -1
+
+# Scheduled callbacks are saved as (tick, method name, entity ID)
+EVENT_KINDS = ("hatch", "mature_up", "die_of_old_age", "end_egg_laying_cooldown")
+EGG_EVENT_KINDS = [EVENT_KINDS.index("hatch")]  # Every other kind is a creature method
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is malformed or inconsistent"""
+
+
+def _optional_id(value):
+    return NO_ID if value is None else value
+
+
+def _encode_target(target):
+    """Return (kind, entity ID) for a creature's target"""
+    if isinstance(target, Creature):
+        return TARGET_CREATURE, target.id
+    if isinstance(target, Egg):
+        return TARGET_EGG, target.id
+    return AREA_TARGETS.index(target), NO_ID
+
+
+def _pairs(positions):
+    """Pack (x, y) tuples into an (n, 2) int array"""
+    return np.array(list(positions), dtype=np.int32).reshape(-1, 2)
+
+
+def creature_columns(creatures):
+    """Return the creature_* columns of a list of creatures, targets encoded by ID"""
+    columns = {}
+    for name in CREATURE_INT_COLUMNS:
+        columns[f"creature_{name}"] = np.array([getattr(c, name) for c in creatures], dtype=np.int64)
+    for name in CREATURE_FLOAT_COLUMNS:
+        columns[f"creature_{name}"] = np.array([getattr(c, name) for c in creatures], dtype=np.float64)
+    for name in CREATURE_BOOL_COLUMNS:
+        columns[f"creature_{name}"] = np.array([getattr(c, name) for c in creatures], dtype=bool)
+    columns["creature_death_tick"] = np.array([_optional_id(c.death_tick) for c in creatures], dtype=np.int64)
+    columns["creature_parent_id"] = np.array([_optional_id(c.parent_id) for c in creatures], dtype=np.int64)
+    columns["creature_color"] = np.array([c.color[:3] for c in creatures], dtype=np.uint8).reshape(-1, 3)
+    columns["creature_pattern"] = np.array([PATTERNS.index(c.pattern) for c in creatures], dtype=np.int8)
+    columns["creature_pattern_color"] = np.array([PATTERN_COLORS.index(c.pattern_color) for c in creatures],
+                                                 dtype=np.int8)
+    columns["creature_death_cause"] = np.array([DEATH_CAUSES.index(c.death_cause) for c in creatures],
+                                               dtype=np.int8)
+    targets = [_encode_target(c.target) for c in creatures]
+    columns["creature_target_kind"] = np.array([kind for kind, _ in targets], dtype=np.int8)
+    columns["creature_target_id"] = np.array([target_id for _, target_id in targets], dtype=np.int64)
+    return columns
+
+
+def egg_columns(eggs):
+    """Return the egg_* columns of a list of eggs"""
+    return {
+        "egg_id": np.array([e.id for e in eggs], dtype=np.int64),
+        "egg_x": np.array([e.x for e in eggs], dtype=np.int64),
+        "egg_y": np.array([e.y for e in eggs], dtype=np.int64),
+        "egg_parent_id": np.array([_optional_id(e.parent_id) for e in eggs], dtype=np.int64),
+        "egg_laid_tick": np.array([e.laid_tick for e in eggs], dtype=np.int64),
+        "egg_hatch_time": np.array([e.hatch_time for e in eggs], dtype=np.int64),
+    }
+
+
+def capture(env):
+    """Return a point-in-time, columnar copy of the whole world
+
+    The result shares nothing with the live environment, so it can be
+    compressed and written while the simulation keeps running.
+    """
+    creatures = list(env.creatures)
+    eggs = list(env.eggs)
+    columns = {}
+
+    # A creature may still target a corpse that has already left the world;
+    # keep such ghosts so the targeting creature behaves exactly the same
+    captured = {c.id for c in creatures}
+    in_world = [True] * len(creatures)
+    for creature in creatures:
+        target = creature.target
+        while isinstance(target, Creature) and target.id not in captured:
+            captured.add(target.id)
+            creatures.append(target)
+            in_world.append(False)
+            target = target.target
+
+    # Creatures
+    columns.update(creature_columns(creatures))
+    columns["creature_in_world"] = np.array(in_world, dtype=bool)
+
+    # Eggs
+    columns.update(egg_columns(eggs))
+
+    # Lineage
+    columns["lineage_parents"] = np.frombuffer(env.lineage.parents, dtype=np.int64).copy()
+    columns["lineage_birth_ticks"] = np.frombuffer(env.lineage.birth_ticks, dtype=np.int64).copy()
+    columns["lineage_death_ticks"] = np.frombuffer(env.lineage.death_ticks, dtype=np.int64).copy()
+
+    # Fields
+    columns["grass"] = env.grass.copy()
+    columns["fertility"] = env.fertility.copy()
+
+    # Decomposition tracking
+    columns["decomposing_positions"] = _pairs(env.decomposing_positions)
+    columns["initial_death_ids"] = np.array(list(env.initial_death_positions.keys()), dtype=np.int64)
+    columns["initial_death_positions"] = _pairs(env.initial_death_positions.values())
+    columns["last_position_ids"] = np.array(list(env.last_positions.keys()), dtype=np.int64)
+    columns["last_positions"] = _pairs(env.last_positions.values())
+
+    # Pending scheduler events, in firing order
+    living_ids = {entity.id for entity in env.creatures} | {entity.id for entity in eggs}
+    pending = []
+    for tick in sorted(env.scheduler.buckets):
+        for event in env.scheduler.buckets[tick]:
+            entity = getattr(event.callback, "__self__", None)
+            if event.cancelled or entity is None or getattr(entity, "id", None) not in living_ids:
+                continue
+            pending.append((tick, EVENT_KINDS.index(event.callback.__name__), entity.id))
+    columns["event_ticks"] = np.array([tick for tick, _, _ in pending], dtype=np.int64)
+    columns["event_kinds"] = np.array([kind for _, kind, _ in pending], dtype=np.int8)
+    columns["event_entity_ids"] = np.array([entity_id for _, _, entity_id in pending], dtype=np.int64)
+
+    # Random streams (the bit generator state holds 128-bit integers, so it goes in the header)
+    rng_state = env.rng.get_state()
+    for name, state in rng_state.items():
+        columns[f"rng_{name}_block"] = state["block"]
+
+    header = {
+        "version": FORMAT_VERSION,
+        "width": env.width,
+        "height": env.height,
+        "tick": env.tick,
+        "next_id": env.next_id,
+        "seed": env.rng.seed,
+        "config": env.config.as_dict(),
+        "zones": env.world.as_dict()["zones"],
+        "area_scales": [env.sleeping_area_scale, env.food_area_scale, env.nursery_area_scale],
+        "rng": {name: {"bit_generator": state["bit_generator"], "index": state["index"]}
+                for name, state in rng_state.items()},
+    }
+    columns["header"] = np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8)
+    return columns
+
+
+def write(path, columns):
+    """Compress and write captured columns to path"""
+    with open(path, "wb") as file:
+        np.savez_compressed(file, **columns)
+
+
+def save(env, path):
+    """Write a snapshot of env to path"""
+    write(path, capture(env))
+
+
+def read(path):
+    """Read the columns of a snapshot file"""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile) as error:
+        raise SnapshotError(f"Cannot read snapshot {path}: {error}") from error
+
+
+def load(path, game_manager=None):
+    """Read a snapshot file and rebuild its environment"""
+    return restore(read(path), game_manager)
+
+
+def _read_header(columns):
+    if "header" not in columns:
+        raise SnapshotError("Snapshot has no header")
+    try:
+        header = json.loads(columns["header"].tobytes().decode("utf-8"))
+    except ValueError as error:
+        raise SnapshotError(f"Snapshot header is corrupt: {error}") from error
+    if not isinstance(header, dict):
+        raise SnapshotError("Snapshot header is not an object")
+    if header.get("version") != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {header.get('version')}, "
+                            f"expected {FORMAT_VERSION}")
+
+    missing = [key for key in HEADER_KEYS if key not in header]
+    if missing:
+        raise SnapshotError(f"Snapshot header is missing {', '.join(missing)}")
+    for key in HEADER_INTS:
+        if not isinstance(header[key], int) or isinstance(header[key], bool):
+            raise SnapshotError(f"Snapshot header entry {key} is not an integer")
+    scales = header["area_scales"]
+    if not isinstance(scales, list) or len(scales) != 3:
+        raise SnapshotError("Snapshot header needs three area scales")
+    rng = header["rng"]
+    if not isinstance(rng, dict) or set(rng) != set(STREAMS):
+        raise SnapshotError(f"Snapshot header needs the RNG state of the streams {', '.join(STREAMS)}")
+    for name, state in rng.items():
+        if not isinstance(state, dict) or "bit_generator" not in state or "index" not in state:
+            raise SnapshotError(f"Snapshot header has an incomplete state for RNG stream {name}")
+    return header
+
+
+def _validate(columns, header):
+    """Check column presence, lengths and cross references before rebuilding"""
+    def require(condition, message):
+        if not condition:
+            raise SnapshotError(message)
+
+    def column(name):
+        require(name in columns, f"Snapshot is missing column {name}")
+        return columns[name]
+
+    width, height, next_id = header["width"], header["height"], header["next_id"]
+
+    creature_ids = column("creature_id")
+    for name in (*CREATURE_INT_COLUMNS, *CREATURE_FLOAT_COLUMNS, *CREATURE_BOOL_COLUMNS,
+                 "in_world", "death_tick", "parent_id", "color", "pattern", "pattern_color",
+                 "death_cause", "target_kind", "target_id"):
+        require(len(column(f"creature_{name}")) == len(creature_ids),
+                f"Creature column {name} has the wrong length")
+    egg_ids = column("egg_id")
+    for name in ("x", "y", "parent_id", "laid_tick", "hatch_time"):
+        require(len(column(f"egg_{name}")) == len(egg_ids), f"Egg column {name} has the wrong length")
+
+    all_ids = np.concatenate([creature_ids, egg_ids])
+    require(len(np.unique(all_ids)) == len(all_ids), "Entity IDs are not unique")
+    require(np.all((all_ids >= 0) & (all_ids < next_id)), "Entity ID out of range")
+
+    in_world = columns["creature_in_world"]
+    xs = np.concatenate([columns["creature_x"][in_world], columns["egg_x"]])
+    ys = np.concatenate([columns["creature_y"][in_world], columns["egg_y"]])
+    require(np.all((xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)), "Entity outside the world")
+    require(len(np.unique(xs * height + ys)) == len(xs), "Two entities share a tile")
+
+    kinds = columns["creature_target_kind"]
+    require(np.all((kinds >= 0) & (kinds <= TARGET_EGG)), "Unknown target kind")
+    require(np.all(np.isin(columns["creature_target_id"][kinds == TARGET_CREATURE], creature_ids)),
+            "Creature target refers to a missing creature")
+    require(np.all(np.isin(columns["creature_target_id"][kinds == TARGET_EGG], egg_ids)),
+            "Creature target refers to a missing egg")
+    require(np.all(columns["creature_pattern"] < len(PATTERNS)), "Unknown pattern")
+    require(np.all(columns["creature_pattern_color"] < len(PATTERN_COLORS)), "Unknown pattern color")
+    require(np.all(columns["creature_death_cause"] < len(DEATH_CAUSES)), "Unknown death cause")
+
+    lineage_length = len(column("lineage_parents"))
+    require(len(column("lineage_birth_ticks")) == lineage_length and
+            len(column("lineage_death_ticks")) == lineage_length, "Lineage columns differ in length")
+    require(np.all(creature_ids < lineage_length), "Creature missing from lineage")
+
+    for field in ("grass", "fertility"):
+        require(column(field).shape == (width, height), f"Field {field} does not match the world size")
+
+    require(len(column("initial_death_ids")) == len(column("initial_death_positions")) and
+            len(column("last_position_ids")) == len(column("last_positions")),
+            "Decomposition tracking columns differ in length")
+
+    event_kinds = column("event_kinds")
+    require(len(column("event_ticks")) == len(event_kinds) == len(column("event_entity_ids")),
+            "Event columns differ in length")
+    require(np.all((event_kinds >= 0) & (event_kinds < len(EVENT_KINDS))), "Unknown event kind")
+    world_ids = np.concatenate([creature_ids[in_world], egg_ids])
+    require(np.all(np.isin(columns["event_entity_ids"], world_ids)), "Event refers to a missing entity")
+    require(np.array_equal(np.isin(event_kinds, EGG_EVENT_KINDS), np.isin(columns["event_entity_ids"], egg_ids)),
+            "Event kind does not match its entity")
+
+    for name in header["rng"]:
+        column(f"rng_{name}_block")
+
+
+def creature_rows(columns):
+    """Return the creature_* columns as Python lists, keyed without the prefix"""
+    return {name: columns[f"creature_{name}"].tolist()
+            for name in (*CREATURE_INT_COLUMNS, *CREATURE_FLOAT_COLUMNS, *CREATURE_BOOL_COLUMNS,
+                         "in_world", "death_tick", "parent_id", "color", "pattern", "pattern_color",
+                         "death_cause", "target_kind", "target_id")
+            if f"creature_{name}" in columns}
+
+
+def restore_creature(env, rows, i):
+    """Rebuild creature i of creature_rows without placing it or resolving its target"""
+    creature = Creature.__new__(Creature)
+    creature.init_state(rows["x"][i], rows["y"][i], env)
+    for name in (*CREATURE_INT_COLUMNS, *CREATURE_FLOAT_COLUMNS):
+        setattr(creature, name, rows[name][i])
+    for name in CREATURE_BOOL_COLUMNS:
+        if name in ("sleeping", "carrying_food"):
+            # Bypass the counting setters, the counters are rebuilt by the caller
+            setattr(creature, f"_{name}", rows[name][i])
+        else:
+            setattr(creature, name, rows[name][i])
+    creature.death_tick = None if rows["death_tick"][i] == NO_ID else rows["death_tick"][i]
+    creature.parent_id = None if rows["parent_id"][i] == NO_ID else rows["parent_id"][i]
+    creature.color = tuple(rows["color"][i])
+    creature.pattern = PATTERNS[rows["pattern"][i]]
+    creature.pattern_color = PATTERN_COLORS[rows["pattern_color"][i]]
+    creature.death_cause = DEATH_CAUSES[rows["death_cause"][i]]
+    return creature
+
+
+def restore_eggs(env, columns):
+    """Rebuild the eggs of egg_* columns without placing them"""
+    eggs = []
+    rows = zip(*(columns[f"egg_{name}"].tolist()
+                 for name in ("id", "x", "y", "parent_id", "laid_tick", "hatch_time")))
+    for egg_id, x, y, parent_id, laid_tick, hatch_time in rows:
+        egg = Egg.__new__(Egg)
+        egg.x, egg.y, egg.env, egg.id = x, y, env, egg_id
+        egg.parent_id = None if parent_id == NO_ID else parent_id
+        egg.laid_tick = laid_tick
+        egg.hatch_time = hatch_time
+        egg.selected = False
+        egg.ready_to_hatch = False
+        eggs.append(egg)
+    return eggs
+
+
+def restore(columns, game_manager=None):
+    """Rebuild an environment from captured or loaded columns"""
+    header = _read_header(columns)
+    _validate(columns, header)
+
+    try:
+        # Snapshots from before per-world configuration use the global constants
+        config = SimulationConfig(**header.get("config", {}))
+    except ValueError as error:
+        raise SnapshotError(str(error)) from error
+    try:
+        # Snapshots from before configurable layouts use the standard one
+        world = WorldConfig(header["width"], header["height"], header.get("zones"))
+    except ValueError as error:
+        raise SnapshotError(str(error)) from error
+    env = Environment(game_manager=game_manager, seed=header["seed"], populate=False, config=config,
+                      world=world)
+    env.next_id = header["next_id"]
+    env.scheduler.tick = header["tick"]
+    env.sleeping_area_scale, env.food_area_scale, env.nursery_area_scale = header["area_scales"]
+    env.rng.set_state({name: {"bit_generator": state["bit_generator"],
+                              "block": columns[f"rng_{name}_block"],
+                              "index": state["index"]}
+                       for name, state in header["rng"].items()})
+
+    env.lineage.parents = array('q', columns["lineage_parents"].tolist())
+    env.lineage.birth_ticks = array('q', columns["lineage_birth_ticks"].tolist())
+    env.lineage.death_ticks = array('q', columns["lineage_death_ticks"].tolist())
+
+    # Creatures, in their original table order so update order is preserved
+    rows = creature_rows(columns)
+    restored = {}  # Every creature by ID, including those that only live on as some creature's target
+    for i in range(len(rows["id"])):
+        creature = restore_creature(env, rows, i)
+        restored[creature.id] = creature
+        if rows["in_world"][i]:
+            env.creatures.add(creature)
+            env.grid[(creature.x, creature.y)] = creature
+
+    for egg in restore_eggs(env, columns):
+        env.eggs.add(egg)
+        env.grid[(egg.x, egg.y)] = egg
+
+    # Targets can point at any entity, so resolve them by ID once everything exists
+    for creature_id, kind, target_id in zip(rows["id"], rows["target_kind"], rows["target_id"]):
+        creature = restored[creature_id]
+        if kind == TARGET_CREATURE:
+            creature.target = restored[target_id]
+        elif kind == TARGET_EGG:
+            creature.target = env.eggs.get(target_id)
+        else:
+            creature.target = AREA_TARGETS[kind]
+
+    # Counters are derived state, rebuild them from the restored entities
+    env.recount_population()
+
+    env.grass[...] = columns["grass"]
+    env.fertility[...] = columns["fertility"]
+    env.decomposing_positions = {(x, y): None for x, y in columns["decomposing_positions"].tolist()}
+    env.initial_death_positions = {creature_id: (x, y) for creature_id, (x, y) in
+                                   zip(columns["initial_death_ids"].tolist(),
+                                       columns["initial_death_positions"].tolist())}
+    env.last_positions = {creature_id: (x, y) for creature_id, (x, y) in
+                          zip(columns["last_position_ids"].tolist(), columns["last_positions"].tolist())}
+
+    for tick, kind, entity_id in zip(columns["event_ticks"].tolist(), columns["event_kinds"].tolist(),
+                                     columns["event_entity_ids"].tolist()):
+        entity = env.creatures.get(entity_id) or env.eggs.get(entity_id)
+        env.scheduler.schedule_at(tick, getattr(entity, EVENT_KINDS[kind]))
+
+    return env
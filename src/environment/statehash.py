@@ -0,0 +1,59 @@
+import hashlib
+
+import numpy as np
+
+from utils.constants import STATE_HASH_DECIMALS
+from environment import snapshot
+
+# Canonical hashes of a world's state. Two worlds hash equal when their
+# creatures, eggs, occupancy and fields agree, whatever order their tables
+# and dicts happen to be in. Floats are rounded to a fixed number of
+# decimals first, so backends that only differ by rounding noise usually
+# match. A value straddling a rounding boundary still changes the hash, so
+# equal hashes are a fast check only: engine.differential compares worlds
+# whose hashes differ again, with a tolerance on their floats.
+
+
+def _rounded(column, decimals):
+    if column.dtype.kind != "f" or decimals is None:
+        return column
+    return np.round(column, decimals) + 0.0  # Adding zero folds -0.0 into 0.0
+
+
+def state_components(env, decimals=STATE_HASH_DECIMALS):
+    """Return the world's state as named arrays in a canonical order
+
+    Creatures and eggs are sorted by ID and occupancy by tile; every float
+    is rounded to decimals, unless decimals is None.
+    """
+    components = {"tick": np.array([env.tick], dtype=np.int64)}
+    creatures = sorted(env.creatures, key=lambda creature: creature.id)
+    components.update(snapshot.creature_columns(creatures))
+    components.update(snapshot.egg_columns(sorted(env.eggs, key=lambda egg: egg.id)))
+    occupancy = sorted((x, y, entity.id) for (x, y), entity in env.grid.items())
+    components["occupancy"] = np.array(occupancy, dtype=np.int64).reshape(-1, 3)  # x, y, entity ID
+    components["decomposing"] = np.array(sorted(env.decomposing_positions), dtype=np.int64).reshape(-1, 2)
+    components["grass"] = np.asarray(env.grass, dtype=np.float64)
+    components["fertility"] = np.asarray(env.fertility, dtype=np.float64)
+    return {name: np.ascontiguousarray(_rounded(column, decimals)) for name, column in components.items()}
+
+
+def _digest(name, column):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{name}:{column.dtype.str}:{column.shape}".encode())
+    digest.update(column.tobytes())
+    return digest
+
+
+def component_hashes(env, decimals=STATE_HASH_DECIMALS):
+    """Return a hex digest per state component, to tell which part of two worlds differs"""
+    return {name: _digest(name, column).hexdigest()
+            for name, column in state_components(env, decimals).items()}
+
+
+def state_hash(env, decimals=STATE_HASH_DECIMALS):
+    """Return one hex digest of the whole world state"""
+    digest = hashlib.blake2b(digest_size=16)
+    for name, component in component_hashes(env, decimals).items():
+        digest.update(f"{name}={component};".encode())
+    return digest.hexdigest()
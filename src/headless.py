@@ -0,0 +1,155 @@
+import argparse
+
+from utils.constants import *
+from utils.config import WorldConfig
+from managers.game_manager import GameManager
+from managers.autosave import Autosave
+from managers.replay import Journal, Replay
+from managers.field_history import FieldHistoryRecorder
+from managers.metrics import MetricsCollector, COLUMN
+from engine.batched import FieldBatchedWorlds
+from engine.domain import TiledWorld
+from environment.invariants import InvariantChecker, MODES as CHECK_MODES
+from engine.differential import parse_settings, run_differential
+
+# Run the simulation without a window, as fast as the machine allows
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run Life in the Grid without rendering")
+    parser.add_argument("--ticks", type=int, default=10000, help="Number of ticks to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible run")
+    parser.add_argument("--load", default=None, help="Snapshot to resume from")
+    parser.add_argument("--save", default=None, help="Write a snapshot here when the run ends")
+    parser.add_argument("--autosave-dir", default=None, help="Enable autosave into this directory")
+    parser.add_argument("--autosave-interval", type=int, default=AUTOSAVE_INTERVAL)
+    parser.add_argument("--autosave-retention", type=int, default=AUTOSAVE_RETENTION)
+    parser.add_argument("--journal", default=None, help="Record the run into this journal directory")
+    parser.add_argument("--keyframe-interval", type=int, default=JOURNAL_KEYFRAME_INTERVAL)
+    parser.add_argument("--field-history", default=None, help="Record grass and fertility frames here")
+    parser.add_argument("--field-interval", type=int, default=FIELD_HISTORY_INTERVAL)
+    parser.add_argument("--metrics", default=None, help="Stream per-tick metrics to this .csv or .jsonl file")
+    parser.add_argument("--replay", default=None, help="Journal directory to replay instead of running")
+    parser.add_argument("--seek", type=int, default=None, help="Tick to rebuild from the replayed journal")
+    parser.add_argument("--worlds", type=int, default=None, help="Step this many independent worlds with their fields updated as one batch")
+    parser.add_argument("--tiles", default=None, help="Split the world into XxY tiles, one worker process each")
+    parser.add_argument("--width", type=int, default=None, help="World width in grid tiles")
+    parser.add_argument("--height", type=int, default=None, help="World height in grid tiles")
+    parser.add_argument("--check", choices=CHECK_MODES, default=None,
+                        help="Check the world's bookkeeping after every tick, fully or on a random sample")
+    parser.add_argument("--diff", action="append", default=None, metavar="SETTING=VALUE",
+                        help="Run a world with this engine setting against the default one, e.g. field_backend=numba")
+    parser.add_argument("--diff-against", action="append", default=None, metavar="SETTING=VALUE",
+                        help="Engine setting of the world --diff is compared to")
+    return parser.parse_args()
+
+
+def replay_journal(args):
+    """Rebuild a journalled world at a tick, optionally saving it for inspection"""
+    journal_replay = Replay(args.replay)
+    env = journal_replay.seek(journal_replay.end_tick if args.seek is None else args.seek)
+    if args.save:
+        journal_replay.game_manager.save_world(args.save)
+    return env
+
+
+def run(args):
+    autosave = None
+    if args.autosave_dir:
+        autosave = Autosave(args.autosave_dir, args.autosave_interval, args.autosave_retention)
+
+    journal = Journal(args.journal, args.keyframe_interval) if args.journal else None
+
+    metrics = None
+    if args.metrics:
+        metrics = MetricsCollector()
+        metrics.export_to(args.metrics)
+
+    game_manager = GameManager(seed=args.seed, autosave=autosave, journal=journal, metrics=metrics,
+                               world=WorldConfig(args.width, args.height))
+    if args.load:
+        game_manager.load_world(args.load)
+    if args.check:
+        env = game_manager.environment
+        env.invariants = InvariantChecker(args.check, seed=env.rng.seed)
+    field_history = None
+    if args.field_history:
+        env = game_manager.environment
+        field_history = FieldHistoryRecorder(args.field_history, env.width, env.height, args.field_interval,
+                                             capacity=args.ticks // max(args.field_interval, 1) + 1)
+        game_manager.field_history = field_history
+    game_manager.set_speed_state("play")
+
+    for _ in range(args.ticks):
+        game_manager.update(1.0 / MAX_FPS)
+
+    if autosave:
+        autosave.close()
+        if autosave.last_error:
+            print(f"Autosave failed: {autosave.last_error}")
+    if journal:
+        journal.close()
+        if journal.last_error:
+            print(f"Journal keyframe failed: {journal.last_error}")
+    if field_history:
+        field_history.close()
+        if field_history.full:
+            print(f"Field history {field_history.directory} is full after {field_history.count} frames")
+    if metrics is not None:
+        metrics.close()
+    if args.save:
+        game_manager.save_world(args.save)
+    return game_manager.environment
+
+
+def run_batch(args):
+    """Step worlds with batched fields and report each one's population"""
+    worlds = FieldBatchedWorlds(args.worlds, seed=args.seed, width=args.width, height=args.height)
+    for _ in range(args.ticks):
+        worlds.step(1.0 / MAX_FPS)
+    for world_seed, row in zip(worlds.seeds, worlds.metrics()):
+        print(f"Tick {int(row[COLUMN['tick']])} (seed {world_seed}): {int(row[COLUMN['alive']])} alive, "
+              f"{int(row[COLUMN['dead']])} dead, {int(row[COLUMN['eggs']])} eggs")
+
+
+def run_tiled(args):
+    """Run one world split across worker processes"""
+    tiles = tuple(int(count) for count in args.tiles.lower().split("x"))
+    world = TiledWorld(tiles, seed=args.seed, width=args.width, height=args.height)
+    try:
+        for _ in range(args.ticks):
+            world.step(1.0 / MAX_FPS)
+        totals = world.totals() or {"alive": 0, "dead": 0, "eggs": 0}
+    finally:
+        world.close()
+    print(f"Tick {world.tick} (seed {world.seed}, {len(world)} tiles): "
+          f"{totals['alive']} alive, {totals['dead']} dead, {totals['eggs']} eggs")
+
+
+def run_diff(args):
+    """Run two engine setups side by side and report where their states first differ"""
+    seed, divergence = run_differential(args.ticks, seed=args.seed, reference=parse_settings(args.diff_against),
+                                        candidate=parse_settings(args.diff),
+                                        world=WorldConfig(args.width, args.height))
+    if divergence is None:
+        print(f"Matched through tick {args.ticks} (seed {seed})")
+    else:
+        print(f"{divergence} (seed {seed})")
+    return divergence is None
+
+
+def main():
+    args = parse_args()
+    if args.diff or args.diff_against:
+        raise SystemExit(0 if run_diff(args) else 1)
+    if args.worlds:
+        run_batch(args)
+        return
+    if args.tiles:
+        run_tiled(args)
+        return
+    env = replay_journal(args) if args.replay else run(args)
+    print(f"Tick {env.tick} (seed {env.rng.seed}): "
+          f"{env.population.alive} alive, {env.population.dead} dead, {env.population.eggs} eggs")
+
+
+if __name__ == "__main__":
+    main()
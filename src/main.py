@@ -1,50 +1,76 @@
+import argparse
+
 import pyglet
 
 from utils.constants import *
-from managers.game_manager import GameManager
+from engine.remote import RemoteGame
 from managers.ui_manager import UIManager
 
-# Create the window
-window = pyglet.window.Window(WIDTH, HEIGHT, "Creature Simulation", resizable=False)
-
-# Create managers
-game_manager = GameManager()
-ui_manager = UIManager(game_manager)
-game_manager.set_ui_manager(ui_manager)  # Set the UI manager reference
-
-# Initial UI position update
-ui_manager.update_ui_positions()
-
-@window.event
-def on_mouse_press(x, y, button, modifiers):
-    # Handle grid clicks
-    if game_manager.handle_click(x, y):
-        return
-
-    # Handle UI clicks
-    clicked_button = ui_manager.handle_click(x, y)
-    if clicked_button:
-        if clicked_button == "pause" and game_manager.current_speed_state != "pause":
-            game_manager.current_speed_state = "pause"
-            game_manager.update_fps(0)
-        elif clicked_button == "play" and game_manager.current_speed_state != "play":
-            game_manager.current_speed_state = "play"
-            game_manager.update_fps(1)
-        elif clicked_button == "fast" and game_manager.current_speed_state != "fast":
-            game_manager.current_speed_state = "fast"
-            game_manager.update_fps(20)
-        
-        ui_manager.update_button_states(game_manager.current_speed_state)
-
-@window.event
-def on_draw():
-    window.clear()
-    game_manager.environment.draw(window)
-    ui_manager.draw()
-
-# Initial setup
-if game_manager.FPS > 0:
-    pyglet.clock.schedule_interval(game_manager.update, 1.0 / game_manager.FPS)
-
-# Run the application
-pyglet.app.run()
\ No newline at end of file
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run Life in the Grid in a window")
+    parser.add_argument("snapshot", nargs="?", default=None, help="Snapshot to resume from")
+    parser.add_argument("--autosave-dir", default=None, help="Enable autosave into this directory")
+    parser.add_argument("--journal", default=None, help="Record the session into this journal directory")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Create the window
+    window = pyglet.window.Window(WIDTH, HEIGHT, "Creature Simulation", resizable=False)
+
+    # The simulation runs in its own process, resuming from a snapshot passed on the command line
+    game_manager = RemoteGame(args.snapshot, autosave_dir=args.autosave_dir, journal_dir=args.journal)
+    ui_manager = UIManager(game_manager)
+    game_manager.set_ui_manager(ui_manager)  # Set the UI manager reference
+
+    # Initial UI position update
+    ui_manager.update_ui_positions()
+
+    @window.event
+    def on_mouse_press(x, y, button, modifiers):
+        # Handle grid clicks
+        if game_manager.handle_click(x, y):
+            return
+
+        # Handle UI clicks
+        clicked_button = ui_manager.handle_click(x, y)
+        if clicked_button:
+            if clicked_button == "pause" and game_manager.current_speed_state != "pause":
+                game_manager.set_speed_state("pause")
+                game_manager.update_fps(0)
+            elif clicked_button == "play" and game_manager.current_speed_state != "play":
+                game_manager.set_speed_state("play")
+                game_manager.update_fps(1)
+            elif clicked_button == "fast" and game_manager.current_speed_state != "fast":
+                game_manager.set_speed_state("fast")
+                game_manager.update_fps(20)
+
+            ui_manager.update_button_states(game_manager.current_speed_state)
+
+    @window.event
+    def on_key_press(symbol, modifiers):
+        # Quick save / quick load of the whole world
+        if symbol == pyglet.window.key.F5:
+            game_manager.save_world(QUICKSAVE_PATH)
+        elif symbol == pyglet.window.key.F9:
+            game_manager.load_world(QUICKSAVE_PATH)
+
+    @window.event
+    def on_draw():
+        window.clear()
+        game_manager.sync()  # Pick up the newest simulated frame, if any
+        game_manager.environment.draw(window)
+        ui_manager.draw()
+
+    # Redraw at a steady rate however fast the simulation ticks
+    try:
+        pyglet.app.run(1.0 / MAX_FPS)
+    finally:
+        game_manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import glob
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.constants import *
+from environment import snapshot
+
+# Periodic world snapshots written off the simulation thread
+class Autosave:
+    def __init__(self, directory=AUTOSAVE_DIR, interval=AUTOSAVE_INTERVAL, retention=AUTOSAVE_RETENTION):
+        self.directory = directory
+        self.interval = interval  # Ticks between saves
+        self.retention = retention  # Number of autosaves kept on disk
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self.pending = None  # Future of the write in progress
+        self.last_error = None  # Exception of the last failed background write, for the caller to report
+        os.makedirs(directory, exist_ok=True)
+
+    def on_tick(self, env):
+        """Take a snapshot at every interval boundary and write it in the background"""
+        if self.interval <= 0 or env.tick % self.interval != 0:
+            return False
+        # Never queue writes up behind a slow disk, skip this boundary instead
+        if self.pending and not self.pending.done():
+            return False
+        self._check_pending()
+
+        # Capturing copies the columns, so the tick loop can carry on mutating the world
+        columns = snapshot.capture(env)
+        self.pending = self.executor.submit(self._write, columns, env.tick)
+        return True
+
+    def _write(self, columns, tick):
+        """Compress and write a snapshot, then prune old ones (runs on the worker thread)"""
+        path = os.path.join(self.directory, f"autosave_{tick:012d}.npz")
+        temp_path = path + ".tmp"
+        snapshot.write(temp_path, columns)
+        os.replace(temp_path, path)  # Readers never see a half-written file
+
+        saves = sorted(glob.glob(os.path.join(self.directory, "autosave_*.npz")))
+        for old_path in saves[:-self.retention] if self.retention > 0 else []:
+            os.remove(old_path)
+        return path
+
+    def _check_pending(self):
+        """Keep the failure of the previous background write in last_error"""
+        if self.pending and self.pending.done() and self.pending.exception():
+            self.last_error = self.pending.exception()
+        self.pending = None
+
+    def latest(self):
+        """Return the path of the newest autosave, or None"""
+        saves = sorted(glob.glob(os.path.join(self.directory, "autosave_*.npz")))
+        return saves[-1] if saves else None
+
+    def flush(self):
+        """Wait for the write in progress to finish"""
+        if self.pending:
+            self.pending.exception()  # Blocks until done without raising
+            self._check_pending()
+
+    def close(self):
+        self.flush()
+        self.executor.shutdown(wait=True)
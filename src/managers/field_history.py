@@ -0,0 +1,129 @@
+import os
+
+import numpy as np
+
+from utils.constants import *
+
+# A field history directory holds two preallocated .npy files, both opened as
+# memory maps so neither writing nor reading ever pulls the whole run into RAM:
+#   fields.npy   float16 frames shaped (capacity, len(FIELDS), width, height)
+#   ticks.npy    int64 tick of each frame, NO_FRAME for slots not written yet
+FIELDS = ("grass", "fertility")
+FIELDS_FILE = "fields.npy"
+TICKS_FILE = "ticks.npy"
+NO_FRAME = -1
+
+
+class FieldHistoryError(ValueError):
+    """Raised when a field history is missing or does not match the world"""
+
+
+def _frame_count(ticks):
+    """Number of frames written, frames are always filled front to back"""
+    return int(np.count_nonzero(ticks != NO_FRAME))
+
+
+# Appends grass and fertility frames to a memory-mapped file every interval ticks
+class FieldHistoryRecorder:
+    def __init__(self, directory, width, height, interval=FIELD_HISTORY_INTERVAL,
+                 capacity=FIELD_HISTORY_CAPACITY):
+        self.directory = directory
+        self.interval = interval
+        os.makedirs(directory, exist_ok=True)
+        fields_path = os.path.join(directory, FIELDS_FILE)
+        ticks_path = os.path.join(directory, TICKS_FILE)
+        shape = (capacity, len(FIELDS), width, height)
+
+        if os.path.exists(fields_path):
+            # Keep appending to an earlier run of the same world
+            self.frames = np.load(fields_path, mmap_mode="r+")
+            self.ticks = np.load(ticks_path, mmap_mode="r+")
+            if self.frames.shape[1:] != shape[1:]:
+                raise FieldHistoryError(f"Field history {directory} holds {self.frames.shape[2]}x"
+                                        f"{self.frames.shape[3]} frames, the world is {width}x{height}")
+        else:
+            self.frames = np.lib.format.open_memmap(fields_path, mode="w+", dtype=np.float16, shape=shape)
+            self.ticks = np.lib.format.open_memmap(ticks_path, mode="w+", dtype=np.int64, shape=(capacity,))
+            self.ticks[:] = NO_FRAME
+        self.count = _frame_count(self.ticks)
+
+    @property
+    def capacity(self):
+        return len(self.ticks)
+
+    @property
+    def full(self):
+        """True once every preallocated frame is taken and further frames are dropped"""
+        return self.count >= self.capacity
+
+    def on_tick(self, env):
+        """Record a frame on every interval boundary"""
+        if self.interval <= 0 or env.tick % self.interval != 0:
+            return False
+        if self.full:
+            return False
+        if self.count and env.tick <= self.ticks[self.count - 1]:
+            return False  # The world was rewound, keep ticks increasing
+
+        frame = self.frames[self.count]
+        for index, name in enumerate(FIELDS):
+            frame[index] = getattr(env, name)  # Cast to float16 on the way in
+        # The tick goes in last, so a crash never leaves a half-written frame marked valid
+        self.ticks[self.count] = env.tick
+        self.count += 1
+        return True
+
+    def close(self):
+        self.frames.flush()
+        self.ticks.flush()
+
+
+# Read-only view over a recorded field history
+class FieldHistory:
+    def __init__(self, directory):
+        try:
+            self.frames = np.load(os.path.join(directory, FIELDS_FILE), mmap_mode="r")
+            ticks = np.load(os.path.join(directory, TICKS_FILE), mmap_mode="r")
+        except (OSError, ValueError) as error:
+            raise FieldHistoryError(f"Cannot read field history {directory}: {error}") from error
+        self.ticks = ticks[:_frame_count(ticks)]
+
+    def __len__(self):
+        return len(self.ticks)
+
+    @property
+    def width(self):
+        return self.frames.shape[2]
+
+    @property
+    def height(self):
+        return self.frames.shape[3]
+
+    def frame_range(self, start_tick=None, end_tick=None):
+        """Return the slice of frames recorded from start_tick up to, not including, end_tick"""
+        start = 0 if start_tick is None else int(np.searchsorted(self.ticks, start_tick))
+        end = len(self.ticks) if end_tick is None else int(np.searchsorted(self.ticks, end_tick))
+        return slice(start, end)
+
+    def select(self, field, start_tick=None, end_tick=None, region=None):
+        """Return (ticks, values) of one field over a time range and region
+
+        region is (x0, y0, x1, y1) with the upper bounds excluded. values is a
+        (frames, x1 - x0, y1 - y0) float16 view into the file, only the pages
+        touched when it is used are read from disk.
+        """
+        frames = self.frame_range(start_tick, end_tick)
+        x0, y0, x1, y1 = region or (0, 0, self.width, self.height)
+        return self.ticks[frames], self.frames[frames, FIELDS.index(field), x0:x1, y0:y1]
+
+    def at(self, field, tick):
+        """Return the last frame of a field recorded at or before tick"""
+        index = int(np.searchsorted(self.ticks, tick, side="right")) - 1
+        if index < 0:
+            raise FieldHistoryError(f"No {field} frame at or before tick {tick}")
+        return self.frames[index, FIELDS.index(field)]
+
+    def totals(self, field, start_tick=None, end_tick=None, region=None):
+        """Return (ticks, summed field value per frame), summed in float64"""
+        ticks, values = self.select(field, start_tick, end_tick, region)
+        return ticks, values.sum(axis=(1, 2), dtype=np.float64)
@@ -2,22 +2,74 @@ import pyglet
 
 from utils.constants import *
 from environment.environment import Environment
+from environment.events import HATCH, REMOVAL
+from environment import snapshot
 from ui.stats import update_stats
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, seed=None, autosave=None, journal=None, field_history=None, metrics=None, config=None,
+                 world=None):
         self.current_speed_state = "pause"
         self.FPS = 0
-        self.selected_creature = None
-        self.selected_egg = None
+        self.selected_creature_id = None  # Selections are entity IDs, not object references
+        self.selected_egg_id = None
         self.selected_tile = None
-        self.environment = Environment((WIDTH - SIDEBAR_WIDTH) // GRID_SIZE, HEIGHT // GRID_SIZE, self)
+        self.environment = None
+        self.journal = journal  # Optional Journal recording every tick for replay
+        self.metrics = metrics  # Optional MetricsCollector sampled every tick
+        self.set_environment(Environment(game_manager=self, seed=seed, config=config, world=world))
         self.ui_manager = None
+        self.autosave = autosave  # Optional background Autosave
+        self.field_history = field_history  # Optional FieldHistoryRecorder
+
+    def set_environment(self, environment):
+        """Switch to a different world and subscribe to its events"""
+        self.selected_creature_id = None
+        self.selected_egg_id = None
+        self.selected_tile = None
+        self.environment = environment
+        environment.game_manager = self
+        environment.events.subscribe(HATCH, self._on_hatch)
+        environment.events.subscribe(REMOVAL, self._on_removal)
+        if self.metrics is not None:
+            self.metrics.attach(environment)
+        if self.journal:
+            self.journal.start(environment)
+            # Creatures only act while unpaused, so the speed is part of the replayed input
+            self.journal.record_input(environment.tick, "speed", self.current_speed_state)
+
+    def save_world(self, path):
+        """Write a snapshot of the current world"""
+        snapshot.save(self.environment, path)
+
+    def load_world(self, path):
+        """Replace the current world with one read from a snapshot"""
+        self.set_environment(snapshot.load(path, self))
+
+    @property
+    def selected_creature(self):
+        """The selected creature, or None once it has left the world"""
+        if self.selected_creature_id is None:
+            return None
+        return self.environment.creatures.get(self.selected_creature_id)
+
+    @property
+    def selected_egg(self):
+        """The selected egg, or None once it has hatched"""
+        if self.selected_egg_id is None:
+            return None
+        return self.environment.eggs.get(self.selected_egg_id)
 
     def set_ui_manager(self, ui_manager):
         """Set the UI manager reference"""
         self.ui_manager = ui_manager
 
+    def set_speed_state(self, state):
+        """Switch between pause, play and fast"""
+        self.current_speed_state = state
+        if self.journal:
+            self.journal.record_input(self.environment.tick, "speed", state)
+
     def update_fps(self, new_fps):
         """Update the FPS and reschedule the update function"""
         self.FPS = new_fps
@@ -29,64 +81,75 @@ class GameManager:
         if x < WIDTH - SIDEBAR_WIDTH:  # Grid area click
             grid_x = x // GRID_SIZE
             grid_y = y // GRID_SIZE
-            self._handle_grid_click(grid_x, grid_y)
+            if self.environment.is_valid_position(grid_x, grid_y):  # The world may not fill the window
+                self._handle_grid_click(grid_x, grid_y)
             return True
         return False
 
     def _handle_grid_click(self, grid_x, grid_y):
         """Handle clicks on the grid"""
-        creature_found = False
-        egg_found = False
-        
-        # Check for creature click
-        for creature in self.environment.creatures:
-            if creature.x == grid_x and creature.y == grid_y:
-                self._select_creature(creature)
-                creature_found = True
-                self.selected_tile = None  # Clear tile selection
-                break
-        
-        # Check for egg click
-        if not creature_found:
-            for egg in self.environment.eggs:
-                if egg.x == grid_x and egg.y == grid_y:
-                    self._select_egg(egg)
-                    egg_found = True
-                    self.selected_tile = None  # Clear tile selection
-                    break
-        
-        # If no creature or egg found, select the tile
-        if not creature_found and not egg_found:
+        if self.journal:
+            self.journal.record_input(self.environment.tick, "click", grid_x, grid_y)
+
+        # The occupancy grid holds whichever creature or egg is on the tile
+        entity = self.environment.grid.get((grid_x, grid_y))
+
+        if entity in self.environment.creatures:
+            self._select_creature(entity)
+            self.selected_tile = None  # Clear tile selection
+        elif entity in self.environment.eggs:
+            self._select_egg(entity)
+            self.selected_tile = None  # Clear tile selection
+        else:
+            # If no creature or egg found, select the tile
             self._deselect_all()
             self.selected_tile = (grid_x, grid_y)
 
     def _select_creature(self, creature):
-        if self.selected_creature != creature:
+        if self.selected_creature_id != creature.id:
             self._deselect_all()
-            self.selected_creature = creature
-            self.selected_creature.selected = True
+            self.selected_creature_id = creature.id
+            creature.selected = True
 
     def _select_egg(self, egg):
         """Select an egg and deselect any previously selected entities"""
         self._deselect_all()  # Deselect everything first
-        self.selected_egg = egg
+        self.selected_egg_id = egg.id
         egg.selected = True  # Make sure to set the selected flag
 
     def _deselect_all(self):
         if self.selected_creature:
             self.selected_creature.selected = False
-            self.selected_creature = None
+        self.selected_creature_id = None
         if self.selected_egg:
             self.selected_egg.selected = False
-            self.selected_egg = None
+        self.selected_egg_id = None
+
+    def _on_hatch(self, egg, creature):
+        """Drop the selection of an egg that just hatched"""
+        if egg.id == self.selected_egg_id:
+            egg.selected = False
+            self.selected_egg_id = None
+
+    def _on_removal(self, creature):
+        """Drop the selection of a creature that left the world"""
+        if creature.id == self.selected_creature_id:
+            creature.selected = False
+            self.selected_creature_id = None
 
     def update(self, dt):
         """Update game state"""
         self.environment.update(dt)
-        
-        # Deselect if selected creature was removed
-        if self.selected_creature and self.selected_creature not in self.environment.creatures:
-            self.selected_creature = None
+        if self.journal:
+            self.journal.on_tick(self.environment, dt)
+        if self.metrics is not None:
+            self.metrics.sample(self.environment)
+
+        # Snapshot at the tick boundary, the write happens off this thread
+        if self.autosave:
+            self.autosave.on_tick(self.environment)
+        if self.field_history:
+            self.field_history.on_tick(self.environment)
 
         if self.ui_manager:
             update_stats(self.selected_creature, self.selected_egg, self.selected_tile, 
@@ -0,0 +1,142 @@
+import json
+
+import numpy as np
+
+from utils.constants import *
+from environment.events import BIRTH, DEATH
+
+# Columns sampled every tick. Births and deaths are counts for that tick,
+# everything else is the value at the end of the tick. The creature averages
+# and field totals scan every creature and tile, so they are recomputed every
+# stats_interval ticks and repeat their last value in between.
+SERIES = ("tick", "alive", "dead", "eggs", "births", "deaths_old_age", "deaths_starvation",
+          "deaths_unknown", "avg_hunger", "avg_energy", "avg_happiness", "total_grass",
+          "total_fertility")
+COLUMN = {name: index for index, name in enumerate(SERIES)}
+COUNTS = SERIES[:SERIES.index("deaths_unknown") + 1]  # Exported as integers
+STATS = slice(COLUMN["avg_hunger"], len(SERIES))  # Columns recomputed every stats_interval ticks
+DEATH_COLUMNS = {"Old Age": COLUMN["deaths_old_age"], "Starvation": COLUMN["deaths_starvation"]}
+
+
+# Per-tick colony metrics kept in a fixed-size NumPy ring buffer
+class MetricsCollector:
+    def __init__(self, capacity=METRICS_CAPACITY, flush_interval=METRICS_FLUSH_INTERVAL,
+                 stats_interval=METRICS_STATS_INTERVAL):
+        self.buffer = np.zeros((capacity, len(SERIES)))  # One row per tick, oldest overwritten
+        self.head = 0  # Row the next sample goes into
+        self.count = 0  # Rows holding samples, at most capacity
+        self.pending = np.zeros(len(SERIES))  # Event counts gathered during the current tick
+        self.environment = None
+        self.stream = None  # Open CSV/JSONL file samples are exported to
+        self.stream_format = None
+        self.unflushed = 0  # Samples not yet written to the stream
+        self.flush_interval = min(flush_interval, capacity)
+        self.stats_interval = max(stats_interval, 1)
+        self.stats = np.zeros(len(SERIES))[STATS]  # Last computed averages and totals
+        self.stats_tick = None  # Tick the stats were last computed on
+
+    @property
+    def capacity(self):
+        return len(self.buffer)
+
+    def __len__(self):
+        return self.count
+
+    def attach(self, env):
+        """Count births and deaths of env, detaching from the previous world"""
+        if self.environment:
+            self.environment.events.unsubscribe(BIRTH, self._on_birth)
+            self.environment.events.unsubscribe(DEATH, self._on_death)
+        self.environment = env
+        self.stats_tick = None
+        env.events.subscribe(BIRTH, self._on_birth)
+        env.events.subscribe(DEATH, self._on_death)
+
+    def _on_birth(self, creature):
+        self.pending[COLUMN["births"]] += 1
+
+    def _on_death(self, creature):
+        self.pending[DEATH_COLUMNS.get(creature.death_cause, COLUMN["deaths_unknown"])] += 1
+
+    def sample(self, env):
+        """Record the state at the end of the current tick"""
+        row = self.pending
+        row[COLUMN["tick"]] = env.tick
+        population = env.population
+        row[COLUMN["alive"]] = population.alive
+        row[COLUMN["dead"]] = population.dead
+        row[COLUMN["eggs"]] = population.eggs
+
+        # A world that was swapped or rewound recomputes at once
+        if self.stats_tick is None or not 0 <= env.tick - self.stats_tick < self.stats_interval:
+            self._compute_stats(env)
+        row[STATS] = self.stats
+
+        self.buffer[self.head] = row
+        row.fill(0)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+        if self.stream:
+            self.unflushed += 1
+            if self.unflushed >= self.flush_interval:
+                self.flush()
+
+    def _compute_stats(self, env):
+        """Recompute the creature averages and field totals"""
+        hunger = energy = happiness = 0.0
+        for creature in env.creatures:
+            if not creature.dead:
+                hunger += creature.hunger
+                energy += creature.energy
+                happiness += creature.happiness
+        alive = env.population.alive or 1
+        self.stats[:] = (hunger / alive, energy / alive, happiness / alive, env.grass.sum(), env.fertility.sum())
+        self.stats_tick = env.tick
+
+    def recent(self, n=None):
+        """Return the last n samples, oldest first, as an (n, len(SERIES)) array"""
+        n = self.count if n is None else min(n, self.count)
+        start = self.head - n
+        if start >= 0:
+            return self.buffer[start:self.head]
+        return np.concatenate((self.buffer[start:], self.buffer[:self.head]))
+
+    def series(self, name, n=None):
+        """Return the last n values of one series, oldest first"""
+        return self.recent(n)[:, COLUMN[name]]
+
+    def latest(self):
+        """Return the newest sample as a dict, or None before the first tick"""
+        if not self.count:
+            return None
+        return dict(zip(SERIES, self.buffer[self.head - 1].tolist()))
+
+    def export_to(self, path):
+        """Stream every following sample to a .csv or .jsonl file"""
+        self.stream_format = "jsonl" if path.endswith(".jsonl") else "csv"
+        self.stream = open(path, "w", newline="")
+        if self.stream_format == "csv":
+            self.stream.write(",".join(SERIES) + "\n")
+        self.unflushed = 0
+
+    def flush(self):
+        """Write samples gathered since the last flush to the stream"""
+        if not self.stream or not self.unflushed:
+            return
+        rows = self.recent(self.unflushed)
+        if self.stream_format == "csv":
+            np.savetxt(self.stream, rows, delimiter=",", fmt="%.10g")
+        else:
+            for values in rows.tolist():
+                sample = dict(zip(SERIES, values))
+                sample.update({name: int(sample[name]) for name in COUNTS})
+                self.stream.write(json.dumps(sample) + "\n")
+        self.stream.flush()
+        self.unflushed = 0
+
+    def close(self):
+        self.flush()
+        if self.stream:
+            self.stream.close()
+            self.stream = None
@@ -0,0 +1,240 @@
+import os
+import glob
+import json
+import struct
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils.constants import *
+from environment import snapshot
+from managers.game_manager import GameManager
+
+# A journal directory holds everything needed to re-execute a run:
+#   meta.json             base tick, keyframe interval and the seed of every world played
+#   dt.f64                the dt passed to each tick after the base tick, as raw float64
+#   inputs.jsonl          player inputs, one JSON object per line
+#   keyframe_<tick>.npz   world snapshots taken every keyframe interval
+JOURNAL_VERSION = 1
+META_FILE = "meta.json"
+DT_FILE = "dt.f64"
+INPUTS_FILE = "inputs.jsonl"
+KEYFRAME_PATTERN = "keyframe_*.npz"
+
+
+class ReplayError(ValueError):
+    """Raised when a journal is missing, inconsistent or does not cover a tick"""
+
+
+def _keyframe_path(directory, tick):
+    return os.path.join(directory, f"keyframe_{tick:012d}.npz")
+
+
+def _keyframe_ticks(directory):
+    """Return the ticks of the keyframes in a journal, oldest first"""
+    paths = glob.glob(os.path.join(directory, KEYFRAME_PATTERN))
+    return sorted(int(os.path.basename(path)[len("keyframe_"):-len(".npz")]) for path in paths)
+
+
+# Append-only record of a run: per-tick inputs plus periodic keyframes
+class Journal:
+    def __init__(self, directory=JOURNAL_DIR, keyframe_interval=JOURNAL_KEYFRAME_INTERVAL):
+        self.directory = directory
+        self.keyframe_interval = keyframe_interval
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+        self.pending = None  # Future of the keyframe being written
+        self.last_error = None  # Exception of the last failed keyframe write, for the caller to report
+        self.meta = None
+        self.dt_file = None
+        self.inputs_file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self, env):
+        """Begin recording env, rewinding the journal to its tick
+
+        Records and keyframes after the world's tick are dropped, so loading an
+        older save continues the timeline from there instead of forking it.
+        """
+        self.flush()
+        self._close_files()
+        tick = env.tick
+        meta = self._read_meta()
+        dt_path = os.path.join(self.directory, DT_FILE)
+        recorded = os.path.getsize(dt_path) // 8 if meta and os.path.exists(dt_path) else 0
+
+        if meta is None or tick < meta["base_tick"] or recorded == 0:
+            # Nothing worth keeping before this world, start from scratch
+            meta = {"version": JOURNAL_VERSION, "base_tick": tick, "segments": []}
+            recorded = 0
+        else:
+            recorded = min(recorded, tick - meta["base_tick"])
+        meta["keyframe_interval"] = self.keyframe_interval
+        meta["segments"] = [segment for segment in meta["segments"] if segment["tick"] < tick]
+        meta["segments"].append({"tick": tick, "seed": env.rng.seed})
+        self.meta = meta
+
+        # Cut the tick records back to this world, padding with NaN if it jumped ahead
+        with open(dt_path, "ab") as file:
+            file.truncate(recorded * 8)
+            missing = tick - meta["base_tick"] - recorded
+            if missing > 0:
+                file.write(np.full(missing, np.nan).tobytes())
+
+        for keyframe_tick in _keyframe_ticks(self.directory):
+            if keyframe_tick >= tick or keyframe_tick < meta["base_tick"]:
+                os.remove(_keyframe_path(self.directory, keyframe_tick))
+        self._rewrite_inputs(meta["base_tick"], tick)
+
+        with open(os.path.join(self.directory, META_FILE), "w") as file:
+            json.dump(meta, file, indent=2)
+
+        # Every segment opens with a keyframe, so any tick in it can be reached
+        snapshot.save(env, _keyframe_path(self.directory, tick))
+        self.dt_file = open(dt_path, "ab")
+        self.inputs_file = open(os.path.join(self.directory, INPUTS_FILE), "a")
+
+    def _read_meta(self):
+        try:
+            with open(os.path.join(self.directory, META_FILE)) as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("version") == JOURNAL_VERSION else None
+
+    def _rewrite_inputs(self, base_tick, tick):
+        """Keep only the inputs recorded from base_tick up to, not including, tick"""
+        path = os.path.join(self.directory, INPUTS_FILE)
+        kept = []
+        if os.path.exists(path):
+            with open(path) as file:
+                kept = [line for line in file if base_tick <= json.loads(line)["tick"] < tick]
+        with open(path, "w") as file:
+            file.writelines(kept)
+
+    def on_tick(self, env, dt):
+        """Record the dt of the tick just simulated and keyframe on interval boundaries"""
+        self.dt_file.write(struct.pack("<d", dt))
+        if self.keyframe_interval > 0 and env.tick % self.keyframe_interval == 0:
+            self.dt_file.flush()
+            self.inputs_file.flush()
+            # Keyframes bound the cost of a seek, so wait for a slow write rather than skip one
+            self.flush()
+            columns = snapshot.capture(env)
+            self.pending = self.executor.submit(snapshot.write, _keyframe_path(self.directory, env.tick), columns)
+
+    def record_input(self, tick, kind, *args):
+        """Record a player input applied after tick"""
+        self.inputs_file.write(json.dumps({"tick": tick, "kind": kind, "args": list(args)}) + "\n")
+
+    def flush(self):
+        """Write buffered records and wait for the keyframe in progress"""
+        if self.dt_file:
+            self.dt_file.flush()
+            self.inputs_file.flush()
+        if self.pending:
+            error = self.pending.exception()
+            self.pending = None
+            if error:
+                self.last_error = error
+
+    def _close_files(self):
+        for file in (self.dt_file, self.inputs_file):
+            if file:
+                file.close()
+        self.dt_file = None
+        self.inputs_file = None
+
+    def close(self):
+        self.flush()
+        self._close_files()
+        self.executor.shutdown(wait=True)
+
+
+# Re-executes a journalled run from the nearest keyframe to any tick
+class Replay:
+    def __init__(self, directory, game_manager=None):
+        self.directory = directory
+        try:
+            with open(os.path.join(directory, META_FILE)) as file:
+                self.meta = json.load(file)
+        except (OSError, ValueError) as error:
+            raise ReplayError(f"Cannot read journal {directory}: {error}") from error
+        if self.meta.get("version") != JOURNAL_VERSION:
+            raise ReplayError(f"Unsupported journal version {self.meta.get('version')}")
+
+        self.base_tick = self.meta["base_tick"]
+        dt_path = os.path.join(directory, DT_FILE)
+        if os.path.getsize(dt_path):
+            # Mapped rather than read, so seeking deep into a long run stays cheap
+            self.dts = np.memmap(dt_path, dtype="<f8", mode="r")
+        else:
+            self.dts = np.zeros(0)
+        self.keyframes = _keyframe_ticks(directory)
+        if not self.keyframes:
+            raise ReplayError(f"Journal {directory} has no keyframes")
+
+        self.inputs = {}
+        with open(os.path.join(directory, INPUTS_FILE)) as file:
+            for line in file:
+                record = json.loads(line)
+                self.inputs.setdefault(record["tick"], []).append(record)
+
+        self.game_manager = game_manager or GameManager()  # Receives the replayed world, must not journal itself
+        self.tick = None  # Tick of the replayed world, None before the first seek
+
+    @property
+    def end_tick(self):
+        """Last tick the journal can reproduce"""
+        return self.base_tick + len(self.dts)
+
+    @property
+    def environment(self):
+        return self.game_manager.environment
+
+    def seed_at(self, tick):
+        """Return the seed of the world that was running at tick"""
+        seed = None
+        for segment in self.meta["segments"]:
+            if segment["tick"] <= tick:
+                seed = segment["seed"]
+        return seed
+
+    def seek(self, tick):
+        """Rebuild the world as it was after tick and return its environment"""
+        if not self.keyframes[0] <= tick <= self.end_tick:
+            raise ReplayError(f"Tick {tick} is outside the journal ({self.keyframes[0]}-{self.end_tick})")
+        keyframe = self.keyframes[bisect_right(self.keyframes, tick) - 1]
+
+        # Stepping forward within the same keyframe interval needs no reload
+        if self.tick is None or not keyframe <= self.tick <= tick:
+            self.game_manager.load_world(_keyframe_path(self.directory, keyframe))
+            self.tick = keyframe
+            self._restore_speed(keyframe)
+            self._apply_inputs(keyframe)
+
+        env = self.environment
+        dts = self.dts[self.tick - self.base_tick:tick - self.base_tick]
+        if np.isnan(dts).any():
+            raise ReplayError(f"Journal has no records between ticks {self.tick} and {tick}")
+        for dt in dts.tolist():
+            env.update(dt)
+            self.tick = env.tick
+            self._apply_inputs(self.tick)
+        return env
+
+    def _restore_speed(self, keyframe):
+        """Put back the speed state the recorded run had when the keyframe was taken"""
+        for tick in sorted(self.inputs):
+            if tick >= keyframe:
+                break
+            for record in self.inputs[tick]:
+                if record["kind"] == "speed":
+                    self.game_manager.current_speed_state = record["args"][0]
+
+    def _apply_inputs(self, tick):
+        for record in self.inputs.get(tick, ()):
+            if record["kind"] == "click":
+                self.game_manager._handle_grid_click(*record["args"])
+            elif record["kind"] == "speed":
+                self.game_manager.current_speed_state = record["args"][0]
@@ -0,0 +1,144 @@
+import os
+import csv
+import json
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from utils.constants import *
+from utils.config import SimulationConfig
+from managers.game_manager import GameManager
+from managers.metrics import MetricsCollector, COLUMN
+
+# Results are appended to results.jsonl as runs finish, so an interrupted
+# sweep resumes by skipping every run already in the file
+RESULTS_FILE = "results.jsonl"
+TABLE_FILE = "results.csv"
+
+
+def expand_grid(grid, seeds):
+    """Return one {"params", "seed"} run per combination of grid values and seed"""
+    names = sorted(grid)
+    runs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        SimulationConfig(**params)  # Fail on unknown parameters before any work starts
+        for seed in seeds:
+            runs.append({"params": params, "seed": seed})
+    return runs
+
+
+def run_key(run):
+    """Stable identity of a run, used to skip finished runs on resume"""
+    return json.dumps({"params": run["params"], "seed": run["seed"]}, sort_keys=True)
+
+
+def summarize(metrics):
+    """Reduce a run's metrics to one row of the results table"""
+    samples = metrics.recent()
+    alive = samples[:, COLUMN["alive"]]
+    extinct = np.flatnonzero((alive == 0) & (samples[:, COLUMN["eggs"]] == 0))
+    last = samples[-1]
+    return {
+        "ticks": int(last[COLUMN["tick"]]),
+        "final_alive": int(last[COLUMN["alive"]]),
+        "final_eggs": int(last[COLUMN["eggs"]]),
+        "peak_alive": int(alive.max()),
+        "mean_alive": float(alive.mean()),
+        "births": int(samples[:, COLUMN["births"]].sum()),
+        "deaths_old_age": int(samples[:, COLUMN["deaths_old_age"]].sum()),
+        "deaths_starvation": int(samples[:, COLUMN["deaths_starvation"]].sum()),
+        "deaths_unknown": int(samples[:, COLUMN["deaths_unknown"]].sum()),
+        "mean_hunger": float(samples[:, COLUMN["avg_hunger"]].mean()),
+        "mean_energy": float(samples[:, COLUMN["avg_energy"]].mean()),
+        "mean_happiness": float(samples[:, COLUMN["avg_happiness"]].mean()),
+        "final_grass": float(last[COLUMN["total_grass"]]),
+        "final_fertility": float(last[COLUMN["total_fertility"]]),
+        "extinct_tick": int(samples[extinct[0], COLUMN["tick"]]) if len(extinct) else None,
+    }
+
+
+def run_simulation(params, seed, ticks):
+    """Run one headless world to completion (executes in a worker process)"""
+    metrics = MetricsCollector(capacity=max(ticks, 1))
+    game_manager = GameManager(seed=seed, metrics=metrics, config=SimulationConfig(**params))
+    game_manager.set_speed_state("play")
+    population = game_manager.environment.population
+    for _ in range(ticks):
+        game_manager.update(1.0 / MAX_FPS)
+        if population.alive == 0 and population.eggs == 0:
+            break  # Extinct, nothing left to simulate but grass
+    return summarize(metrics)
+
+
+# Runs a parameter grid across seeds on a process pool, resumable from disk
+class Sweep:
+    def __init__(self, directory, grid, seeds, ticks=SWEEP_TICKS, workers=None):
+        self.directory = directory
+        self.runs = expand_grid(grid, seeds)
+        self.ticks = ticks
+        self.workers = workers or os.cpu_count()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def results_path(self):
+        return os.path.join(self.directory, RESULTS_FILE)
+
+    def completed(self):
+        """Return the results already on disk, keyed by run"""
+        results = {}
+        if os.path.exists(self.results_path):
+            with open(self.results_path) as file:
+                for line in file:
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from an interrupted sweep
+                    if result.get("ticks_requested") == self.ticks:
+                        results[run_key(result)] = result
+        return results
+
+    def run(self, progress=None):
+        """Run every unfinished run and return all results, finished ones included"""
+        results = self.completed()
+        pending = [run for run in self.runs if run_key(run) not in results]
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor, \
+                    open(self.results_path, "a+") as file:
+                # Start on a fresh line if the last run was cut off mid-write
+                end = file.tell()
+                if end:
+                    file.seek(end - 1)
+                    if file.read(1) != "\n":
+                        file.write("\n")
+                futures = {executor.submit(run_simulation, run["params"], run["seed"], self.ticks): run
+                           for run in pending}
+                for future in as_completed(futures):
+                    run = futures[future]
+                    result = {"params": run["params"], "seed": run["seed"], "ticks_requested": self.ticks}
+                    result.update(future.result())
+                    # One flushed line per run is the checkpoint
+                    file.write(json.dumps(result) + "\n")
+                    file.flush()
+                    results[run_key(run)] = result
+                    if progress:
+                        progress(len(results), len(self.runs), result)
+
+        ordered = [results[run_key(run)] for run in self.runs]
+        self.write_table(ordered)
+        return ordered
+
+    def write_table(self, results):
+        """Write all results as one flat CSV, a column per parameter and metric"""
+        if not results:
+            return
+        param_names = sorted({name for result in results for name in result["params"]})
+        metric_names = [name for name in results[0] if name not in ("params", "seed", "ticks_requested")]
+        with open(os.path.join(self.directory, TABLE_FILE), "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(param_names + ["seed"] + metric_names)
+            for result in results:
+                writer.writerow([result["params"].get(name) for name in param_names] +
+                                [result["seed"]] + [result[name] for name in metric_names])
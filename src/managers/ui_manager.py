@@ -4,6 +4,7 @@ from utils.constants import *
 from ui.panel import Panel
 from ui.stats import update_stats
 from ui.legend import Legend
+from ui.sparklines import Sparklines
 
 class UIManager:
     def __init__(self, game_manager):
@@ -41,6 +42,14 @@ class UIManager:
             LEGEND_PANEL_HEIGHT
         )
 
+        self.metrics_panel = Panel(
+            WIDTH - SIDEBAR_WIDTH - TOP_MARGIN,
+            HEIGHT - TOP_MARGIN - CONTROL_PANEL_HEIGHT - PANEL_SPACING - STATS_PANEL_HEIGHT -
+            PANEL_SPACING - LEGEND_PANEL_HEIGHT - PANEL_SPACING - METRICS_PANEL_HEIGHT,
+            SIDEBAR_WIDTH,
+            METRICS_PANEL_HEIGHT
+        )
+
         # Initialize buttons
         self._init_buttons()
 
@@ -52,6 +61,13 @@ class UIManager:
             self.legend_panel.height
         )
 
+        self.sparklines = Sparklines(
+            self.metrics_panel.x,
+            self.metrics_panel.y,
+            self.metrics_panel.width,
+            self.metrics_panel.height
+        )
+
     def _init_buttons(self):
         # Calculate button positions
         button_width = self.pause_unclicked_image.width * icon_scale
@@ -124,9 +140,12 @@ class UIManager:
         self.control_panel.draw()
         self.stats_panel.draw()
         self.legend_panel.draw()
+        if self.game_manager.metrics is not None:
+            self.metrics_panel.draw()
         
         # Draw legend and stats content
         self.draw_legend_content()
+        self.sparklines.draw(self.game_manager.metrics)
         self.draw_stats_content()
         
         # Draw buttons
@@ -134,6 +153,8 @@ class UIManager:
         self.play_button.draw()
         self.fast_forward_button.draw()
 
+        self.draw_status()
+
     def update_ui_positions(self):
         """Update all UI element positions with refined spacing"""
         start_y = HEIGHT - TOP_MARGIN
@@ -154,6 +175,29 @@ class UIManager:
             STATS_PANEL_HEIGHT - PANEL_SPACING - LEGEND_PANEL_HEIGHT
         )
 
+        self.metrics_panel.update_position(
+            WIDTH - SIDEBAR_WIDTH - TOP_MARGIN,
+            start_y - CONTROL_PANEL_HEIGHT - PANEL_SPACING - STATS_PANEL_HEIGHT -
+            PANEL_SPACING - LEGEND_PANEL_HEIGHT - PANEL_SPACING - METRICS_PANEL_HEIGHT
+        )
+
+    def draw_status(self):
+        """Show the game manager's status message at the bottom of the grid"""
+        status = getattr(self.game_manager, "status", None)
+        if not status:
+            return
+        label = pyglet.text.Label(status,
+                                  font_name='Arial',
+                                  font_size=11,
+                                  x=TOP_MARGIN,
+                                  y=TOP_MARGIN,
+                                  anchor_x='left',
+                                  anchor_y='bottom',
+                                  color=(255, 200, 100, 255))
+        pyglet.shapes.Rectangle(0, 0, label.content_width + 2 * TOP_MARGIN, label.content_height + 2 * TOP_MARGIN,
+                                color=(40, 40, 40)).draw()
+        label.draw()
+
     def draw_legend_content(self):
         # Call the legend's draw method
         self.legend.draw()
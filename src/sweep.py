@@ -0,0 +1,44 @@
+import json
+import argparse
+
+from utils.constants import *
+from managers.sweep import Sweep
+
+# Run a grid of simulation parameters across seeds on every core, e.g.
+#   python sweep.py --param GRASS_GROWTH_RATE=0.05,0.1,0.2 --param EGG_HATCH_TIME=200,300 --seeds 8
+def parse_param(text):
+    """Parse NAME=v1,v2,... into (NAME, [values])"""
+    name, _, values = text.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"Expected NAME=value,value,... got {text!r}")
+    return name.strip(), [json.loads(value) for value in values.split(",")]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run a parameter sweep of headless simulations")
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        help="Tunable constant and the values to try, e.g. GRASS_GROWTH_RATE=0.05,0.1")
+    parser.add_argument("--seeds", type=int, default=4, help="Number of seeds per combination")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=SWEEP_TICKS, help="Ticks per run")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--out", default=SWEEP_DIR, help="Directory for results and checkpoints")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    grid = dict(args.param)
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    sweep = Sweep(args.out, grid, seeds, args.ticks, args.workers)
+
+    def progress(done, total, result):
+        print(f"[{done}/{total}] seed {result['seed']} {result['params']}: "
+              f"peak {result['peak_alive']}, final {result['final_alive']} alive")
+
+    results = sweep.run(progress)
+    print(f"{len(results)} runs written to {sweep.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import pyglet
+import numpy as np
+
+from utils.constants import *
+
+# Small trend graphs of the colony metrics, laid out in a 2x2 grid
+class Sparklines:
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        # (series, label, line color)
+        self.graphs = [
+            ("alive", "Population", (0, 255, 0)),
+            ("eggs", "Eggs", (255, 200, 0)),
+            ("avg_hunger", "Avg Hunger", STAT_BAR_COLORS['hunger']),
+            ("total_grass", "Grass", (60, 180, 60)),
+        ]
+
+    def draw(self, metrics):
+        if metrics is None or len(metrics) < 2:
+            return
+
+        batch = pyglet.graphics.Batch()
+        shapes = []
+        cell_width = (self.width - 3 * SPARKLINE_PADDING) / 2
+        cell_height = (self.height - 3 * SPARKLINE_PADDING) / 2
+
+        for i, (name, label, color) in enumerate(self.graphs):
+            cell_x = self.x + SPARKLINE_PADDING + (i % 2) * (cell_width + SPARKLINE_PADDING)
+            cell_y = self.y + SPARKLINE_PADDING + (1 - i // 2) * (cell_height + SPARKLINE_PADDING)
+            values = metrics.series(name, SPARKLINE_HISTORY)
+            latest = values[-1]
+
+            shapes.append(pyglet.text.Label(
+                f"{label}: {latest:.0f}",
+                font_name='Arial',
+                font_size=8,
+                x=cell_x,
+                y=cell_y + cell_height,
+                anchor_x='left',
+                anchor_y='top',
+                color=(200, 200, 200, 255),
+                batch=batch
+            ))
+
+            # Downsample to at most one point per pixel column
+            line_height = cell_height - SPARKLINE_LABEL_HEIGHT
+            points = min(len(values), int(cell_width))
+            values = values[np.linspace(0, len(values) - 1, points).astype(np.intp)]
+            low, high = values.min(), values.max()
+            scale = line_height / (high - low) if high > low else 0
+            xs = cell_x + np.linspace(0, cell_width, points)
+            ys = cell_y + (values - low) * scale
+            for x1, y1, x2, y2 in zip(xs[:-1], ys[:-1], xs[1:], ys[1:]):
+                shapes.append(pyglet.shapes.Line(x1, y1, x2, y2, width=1, color=color, batch=batch))
+
+        batch.draw()
@@ -479,12 +479,12 @@ def update_stats(selected_creature, selected_egg, selected_tile, stats_panel, en
             current_y -= 10  # Extra spacing after zones
 
         # Grass level (only if > 0)
-        if (selected_tile[0], selected_tile[1]) in env.grass:
-            grass_value = env.grass[(selected_tile[0], selected_tile[1])]
+        if env.is_valid_position(*selected_tile):
+            grass_value = env.grass[selected_tile]
             if grass_value > 0:
                 draw_stat_bar(
                     base_x, current_y,
-                    bar_width, grass_value, 100,
+                    bar_width, grass_value, MAX_GRASS,
                     (34, 139, 34), "Grass",  # Forest green color
                     label_x=label_x
                 )
@@ -492,8 +492,8 @@ def update_stats(selected_creature, selected_egg, selected_tile, stats_panel, en
                 stats_displayed = True
 
         # Fertility level (only if > 0)
-        if (selected_tile[0], selected_tile[1]) in env.fertility:
-            fertility_value = env.fertility[(selected_tile[0], selected_tile[1])]
+        if env.is_valid_position(*selected_tile):
+            fertility_value = env.fertility[selected_tile]
             if fertility_value > 0:
                 draw_stat_bar(
                     base_x, current_y,
@@ -529,6 +529,19 @@ def update_stats(selected_creature, selected_egg, selected_tile, stats_panel, en
             color=(255, 255, 255, 255)  # White color
         ).draw()
 
+        # Colony overview from the environment's live counters
+        population = env.population
+        pyglet.text.Label(
+            f"Alive: {population.alive}   Dead: {population.dead}   Eggs: {population.eggs}",
+            font_name='Arial',
+            font_size=10,
+            x=stats_panel.x + stats_panel.width // 2,
+            y=stats_panel.y + stats_panel.height // 2 - 30,
+            anchor_x='center',
+            anchor_y='center',
+            color=(200, 200, 200, 255)
+        ).draw()
+
 def draw_stat_bar(bar_x, y, bar_width, value, max_value, color, label, age_value=None, batch=None, label_x=None):
     """Draw a stat bar with label and value"""
     # Draw background (darker version of the bar color)
@@ -0,0 +1,78 @@
+from utils import constants
+
+# Simulation constants a single world may override, e.g. per run of a
+# parameter sweep. Everything else in utils/constants.py stays global.
+TUNABLE = (
+    "DECOMPOSITION_RATE",
+    "GRASS_GROWTH_RATE",
+    "FERTILITY_SPREAD_RATE",
+    "EGG_HATCH_TIME",
+    "MAX_AREA_SCALE",
+    "AREA_SCALE_FACTOR",
+    "CREATURE_MATURITY_AGE",
+    "CREATURE_MIN_LIFESPAN",
+    "CREATURE_MAX_LIFESPAN",
+    "EGG_LAYING_COOLDOWN",
+    "REST_THRESHOLD",
+    "WAKE_THRESHOLD",
+    "HUNGER_SEEK_FOOD_THRESHOLD",
+    "HUNGER_EAT_THRESHOLD",
+    "EGG_LAYING_MIN_HUNGER",
+    "EGG_LAYING_MIN_ENERGY",
+    "EGG_LAYING_MIN_HAPPINESS",
+)
+
+
+# Per-world values of the tunable constants, defaulting to utils/constants.py
+class SimulationConfig:
+    def __init__(self, **overrides):
+        for name in TUNABLE:
+            setattr(self, name, getattr(constants, name))
+        for name, value in overrides.items():
+            if name not in TUNABLE:
+                raise ValueError(f"Unknown simulation parameter {name}")
+            setattr(self, name, value)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in TUNABLE}
+
+    def overrides(self):
+        """Return only the values that differ from the global constants"""
+        return {name: value for name, value in self.as_dict().items()
+                if value != getattr(constants, name)}
+
+    def __repr__(self):
+        return f"SimulationConfig({', '.join(f'{k}={v!r}' for k, v in self.overrides().items())})"
+
+
+def default_zones(width, height):
+    """Return the standard colony layout of a width x height world"""
+    nest_x = width * constants.NEST_CENTER_X
+    nest_y = height * constants.NEST_CENTER_Y
+    offset = constants.QUADRANT_OFFSET
+    return {
+        "food": (nest_x - offset, nest_y - offset, constants.FOOD_STORAGE_RADIUS),  # Bottom-left
+        "nursery": (nest_x + offset, nest_y + offset, constants.NURSERY_RADIUS),  # Top-right
+        "sleeping": (nest_x + offset, nest_y - offset, constants.SLEEPING_RADIUS),  # Bottom-right
+    }
+
+
+# Size and colony layout of one world, all in grid units. Nothing here depends
+# on the window: the renderer maps tiles to pixels with its own GRID_SIZE.
+class WorldConfig:
+    def __init__(self, width=None, height=None, zones=None):
+        self.width = width or constants.WORLD_WIDTH
+        self.height = height or constants.WORLD_HEIGHT
+        self.nest = (self.width * constants.NEST_CENTER_X, self.height * constants.NEST_CENTER_Y)
+        self.zones = default_zones(self.width, self.height)  # Zone -> (center x, center y, radius)
+        for name, geometry in (zones or {}).items():
+            if name not in self.zones:
+                raise ValueError(f"Unknown zone {name}")
+            self.zones[name] = tuple(float(value) for value in geometry)
+
+    def as_dict(self):
+        return {"width": self.width, "height": self.height,
+                "zones": {name: list(geometry) for name, geometry in self.zones.items()}}
+
+    def __repr__(self):
+        return f"WorldConfig(width={self.width}, height={self.height}, zones={self.zones!r})"
@@ -18,20 +18,27 @@ selected_creature = None
 selected_egg = None
 icon_scale = 0.075
 
-# Colony Layout Configuration
-NEST_CENTER_X = WIDTH // 4
-NEST_CENTER_Y = HEIGHT // 2
-QUADRANT_OFFSET = 300
+# World Size (in grid units, independent of the window)
+WORLD_WIDTH = 18
+WORLD_HEIGHT = 18
+
+# Colony Layout Configuration (in grid units). The nest sits a third of the
+# way across the world and halfway up, the zones in quadrants around it
+NEST_CENTER_X = 1 / 3  # Fraction of the world width
+NEST_CENTER_Y = 1 / 2  # Fraction of the world height
+QUADRANT_OFFSET = 6
 
 # Zone Radii (in grid units)
-FOOD_STORAGE_RADIUS = 5 * GRID_SIZE
-NURSERY_RADIUS = 3 * GRID_SIZE
-SLEEPING_RADIUS = 4 * GRID_SIZE
+FOOD_STORAGE_RADIUS = 5
+NURSERY_RADIUS = 3
+SLEEPING_RADIUS = 4
 
 # UI Panel Dimensions and Styling
 CONTROL_PANEL_HEIGHT = 60
 STATS_PANEL_HEIGHT = 220
 LEGEND_PANEL_HEIGHT = 440
+METRICS_PANEL_HEIGHT = 110
+STATUS_MESSAGE_SECONDS = 5  # How long a status message, such as a failed load, stays on screen
 
 # Legend Configuration
 LEGEND_ITEM_SPACING = 24
@@ -139,10 +146,21 @@ MAX_FERTILITY = 100
 GRASS_GROWTH_RATE = 0.1
 FERTILITY_SPREAD_RATE = 0.05
 GRASS_SPREAD_CHANCE = 0.01
+MAX_GRASS = 100
+FERTILITY_SPREAD_RADIUS = 2  # Manhattan reach of fertility spreading from a corpse
+FIELD_BACKEND = "numpy"  # Grass/fertility update: "numpy", "convolution", "threaded", "numba" (NumPy without Numba), "chunked" or the slow "reference" loops
+GRASS_SPREAD = "burst"  # "burst": whole grid on 10% of ticks, "rolling": every 10th column each tick
+GRASS_SPREAD_PERIOD = 10  # Ticks for rolling spread to pass over every column, at least 3
+FIELD_CHUNK_SIZE = 32  # Side of the sparse blocks of the "chunked" backend
+FIELD_CHUNK_SLEEP = True  # Let chunked fields far from any creature, corpse or egg sleep
+FIELD_THREADS = 0  # Worker threads of the "threaded" backend, 0 for one per CPU
+FIELD_STRIPE_MIN_ROWS = 16  # Narrowest stripe worth handing to its own thread
+
+# Movement Constants
+MOVEMENT = "sequential"  # "sequential" moves at once, "two_phase" resolves all moves after the tick
 
 # Egg Constants
 EGG_HATCH_TIME = 300  # Time until egg hatches
-EGG_NEARBY_PARENT_RANGE = 3  # Range to check for parent creatures
 
 # Environment Area Scaling
 MAX_AREA_SCALE = 1.5
@@ -153,4 +171,64 @@ DIAGONAL_MOVES = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
 CARDINAL_MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
 
 # Egg Finding Range
-EGG_SPOT_SEARCH_RANGE = 4  # Maximum distance to search for egg spots
\ No newline at end of file
+EGG_SPOT_SEARCH_RANGE = 4  # Maximum distance to search for egg spots
+
+# Creature Lifecycle
+CREATURE_MATURITY_AGE = 20  # Age at which creatures can lay eggs
+CREATURE_MIN_LIFESPAN = 500  # Lifespans are drawn uniformly from this range
+CREATURE_MAX_LIFESPAN = 750
+EGG_LAYING_COOLDOWN = 300  # Ticks between eggs laid by the same creature
+
+# Creature Needs Thresholds
+REST_THRESHOLD = 30  # Energy at which a creature goes to sleep
+WAKE_THRESHOLD = 80  # Energy at which a sleeping creature wakes up
+HUNGER_SEEK_FOOD_THRESHOLD = 30  # Hunger at which a creature drops everything to find food
+HUNGER_EAT_THRESHOLD = 70  # Hunger below which a creature eats adjacent food
+EGG_LAYING_MIN_HUNGER = 60
+EGG_LAYING_MIN_ENERGY = 60
+EGG_LAYING_MIN_HAPPINESS = 70
+
+# World Snapshots
+QUICKSAVE_PATH = "quicksave.npz"  # F5 saves here, F9 loads it back
+AUTOSAVE_DIR = "autosaves"
+AUTOSAVE_INTERVAL = 1000  # Ticks between autosaves
+AUTOSAVE_RETENTION = 5  # Autosaves kept on disk
+JOURNAL_DIR = "journal"
+JOURNAL_KEYFRAME_INTERVAL = 1000  # Ticks between replay keyframes, the most a seek re-simulates
+
+# Field History
+FIELD_HISTORY_INTERVAL = 100  # Ticks between recorded grass/fertility frames
+FIELD_HISTORY_CAPACITY = 100000  # Frames preallocated on disk
+
+# Metrics
+METRICS_CAPACITY = 4096  # Ticks of history kept in memory
+METRICS_FLUSH_INTERVAL = 256  # Ticks between writes to an exported metrics file
+METRICS_STATS_INTERVAL = 10  # Ticks between recomputed creature averages and field totals
+SPARKLINE_HISTORY = 1000  # Ticks shown by the sidebar graphs
+SPARKLINE_PADDING = 8
+SPARKLINE_LABEL_HEIGHT = 12
+
+# Parameter Sweeps
+SWEEP_DIR = "sweeps"
+SWEEP_TICKS = 5000  # Ticks simulated per run unless the sweep says otherwise
+
+# Agent Control
+AGENT_VIEW_RADIUS = 3  # Observation windows span (2 * radius + 1) tiles per side
+AGENT_MAX_STEPS = 5000  # Ticks before an episode is truncated
+AGENT_REWARD_ALIVE = 0.01  # Per tick survived
+AGENT_REWARD_FOOD = 0.01  # Per unit of food eaten
+AGENT_REWARD_EGG = 1.0  # Per egg laid
+AGENT_REWARD_DEATH = -1.0
+
+# Domain Decomposition
+DOMAIN_TILES = (2, 2)  # Worker processes along x and y
+DOMAIN_HALO = 5  # Tiles of neighbour state each worker sees, the farthest a creature looks (food search)
+
+# Invariant Checks
+INVARIANT_CHECKS = "off"  # World bookkeeping checks after every tick: "off", "sampled" or "full"
+INVARIANT_SAMPLE = 8  # Creatures, eggs and tracked corpses the sampled checks look at per tick
+
+# State Hashing
+STATE_HASH_DECIMALS = 9  # Decimals floats are rounded to before hashing, so float noise compares equal
+STATE_DIFF_RTOL = 1e-9  # Relative tolerance of float state when hashes differ
+STATE_DIFF_ATOL = 1e-9  # Absolute tolerance of float state when hashes differ
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Independent random streams, one per subsystem, so that e.g. drawing a
+# frame can never change what the simulation does next
+STREAMS = ("behaviour", "fields", "appearance", "rendering")
+BLOCK_SIZE = 4096  # Uniform floats fetched from NumPy per refill
+
+
+# A random stream that draws uniform floats from NumPy in blocks
+class RandomStream:
+    def __init__(self, seed_sequence, block_size=BLOCK_SIZE):
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.block_size = block_size
+        self.block = []
+        self.index = 0
+
+    def random(self):
+        """Return a float in [0, 1)"""
+        if self.index >= len(self.block):
+            # tolist() hands back Python floats, which are cheaper to use one by one
+            self.block = self.generator.random(self.block_size).tolist()
+            self.index = 0
+        value = self.block[self.index]
+        self.index += 1
+        return value
+
+    def uniform(self, a, b):
+        """Return a float in [a, b)"""
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        """Return an integer in [a, b], both ends included"""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, sequence):
+        """Return a random element of a non-empty sequence"""
+        return sequence[int(self.random() * len(sequence))]
+
+    def choices(self, population, weights):
+        """Return one weighted pick from population, wrapped in a list like random.choices"""
+        threshold = self.random() * sum(weights)
+        cumulative = 0
+        for item, weight in zip(population, weights):
+            cumulative += weight
+            if threshold < cumulative:
+                return [item]
+        return [population[-1]]
+
+    def get_state(self):
+        """Return the full stream state, including unread block values"""
+        return {
+            "bit_generator": self.generator.bit_generator.state,
+            "block": np.asarray(self.block, dtype=np.float64),
+            "index": self.index,
+        }
+
+    def set_state(self, state):
+        """Restore a state returned by get_state"""
+        self.generator.bit_generator.state = state["bit_generator"]
+        self.block = np.asarray(state["block"], dtype=np.float64).tolist()
+        self.index = int(state["index"])
+
+
+# Seeded RNG service handing out one stream per subsystem
+class RngService:
+    def __init__(self, seed=None):
+        if seed is None:
+            # Pick a seed we can report, so any run can be reproduced later
+            seed = int(np.random.SeedSequence().entropy % (2 ** 63))
+        self.seed = seed
+        children = np.random.SeedSequence(seed).spawn(len(STREAMS))
+        self.streams = {name: RandomStream(child) for name, child in zip(STREAMS, children)}
+
+    @property
+    def behaviour(self):
+        """Creature decisions, lifespans and spawn positions"""
+        return self.streams["behaviour"]
+
+    @property
+    def fields(self):
+        """Grass and fertility dynamics"""
+        return self.streams["fields"]
+
+    @property
+    def appearance(self):
+        """Cosmetic creature traits and animation timing"""
+        return self.streams["appearance"]
+
+    @property
+    def rendering(self):
+        """Per-frame drawing effects"""
+        return self.streams["rendering"]
+
+    def get_state(self):
+        return {name: stream.get_state() for name, stream in self.streams.items()}
+
+    def set_state(self, state):
+        for name, stream in self.streams.items():
+            stream.set_state(state[name])
@@ -0,0 +1,43 @@
+import pytest
+
+from engine.agents import CreatureGym, RIGHT
+from entities.creature import Creature
+from environment import movement
+
+LINE = [(5, 0), (6, 0), (7, 0)]  # x offsets along a free row, front creature last
+
+
+def step_line(mode, reverse):
+    """Line three creatures up, all stepping right, and return where they end up"""
+    gym = CreatureGym(movement_mode=mode)
+    gym.reset(seed=3)
+    env = gym.environment
+    row = next(y for y in range(env.height) if all((x, y) not in env.grid for x in range(5, 9)))
+    line = [Creature(x, row + dy, env) for x, dy in LINE]
+    for creature in reversed(line) if reverse else line:
+        env.add_creature(creature)
+    gym.observe()
+    gym.step({creature.id: RIGHT for creature in line})
+    return [(creature.x - 5, creature.y - row) for creature in line]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_two_phase_agent_moves_do_not_enter_vacated_tiles(reverse):
+    assert step_line(movement.TWO_PHASE, reverse) == [(0, 0), (1, 0), (3, 0)]
+
+
+def test_sequential_agent_moves_depend_on_table_order():
+    assert step_line(movement.SEQUENTIAL, reverse=False) == [(0, 0), (1, 0), (3, 0)]
+    assert step_line(movement.SEQUENTIAL, reverse=True) == [(1, 0), (2, 0), (3, 0)]
+
+
+def test_two_phase_gym_runs():
+    gym = CreatureGym(movement_mode=movement.TWO_PHASE, width=24, height=24)
+    observation, _ = gym.reset(seed=5)
+    for step in range(300):
+        actions = [(agent_id + step) % 5 for agent_id in observation["ids"].tolist()]
+        observation, _, _, _, info = gym.step(actions)
+        if info["extinct"]:
+            break
+    assert gym.environment.intents is None
+    assert len(gym.environment.grid) == len(gym.environment.creatures) + len(gym.environment.eggs)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from engine.differential import first_difference, run_differential
+from managers.game_manager import GameManager
+from utils.config import WorldConfig
+
+WORLD = WorldConfig(18, 18)
+
+
+def twin_worlds(seed=4):
+    reference, candidate = (GameManager(seed=seed, world=WORLD).environment for _ in range(2))
+    return reference, candidate
+
+
+def test_float_noise_is_not_a_difference():
+    reference, candidate = twin_worlds()
+    candidate.grass += 1e-12 * np.abs(candidate.grass).max()
+    assert first_difference(reference, candidate) is None
+
+
+def test_float_difference_beyond_tolerance_is_reported():
+    reference, candidate = twin_worlds()
+    candidate.fertility[3, 5] += 1e-3
+    component, detail = first_difference(reference, candidate)
+    assert component == "fertility"
+    assert detail.startswith("at (3, 5)")
+
+
+def test_integer_difference_is_reported_exactly():
+    reference, candidate = twin_worlds()
+    creature = min(candidate.creatures, key=lambda creature: creature.id)
+    creature.max_age += 1
+    component, detail = first_difference(reference, candidate)
+    assert component == "creature_max_age"
+    assert detail.startswith(f"creature {creature.id} at (0,)")
+
+
+def test_identical_settings_never_diverge():
+    assert run_differential(200, seed=4, world=WORLD) == (4, None)
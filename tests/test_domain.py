@@ -0,0 +1,76 @@
+import argparse
+
+import numpy as np
+
+from engine.domain import TiledWorld
+from environment.environment import Environment
+
+# Tiled and single-process runs of one seed drift apart once creatures cross
+# tile borders, so they are compared as ensembles: over many seeds, the means
+# of every population count must agree to within MAX_STANDARD_ERRORS standard
+# errors of their difference.
+COUNTS = ("alive", "dead", "eggs")
+WIDTH, HEIGHT = 30, 24
+TILES = (2, 2)
+MAX_STANDARD_ERRORS = 3
+
+
+class _Manager:
+    current_speed_state = "play"
+    selected_tile = None
+
+
+def run_single(seed, ticks, width=WIDTH, height=HEIGHT):
+    env = Environment(width, height, _Manager(), seed)
+    for _ in range(ticks):
+        env.update(1.0 / 60)
+    return [getattr(env.population, name) for name in COUNTS]
+
+
+def run_tiled(seed, ticks, width=WIDTH, height=HEIGHT, tiles=TILES):
+    world = TiledWorld(tiles, seed=seed, width=width, height=height)
+    try:
+        for _ in range(ticks):
+            world.step()
+        totals = world.totals()
+    finally:
+        world.close()
+    return [totals[name] for name in COUNTS]
+
+
+def ensembles(seeds, ticks, **world):
+    """Return (single, tiled) arrays of COUNTS, one row per seed"""
+    single = np.array([run_single(seed, ticks, **world) for seed in seeds], dtype=float)
+    tiled = np.array([run_tiled(seed, ticks, **world) for seed in seeds], dtype=float)
+    return single, tiled
+
+
+def disagreements(single, tiled):
+    """Return the counts whose means differ by more than MAX_STANDARD_ERRORS standard errors"""
+    error = np.sqrt(single.var(axis=0, ddof=1) / len(single) + tiled.var(axis=0, ddof=1) / len(tiled))
+    gap = np.abs(single.mean(axis=0) - tiled.mean(axis=0))
+    return [name for name, over in zip(COUNTS, gap > MAX_STANDARD_ERRORS * error) if over]
+
+
+def test_tiled_ensemble_matches_single_process():
+    single, tiled = ensembles(range(6), 2500)
+    assert not disagreements(single, tiled)
+
+
+# Rerun a bigger comparison from the repository root, e.g.
+#   python -m pytest tests/test_domain.py  (the quick ensemble)
+#   PYTHONPATH=src python tests/test_domain.py --seeds 16 --ticks 5000
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare tiled and single-process ensembles")
+    parser.add_argument("--seeds", type=int, default=16)
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--width", type=int, default=WIDTH)
+    parser.add_argument("--height", type=int, default=HEIGHT)
+    args = parser.parse_args()
+    single, tiled = ensembles(range(args.seeds), args.ticks, width=args.width, height=args.height)
+    for column, name in enumerate(COUNTS):
+        print(f"{name:>5}: single {single[:, column].mean():6.1f} +/- {single[:, column].std():4.1f}, "
+              f"tiled {tiled[:, column].mean():6.1f} +/- {tiled[:, column].std():4.1f}")
+    failed = disagreements(single, tiled)
+    print("Means differ beyond the spread in " + ", ".join(failed) if failed else "Ensembles agree")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from environment import fields, kernels
+from utils.config import SimulationConfig
+
+# The loops as written, so the kernel is checked even when Numba compiled it
+grow_fields = getattr(kernels.grow_fields, "py_func", kernels.grow_fields)
+
+
+def random_world(rng, width, height):
+    """Patchy grass and fertility like a running world's, plus a few decomposition sites"""
+    grass = rng.uniform(0, 100, (width, height)) * (rng.random((width, height)) < 0.6)
+    fertility = rng.uniform(0, 100, (width, height)) * (rng.random((width, height)) < 0.3)
+    positions = list({(int(rng.integers(0, width)), int(rng.integers(0, height)))
+                      for _ in range(rng.integers(0, 8))})
+    return grass, fertility, positions
+
+
+def step_both(kernel, grass, fertility, positions, spread, config, radius):
+    """Advance copies of the fields with update_fields and with kernel, returning both results"""
+    expected = grass.copy(), fertility.copy()
+    sources = np.zeros(grass.shape, dtype=bool)
+    if positions:
+        sources[tuple(zip(*positions))] = True
+    fields.update_fields(*expected, sources, spread, config)
+
+    actual = grass.copy(), fertility.copy()
+    columns = np.zeros(grass.shape[0], dtype=bool)
+    columns[spread if isinstance(spread, slice) else slice(None) if spread else slice(0)] = True
+    offsets = np.array(fields.diamond_offsets(radius), dtype=np.intp).reshape(-1, 2)
+    xs, ys = np.array(positions, dtype=np.intp).reshape(-1, 2).T
+    kernel(*actual, xs, ys, offsets, columns, not isinstance(spread, slice),
+           config.GRASS_GROWTH_RATE, config.FERTILITY_SPREAD_RATE)
+    return expected, actual
+
+
+def check_against_numpy(kernel, spread_for, radius, seed, trials=20, ticks=10):
+    config = SimulationConfig()
+    rng = np.random.default_rng(seed)
+    for trial in range(trials):
+        grass, fertility, _ = random_world(rng, *rng.integers(3, 25, 2))
+        for tick in range(ticks):
+            positions = random_world(rng, *grass.shape)[2]
+            spread = spread_for(rng, tick, trial)
+            (grass, fertility), actual = step_both(kernel, grass, fertility, positions, spread,
+                                                   config, radius)
+            np.testing.assert_array_equal(actual[0], grass)
+            np.testing.assert_array_equal(actual[1], fertility)
+
+
+def burst(rng, tick, trial):
+    return bool(rng.random() < 0.5)
+
+
+def rolling(rng, tick, trial):
+    return fields.rolling_columns(tick, 3 + trial % 5)
+
+
+@pytest.mark.parametrize("spread_for", [burst, rolling])
+def test_grow_fields_matches_update_fields(spread_for):
+    check_against_numpy(grow_fields, spread_for, fields.FERTILITY_SPREAD_RADIUS, seed=3)
+
+
+@pytest.mark.parametrize("radius", [0, 1, 4])
+@pytest.mark.parametrize("spread_for", [burst, rolling])
+def test_grow_fields_matches_update_fields_with_radius(monkeypatch, spread_for, radius):
+    monkeypatch.setattr(fields, "FERTILITY_SPREAD_RADIUS", radius)
+    check_against_numpy(grow_fields, spread_for, radius, seed=radius, trials=8)
+
+
+@pytest.mark.skipif(not kernels.AVAILABLE, reason="Numba is not installed")
+@pytest.mark.parametrize("spread_for", [burst, rolling])
+def test_compiled_grow_fields_matches_update_fields(spread_for):
+    check_against_numpy(kernels.grow_fields, spread_for, fields.FERTILITY_SPREAD_RADIUS, seed=5)
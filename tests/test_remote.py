@@ -0,0 +1,47 @@
+import time
+
+from engine.remote import RemoteGame
+from managers.game_manager import GameManager
+from utils.config import WorldConfig
+
+
+def save_world(path, world):
+    GameManager(seed=3, world=world).save_world(str(path))
+    return str(path)
+
+
+def wait_for(game, condition, seconds=10.0):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        game.sync()
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_loads_resize_the_frames_and_move_the_zones(tmp_path):
+    large = save_world(tmp_path / "large.npz", WorldConfig(30, 24))
+    zoned = save_world(tmp_path / "zoned.npz", WorldConfig(18, 18, {"food": (4, 4, 2)}))
+    game = RemoteGame(large)
+    try:
+        assert game.environment.grass.shape == (30, 24)
+        game.load_world(zoned)
+        assert wait_for(game, lambda: game.environment.world.zones["food"] == (4.0, 4.0, 2.0))
+        assert game.environment.grass.shape == (18, 18)
+        assert game.process.is_alive()
+    finally:
+        game.close()
+
+
+def test_failed_load_keeps_the_world(tmp_path):
+    game = RemoteGame()
+    try:
+        tick = game.environment.tick
+        game.load_world(str(tmp_path / "missing.npz"))
+        assert wait_for(game, lambda: game.status is not None)
+        assert game.status.startswith("Load failed")
+        assert game.process.is_alive()
+        assert game.environment.tick == tick
+    finally:
+        game.close()
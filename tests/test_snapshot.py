@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from entities.creature import Creature
+from environment import snapshot
+from managers.game_manager import GameManager
+from utils.config import WorldConfig
+
+
+def world_with_ghost(seed=4):
+    """A grown world whose first creature targets a corpse that has already left the world"""
+    game_manager = GameManager(seed=seed, world=WorldConfig(18, 18))
+    game_manager.set_speed_state("play")
+    env = game_manager.environment
+    while len([creature for creature in env.creatures if not creature.dead]) < 3:
+        game_manager.update(1.0 / 60)
+    first, second = [creature for creature in env.creatures if not creature.dead][:2]
+    second.die()
+    second.food_value = 0
+    env.remove_dead_creature(second)
+    game_manager.update(1.0 / 60)
+    assert second not in env.creatures and first in env.creatures
+    first.target = second
+    return env
+
+
+def target_ids(env):
+    return {creature.id: creature.target.id if isinstance(creature.target, Creature) else creature.target
+            for creature in env.creatures}
+
+
+def test_targets_survive_reordered_creature_rows():
+    env = world_with_ghost()
+    columns = snapshot.capture(env)
+    assert not columns["creature_in_world"].all()
+    order = np.argsort(columns["creature_in_world"], kind="stable")  # Ghosts first
+    for name in [name for name in columns if name.startswith("creature_")]:
+        columns[name] = columns[name][order]
+
+    restored = snapshot.restore(columns)
+    assert target_ids(restored) == target_ids(env)
+    ghosts = [creature.target for creature in restored.creatures
+              if isinstance(creature.target, Creature) and creature.target not in restored.creatures]
+    assert ghosts
+
+
+def test_event_kind_must_match_its_entity():
+    columns = snapshot.capture(world_with_ghost())
+    creature_events = np.flatnonzero(~np.isin(columns["event_entity_ids"], columns["egg_id"]))
+    columns["event_kinds"] = columns["event_kinds"].copy()
+    columns["event_kinds"][creature_events[0]] = snapshot.EVENT_KINDS.index("hatch")
+    with pytest.raises(snapshot.SnapshotError, match="Event kind"):
+        snapshot.restore(columns)